@@ -3,8 +3,21 @@ import numpy as np
 import math
 import random
 
+from manim_demo.cache import memoize
+from manim_demo.coords import coordinate_system
+from manim_demo.curves import simplify_polylines
+from manim_demo.fields import InstancedArrowField, clip_norm, coords_field, grid_points
+from manim_demo.integrate import integrate_batch, trajectories_to_points
+from manim_demo.variants import static_mobjects
+
 class NonlinearSystem(Scene):
-    def construct(self):
+    # 可扫描的参数：控制律 u = -k1·x - k2·y - k3·x² 的系数
+    # （manim-demo sweep -p "gains=(1,1,0.5),(2,1,0.5)"）
+    gains = (1.0, 1.0, 0.5)
+
+    @classmethod
+    def build_static(cls):
+        """与控制律无关的方程、标题和坐标轴，批量渲染时只构建一次"""
         # 系统参数 - 使用更清晰的排版
         system_eqs = VGroup(
             MathTex(r"\dot{x}_1 = x_2 + x_1^2", color=BLUE),
@@ -16,12 +29,10 @@ class NonlinearSystem(Scene):
         
         # 添加标题
         title = Tex("Second-order nonlinear system", font_size=36).to_edge(UP)
-        
-        self.play(Write(title), Write(system_eqs))
-        self.wait(1)
-        
+
         # 创建更大的坐标轴
-        axes = Axes(
+        axes = coordinate_system(
+            Axes,
             x_range=[-3, 3, 1],
             y_range=[-3, 3, 1],
             x_length=7,
@@ -34,36 +45,46 @@ class NonlinearSystem(Scene):
             Tex("$x_1$", font_size=28).set_color(BLUE), 
             Tex("$x_2$", font_size=28).set_color(GREEN)
         )
+        return {"system_eqs": system_eqs, "title": title, "axes": axes, "axes_labels": axes_labels}
+
+    def construct(self):
+        k1, k2, k3 = self.gains
+        static = static_mobjects(self)
+        system_eqs, title = static["system_eqs"], static["title"]
+        
+        self.play(Write(title), Write(system_eqs))
+        self.wait(1)
+        
+        axes, axes_labels = static["axes"], static["axes_labels"]
         
         self.play(Create(axes), Write(axes_labels))
         self.wait(1)
         
-        # 定义向量场函数
-        def vector_field_func(point):
-            x, y = axes.point_to_coords(point)
-            u = -x - y - 0.5*x**2  # 改进的控制输入
+        # 定义向量场函数（一次接收全部采样点的坐标数组）
+        def vector_field_func(x, y):
+            u = -k1*x - k2*y - k3*x**2  # 改进的控制输入
             dx = y + x**2
             dy = u
             # 限制向量长度防止过大
-            norm = np.sqrt(dx**2 + dy**2)
-            if norm > 3:
-                dx, dy = dx/norm*3, dy/norm*3
-            return axes.c2p(dx, dy) - axes.c2p(0, 0)
+            return clip_norm(np.stack([dx, dy], axis=1), 3).T
         
-        # 创建向量场
-        vector_field = ArrowVectorField(
-            vector_field_func,
-            x_range=[-2.5, 2.5, 0.5],
-            y_range=[-2.5, 2.5, 0.5],
+        # 创建向量场：全部箭头是一个按颜色分层的批量 mobject，箭尾位于采样点
+        vector_field = InstancedArrowField(
+            coords_field(axes, vector_field_func),
+            grid_points([-2.5, 2.5, 0.5], [-2.5, 2.5, 0.5]),
             length_func=lambda norm: 0.3 * sigmoid(norm),
             colors=[BLUE, GREEN],
+            anchor="tail",
+            shaft_width=0.012,
         )
         
         self.play(Create(vector_field))
         self.wait(1)
         
 
-        def generate_spiral_points(num_points=48, max_radius=3.0):
+        def generate_spiral_points(num_points=48, max_radius=3.0, seed=0):
+            # 扰动使用固定种子，保证每次渲染的初值相同，积分结果可以缓存
+            rng = random.Random(seed)
             points = []
             golden_angle = math.pi * (3 - math.sqrt(5))  # 黄金角度，用于均匀分布
             
@@ -75,8 +96,8 @@ class NonlinearSystem(Scene):
                 angle = golden_angle * i
                 
                 # 添加一些随机扰动使点不那么完美排列
-                radius_jitter = radius * (1 + (random.random() - 0.5) * 0.1)
-                angle_jitter = angle + (random.random() - 0.5) * 0.2
+                radius_jitter = radius * (1 + (rng.random() - 0.5) * 0.1)
+                angle_jitter = angle + (rng.random() - 0.5) * 0.2
                 
                 x = radius_jitter * math.cos(angle_jitter)
                 y = radius_jitter * math.sin(angle_jitter)
@@ -88,26 +109,22 @@ class NonlinearSystem(Scene):
         spiral_points = generate_spiral_points()
 
 
+        # 全部初值一次性积分（RK4），超出范围的轨迹由逃逸掩码截断；
+        # 结果按积分器、右端函数和初值缓存，只改排版或画质时不再重新积分
+        def closed_loop(t, state):
+            x, y = state[:, 0], state[:, 1]
+            u = -k1*x - k2*y - k3*x**2  # 改进的控制输入
+            return np.stack([y + x**2, u], axis=1)
+
+        traj = memoize(
+            integrate_batch, closed_loop, spiral_points,
+            t_max=5, dt=0.05,  # 减少模拟时间
+            method="rk4", escape=10,
+        )
+
+        # 先去掉离折线不到半个像素的采样点，再平滑连接，贝塞尔段数减少到约三分之一
         trajectories = VGroup()
-        for x0, y0 in spiral_points:
-            # 数值积分模拟轨迹
-            dt = 0.05
-            t_max = 5  # 减少模拟时间
-            points = [axes.c2p(x0, y0)]
-            x, y = x0, y0
-            for _ in range(int(t_max/dt)):
-                u = -x - y - 0.5*x**2  # 改进的控制输入
-                dx = y + x**2
-                dy = u
-                x += dx * dt
-                y += dy * dt
-                
-                # 如果超出范围则停止
-                if abs(x) > 10 or abs(y) > 10:
-                    break
-                
-                points.append(axes.c2p(x, y))
-            
+        for points in simplify_polylines(trajectories_to_points(axes, traj)):
             trajectory = VMobject()
             trajectory.set_points_smoothly(points)
             trajectory.set_stroke(width=2, color=YELLOW)
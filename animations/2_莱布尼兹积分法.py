@@ -1,22 +1,27 @@
 from manim import *
 import numpy as np
 
+from manim_demo.coords import coordinate_system
+from manim_demo.surfaces import MeshSurface, RevealedSurface
+
 class Leibniz3DProof(ThreeDScene):
     def construct(self):
         # 定义函数和坐标系
         def f(x, y):
             return np.sin(x) + 0.5 * np.cos(y) + 1
         
-        axes = ThreeDAxes(
+        axes = coordinate_system(
+            ThreeDAxes,
             x_range=[0, 3], y_range=[0, 3], z_range=[0, 3],
             x_length=6, y_length=6, z_length=4
         )
         
-        # 绘制曲面 z = f(x,y)
-        surface = Surface(
-            lambda x, y: axes.c2p(x, y, f(x, y)),
+        # 绘制曲面 z = f(x,y)，网格按曲面的弯曲程度细分，面片数不超过原来 30×30 的均匀网格
+        surface = MeshSurface(
+            f,
             u_range=[0, 3], v_range=[0, 3],
-            resolution=30,
+            max_faces=900,
+            axes=axes,
             fill_opacity=0.7,
             checkerboard_colors=[BLUE_D, GREEN_D],
         )
@@ -26,19 +31,24 @@ class Leibniz3DProof(ThreeDScene):
         self.play(Create(axes), Create(surface))
         
         # 动态展示积分过程 T(x) = ∫f dy
+        x_end = 2.5  # 积分上限 x 的终值，窗口网格的范围与边界项的位置都取这个值
         x_tracker = ValueTracker(0.1)
-        integral_slice = always_redraw(lambda:
-            Surface(
-                lambda x, y: axes.c2p(x, y, f(x, y)),
-                u_range=[0, x_tracker.get_value()],
-                v_range=[0, x_tracker.get_value()],
-                resolution=20,
-                fill_opacity=0.5,
-                color=GREEN,
-            )
+        # 整张网格只求值一次，之后每帧只改变显示的 [0, x] × [0, x] 窗口
+        integral_slice = RevealedSurface.from_function(
+            f,
+            u_range=[0, x_end], v_range=[0, x_end],
+            resolution=20,
+            axes=axes,
+            window=(x_tracker.get_value(), x_tracker.get_value()),
+            fill_opacity=0.5,
+            fill_color=GREEN,
+            checkerboard_colors=False,
+        )
+        integral_slice.add_updater(
+            lambda m: m.set_window(x_tracker.get_value(), x_tracker.get_value())
         )
         self.play(Create(integral_slice))
-        self.play(x_tracker.animate.set_value(2.5), run_time=3)
+        self.play(x_tracker.animate.set_value(x_end), run_time=3)
         
         # 高亮边界项 f(x,x)（红色曲线）
         boundary_curve = ParametricFunction(
@@ -52,10 +62,10 @@ class Leibniz3DProof(ThreeDScene):
         # 显示边界贡献 f(x,x)Δx
         dx = 0.2
         boundary_strip = Polygon(
-            axes.c2p(2.5, 2.5, 0),
-            axes.c2p(2.5 + dx, 2.5 + dx, 0),
-            axes.c2p(2.5 + dx, 2.5 + dx, f(2.5, 2.5)),
-            axes.c2p(2.5, 2.5, f(2.5, 2.5)),
+            axes.c2p(x_end, x_end, 0),
+            axes.c2p(x_end + dx, x_end + dx, 0),
+            axes.c2p(x_end + dx, x_end + dx, f(x_end, x_end)),
+            axes.c2p(x_end, x_end, f(x_end, x_end)),
             color=RED, fill_opacity=0.5
         )
         self.play(FadeIn(boundary_strip))
@@ -65,12 +75,12 @@ class Leibniz3DProof(ThreeDScene):
             return np.cos(x)  # f的偏导数
         
         internal_change = Rectangle(
-            width=2.5 * axes.x_axis.unit_size,
+            width=x_end * axes.x_axis.unit_size,
             height=dx * axes.y_axis.unit_size,
             color=YELLOW,
             fill_opacity=0.3,
             stroke_width=0
-        ).move_to(axes.c2p(1.25, 1.25, 0))
+        ).move_to(axes.c2p(x_end / 2, x_end / 2, 0))
         self.play(FadeIn(internal_change))
         
         # 显示公式
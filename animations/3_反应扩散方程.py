@@ -1,48 +1,90 @@
 from manim import *
 import numpy as np
 
+from manim_demo.coords import coordinate_system
+from manim_demo.fields import TimeVaryingArrowField
+from manim_demo.variants import static_mobjects
+
 class ReactionDiffusionVectorField(Scene):
-    def construct(self):
-        # 标题和参数
+    # 可扫描的参数（manim-demo sweep -p lam=...）
+    lam = 15
+
+    @classmethod
+    def build_static(cls):
+        """与 λ 无关的标题、坐标轴和标注，批量渲染时只构建一次"""
         title = VGroup(
             Text("ReactionDiffusionVectorField", font_size=36),
             MathTex(r"u_t = u_{xx} + \lambda u", font_size=32)
         ).arrange(DOWN, buff=0.3)
         title.to_edge(UP)
-        self.play(Write(title))
-        
-        # 参数说明
-        params = MathTex(
-            r"\lambda = 15,\quad U(t) = \sin(2t)",
+
+        # 参数说明的高度与 λ 的取值无关，用占位公式确定坐标轴的位置
+        params_slot = MathTex(
+            r"\lambda = 0,\quad U(t) = \sin(2t)",
             font_size=24
         ).next_to(title, DOWN)
-        self.play(Write(params))
-        
+
         # 创建坐标系统
-        axes = Axes(
+        axes = coordinate_system(
+            Axes,
             x_range=[0, 1, 0.2],
             y_range=[-3, 3, 1],
             axis_config={"color": BLUE},
             x_length=7,
             y_length=5
-        ).next_to(params, DOWN, buff=0.5)
+        ).next_to(params_slot, DOWN, buff=0.5)
         axis_labels = axes.get_axis_labels(
             MathTex(r"x").scale(0.7), 
             MathTex(r"u(x,t)").scale(0.7)
         )
-        self.play(Create(axes), Write(axis_labels))
-        
-        # 添加关键动力学说明
+
+        # 关键动力学说明
         instability = MathTex(
             r"\text{when } \lambda > \pi^2 \approx 9.87 \text{ system becomes unstable}",
             font_size=24,
             color=RED
         ).next_to(axes, DOWN)
+
+        # 边界条件标注
+        bc1 = MathTex(r"u(0,t)=0", color=GREEN).next_to(axes, LEFT)
+        bc2 = MathTex(r"u(1,t)=U(t)", color=RED).next_to(axes, RIGHT)
+        time_label = MathTex("t = ").scale(0.8).next_to(instability, DOWN)
+        return {
+            "title": title,
+            "axes": axes,
+            "axis_labels": axis_labels,
+            "instability": instability,
+            "bc1": bc1,
+            "bc2": bc2,
+            "time_label": time_label,
+        }
+
+    def construct(self):
+        λ = self.lam
+        static = static_mobjects(self)
+
+        # 标题和参数
+        title = static["title"]
+        self.play(Write(title))
+        
+        # 参数说明
+        params = MathTex(
+            rf"\lambda = {λ},\quad U(t) = \sin(2t)",
+            font_size=24
+        ).next_to(title, DOWN)
+        self.play(Write(params))
+        
+        # 创建坐标系统
+        axes = static["axes"]
+        axis_labels = static["axis_labels"]
+        self.play(Create(axes), Write(axis_labels))
+        
+        # 添加关键动力学说明
+        instability = static["instability"]
         self.play(Write(instability))
         
         # 添加边界条件标注
-        bc1 = MathTex(r"u(0,t)=0", color=GREEN).next_to(axes, LEFT)
-        bc2 = MathTex(r"u(1,t)=U(t)", color=RED).next_to(axes, RIGHT)
+        bc1, bc2 = static["bc1"], static["bc2"]
         self.play(Write(bc1), Write(bc2))
         
         # 离散化空间
@@ -52,63 +94,49 @@ class ReactionDiffusionVectorField(Scene):
         
         # 时间追踪器
         time_tracker = ValueTracker(0)
-        time_label = MathTex("t = ").scale(0.8).next_to(instability, DOWN)
+        time_label = static["time_label"]
         time_value = DecimalNumber(
             0, num_decimal_places=2
         ).next_to(time_label, RIGHT)
         self.play(FadeIn(VGroup(time_label, time_value)))
         
-        # 向量场函数
-        def vector_field_func(point):
-            x, y = axes.point_to_coords(point)
-            idx = int(x * nx)
-            
-            # 边缘点处理
-            if idx <= 0:  # x=0
-                if x <= 0:  # 严格在边界上
-                    u_t = np.sin(2 * time_tracker.get_value())  # 使用边界条件
-                    return Vector([0, u_t])
-                else:
-                    return Vector([0, 0])  # 避免索引错误
-            
-            if idx >= nx - 1:  # x=1
-                return Vector([0, np.sin(2 * time_tracker.get_value())])
+        # 向量场函数（一次接收全部采样点 (N, 3)，返回 (N, 2) 向量）
+        def vector_field_func(points):
+            x, y = axes.point_to_coords(points).T
+            idx = (x * nx).astype(int)
+            boundary = np.sin(2 * time_tracker.get_value())  # 使用边界条件
             
             # 内部点处理
             u_left = np.sin(np.pi * (x - dx))
             u_right = np.sin(np.pi * (x + dx))
             u_xx = (u_left - 2*y + u_right) / dx**2
-            u_t = u_xx + 15 * y  # λ=15
-            return Vector([0, u_t])
+            u_t = u_xx + λ * y
+            
+            # 边缘点处理：x=1 取边界条件，x=0 严格在边界上取边界条件，否则为 0 避免索引错误
+            u_t = np.where(idx >= nx - 1, boundary, u_t)
+            u_t = np.where(idx <= 0, np.where(x <= 0, boundary, 0), u_t)
+            return np.stack([np.zeros_like(u_t), u_t], axis=1)
         
-        # 创建向量场
-        def create_vector_field():
-            grid_size = 0.1
-            vectors = VGroup()
-            for x in np.arange(0, 1.01, grid_size):
-                for u in np.arange(-2.5, 3.0, grid_size):
-                    point = axes.c2p(x, u)
-                    vector = vector_field_func(point)
-                    # 根据大小设置颜色和长度
-                    vec_len = np.linalg.norm(vector.get_vector())
-                    if vec_len > 0.5:  # 避免显示过小的向量
-                        vector.set_stroke(
-                            color=interpolate_color(
-                                BLUE, RED, 
-                                clip(0, 1, vec_len/15)
-                            ),
-                            width=1.5
-                        )
-                        # 标准化长度避免过长
-                        max_length = 0.6
-                        if vec_len > max_length:
-                            vector.scale(max_length/vec_len)
-                        vector.move_to(point)
-                        vectors.add(vector)
-            return vectors
+        # 采样网格只需生成一次
+        grid_size = 0.1
+        grid_x, grid_u = np.meshgrid(
+            np.arange(0, 1.01, grid_size),
+            np.arange(-2.5, 3.0, grid_size),
+            indexing="ij",
+        )
+        grid_points = axes.c2p(np.column_stack([grid_x.ravel(), grid_u.ravel()]))
         
-        # 初始向量场
-        vector_field = create_vector_field()
+        # 创建向量场：箭头只分配一次，之后每帧就地更新
+        # 长度不超过 0.5 的向量隐藏，显示长度标准化到不超过 0.6
+        vector_field = TimeVaryingArrowField(
+            vector_field_func,
+            grid_points,
+            max_length=0.6,
+            min_length=0.5,
+            colors=[BLUE, RED],
+            color_range=(0, 15),
+            stroke_width=1.5,
+        )
         self.play(Create(vector_field))
         
         # 添加流线指示
@@ -117,11 +145,7 @@ class ReactionDiffusionVectorField(Scene):
         self.play(FadeIn(stream_text))
         
         # 时间动画函数
-        def update_vector_field(mob):
-            new_field = create_vector_field()
-            mob.become(new_field)
-            
-        vector_field.add_updater(update_vector_field)
+        vector_field.add_updater(lambda m: m.update_field())
         time_value.add_updater(
             lambda m: m.set_value(time_tracker.get_value())
         )
@@ -133,9 +157,11 @@ class ReactionDiffusionVectorField(Scene):
             rate_func=linear
         )
         
-        # 最后强调不稳定模式
+        # 最后强调不稳定模式：箭头本来就按长度从蓝到红分层着色，
+        # 这里只把当前有箭头的最强 4 层（增长最快的区域）短暂变成黄色再恢复
+        strongest = [batch for batch in vector_field.batches if batch.has_points()][-4:]
         self.play(
-            vector_field.animate.set_color_by_gradient(BLUE, RED),
+            *(batch.animate.set_fill(YELLOW) for batch in strongest),
             rate_func=there_and_back,
             run_time=2
         )
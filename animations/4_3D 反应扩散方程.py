@@ -1,15 +1,33 @@
 from manim import *
 import numpy as np
 
+from manim_demo.cache import memoize
+from manim_demo.coords import coordinate_system
+from manim_demo.pde import solve_reaction_diffusion
+from manim_demo.surfaces import MeshSurface
+from manim_demo.variants import static_mobjects
+
+# 空间长度与总时长决定坐标轴，属于静态部分
+L = 1.0
+T = 2.0
+
+
+# 初始条件：u(x,0) = sin(πx)
+def initial_condition(x):
+    return np.sin(np.pi * x)
+
+
 class StableReactionDiffusion3D(ThreeDScene):
-    def construct(self):
-        # 修复后的参数设置（数值稳定）
-        λ = 5.0   # 降低λ值防止数值爆炸
-        L = 1.0
-        T = 2.0
-        
-        # 创建坐标轴
-        axes = ThreeDAxes(
+    # 可扫描的参数（manim-demo sweep -p lam=... -p U_control=...）
+    lam = 5.0        # 降低λ值防止数值爆炸
+    U_control = 0.5  # 边界条件
+    D = 0.1          # 扩散系数
+
+    @classmethod
+    def build_static(cls):
+        """与参数无关的坐标轴、初始条件曲线和方程，批量渲染时只构建一次"""
+        axes = coordinate_system(
+            ThreeDAxes,
             x_range=[0, L, 0.2],
             y_range=[0, T, 0.5],
             z_range=[-2, 2, 1],
@@ -23,68 +41,74 @@ class StableReactionDiffusion3D(ThreeDScene):
             Tex("u").scale(0.7)
         )
 
-        # 初始条件：u(x,0) = sin(πx)
-        def initial_condition(x):
-            return np.sin(np.pi * x)
+        # 初始条件可视化
+        initial_line = ParametricFunction(
+            lambda x: axes.c2p(x, 0, initial_condition(x)),
+            t_range=[0, L],
+            color=GREEN,
+            stroke_width=4
+        )
+        initial_label = MathTex(r"u(x,0) = \sin(\pi x)", color=GREEN).scale(0.8)
+        initial_label.next_to(initial_line, OUT, buff=0.1)
 
-        # 边界条件
-        U_control = 0.5
-        
-        # 数值求解（修复数值稳定性）
+        # 方程文本
+        equations = VGroup(
+            Tex("Reaction-Diffusion Equation"),
+            MathTex(
+                r"\frac{\partial u}{\partial t} = D\frac{\partial^2 u}{\partial x^2} + \lambda u",
+                color=BLUE
+            ).scale(0.8),
+            MathTex(
+                r"u(0,t) = 0, \quad u(1,t) = U(t)",
+                color=YELLOW
+            ).scale(0.8),
+        ).arrange(DOWN, aligned_edge=LEFT)
+        equations.to_edge(UL, buff=0.25)
+        return {
+            "axes": axes,
+            "axes_labels": axes_labels,
+            "initial_line": initial_line,
+            "initial_label": initial_label,
+            "equations": equations,
+        }
+
+    def construct(self):
+        λ = self.lam
+        U_control = self.U_control
+        D = self.D
+
+        static = static_mobjects(self)
+        axes = static["axes"]
+        axes_labels = static["axes_labels"]
+
+        # 数值求解：Crank–Nicolson 隐式格式，无条件稳定；
+        # 结果按求解器、初边值条件和参数缓存，调整画面时不再重新求解
         nx, nt = 100, 200
-        dx = L / nx
-        dt = T / nt
-        u = np.zeros((nx, nt))
-        
-        # 设置初始条件
-        for i in range(nx):
-            u[i, 0] = initial_condition(i * dx)
-            
-        # 数值稳定性改进：添加扩散常数
-        D = 0.1  # 扩散系数
-        
-        # 时域迭代
-        for n in range(nt-1):
-            u[0, n+1] = 0
-            u[-1, n+1] = U_control * (1 - np.exp(-5*n*dt))
-            
-            # 稳定格式：前向差分
-            for i in range(1, nx-1):
-                uxx = (u[i+1, n] - 2*u[i, n] + u[i-1, n]) / (dx**2)
-                # 添加数值稳定性项
-                u[i, n+1] = u[i, n] + dt * (D * uxx + λ * u[i, n])
+        solution = memoize(
+            solve_reaction_diffusion,
+            initial_condition,
+            left=0,
+            right=lambda t: U_control * (1 - np.exp(-5*t)),
+            L=L, T=T, nx=nx, nt=nt,
+            D=D, lam=λ,
+            method="crank-nicolson",
+        )
+        u = solution.u
         
         # 修复LaTeX转义问题
-        initial_label = MathTex(r"u(x,0) = \sin(\pi x)", color=GREEN).scale(0.8)
         lambda_label = MathTex(f"\\lambda = {λ}", color=RED).scale(0.8)
         
-        # 创建曲面函数
-        def surface_func(x, t):
-            # 限制数值范围防止溢出
-            xi = int(x * nx / L)
-            ti = int(t * nt / T)
-            
-            if xi < 0: xi = 0
-            if xi >= nx: xi = nx - 1
-            if ti < 0: ti = 0
-            if ti >= nt: ti = nt - 1
-            
-            # 数值裁剪
-            value = u[xi, ti]
-            if np.isnan(value) or np.abs(value) > 10:
-                return 0
-            return value
-        
-        # 创建曲面
-        surface = Surface(
-            lambda x, t: axes.c2p(
-                x, 
-                t, 
-                surface_func(x, t)
-            ),
-            u_range=[0, L],
-            v_range=[0, T],
-            resolution=(nx//10, nt//10),
+        # 直接由数值解数组生成曲面，NaN 或超出 [-10, 10] 的值置 0 防止溢出；
+        # 网格按解的起伏细分，面片数与原来 (nx//10)×(nt//10) 的均匀网格相同
+        surface = MeshSurface.from_data(
+            u,
+            solution.x,
+            solution.t,
+            axes=axes,
+            base_resolution=(5, 10),
+            max_faces=(nx//10) * (nt//10),
+            valid_range=(-10, 10),
+            invalid=0,
             fill_opacity=0.7,
             checkerboard_colors=[BLUE_D, BLUE_C],
         )
@@ -99,14 +123,8 @@ class StableReactionDiffusion3D(ThreeDScene):
         U_label = MathTex("U(t)", color=YELLOW).scale(0.8)
         U_label.next_to(U_line, OUT, buff=0.1)
         
-        # 初始条件可视化
-        initial_line = ParametricFunction(
-            lambda x: axes.c2p(x, 0, initial_condition(x)),
-            t_range=[0, L],
-            color=GREEN,
-            stroke_width=4
-        )
-        initial_label.next_to(initial_line, OUT, buff=0.1)
+        initial_line = static["initial_line"]
+        initial_label = static["initial_label"]
         lambda_label.to_corner(UR)
 
         # 设置相机视角
@@ -139,19 +157,7 @@ class StableReactionDiffusion3D(ThreeDScene):
             rate_func=linear
         )
         
-        # 添加方程文本（修复LaTeX格式）
-        equations = VGroup(
-            Tex("Reaction-Diffusion Equation"),
-            MathTex(
-                r"\frac{\partial u}{\partial t} = D\frac{\partial^2 u}{\partial x^2} + \lambda u",
-                color=BLUE
-            ).scale(0.8),
-            MathTex(
-                r"u(0,t) = 0, \quad u(1,t) = U(t)",
-                color=YELLOW
-            ).scale(0.8),
-        ).arrange(DOWN, aligned_edge=LEFT)
-        equations.to_edge(UL, buff=0.25)
+        equations = static["equations"]
         
         # 添加方程说明
         self.play(
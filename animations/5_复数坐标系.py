@@ -1,10 +1,15 @@
 from manim import *
 import numpy as np
 
+from manim_demo.coords import coordinate_system
+from manim_demo.surfaces import DeformableSurface
+from manim_demo.sweep import sweep_values
+
 class ComplexLogPlotWithLabels(ThreeDScene):
     def construct(self):
         # 设置坐标系（带标签）
-        axes = ThreeDAxes(
+        axes = coordinate_system(
+            ThreeDAxes,
             x_range=[-3, 3, 1],
             y_range=[-3, 3, 1],
             z_range=[-3, 3, 1],
@@ -23,25 +28,16 @@ class ComplexLogPlotWithLabels(ThreeDScene):
         self.set_camera_orientation(phi=60*DEGREES, theta=-45*DEGREES)
         self.add(axes, labels)
 
-        # 改进的复数对数计算函数
+        # 改进的复数对数计算函数（向量化：x、b 都可以是数组，按广播规则求值）
         def safe_complex_log(x, b):
-            if abs(x) < 1e-6 or abs(b) < 1e-6:
-                return 0
-                
-            r_x = np.sqrt(x.real**2 + x.imag**2)
-            theta_x = np.arctan2(x.imag, x.real)
-            
-            r_b = np.sqrt(b.real**2 + b.imag**2)
-            theta_b = np.arctan2(b.imag, b.real)
-            
-            ln_x = np.log(r_x) + 1j * theta_x
-            ln_b = np.log(r_b) + 1j * theta_b
-            
-            if abs(ln_b) < 1e-6:
-                return 0
-                
-            result = ln_x / ln_b
-            return result.real if not np.isnan(result.real) else 0
+            b = np.asarray(b, dtype=complex)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                # np.log 对复数取主值：ln|x| + i·arg(x)；b≈0 时先换成 1，结果在下面置 0
+                ln_b = np.log(np.where(np.abs(b) >= 1e-6, b, 1))
+                result = np.log(x) / ln_b
+            # 奇异点：x≈0、b≈0 或 ln(b)≈0 时置 0
+            singular = (np.abs(x) < 1e-6) | (np.abs(b) < 1e-6) | (np.abs(ln_b) < 1e-6)
+            return np.where(singular | np.isnan(result.real), 0, result.real)
 
         # 创建值追踪器（范围改为-3到3）
         t_tracker = ValueTracker(-3)  # 初始值设为-3
@@ -63,22 +59,26 @@ class ComplexLogPlotWithLabels(ThreeDScene):
         b_label = always_redraw(update_b_label)
         equation_label = Tex("$y = \\log_b(x)$", font_size=28).next_to(b_label, DOWN, aligned_edge=LEFT)
         
-        # 创建曲面函数（直接使用t_tracker的值作为b）
-        def surface_func(a, b):
-            x = a + 1j*b
-            base = t_tracker.get_value()
-            return safe_complex_log(x, base)
+        # 创建曲面函数（a、b 为网格数组，base 取 t_tracker 的值）
+        def surface_func(a, b, base):
+            return safe_complex_log(a + 1j*b, base)
 
-        # 初始曲面
-        surface = Surface(
-            lambda a, b: [a, b, surface_func(a, b)],
+        # 初始曲面：面片只创建一次，之后只更新顶点高度和颜色；
+        # 网格按几个典型底数下的形状细分，原点附近的奇点处更密，面片数与 20×20 的均匀网格相同
+        surface = DeformableSurface(
+            surface_func,
             u_range=[-3, 3],
             v_range=[-3, 3],
-            resolution=(20, 20),
+            adaptive=(-3, -2, 2, 3),
+            max_faces=400,
+            parameter=t_tracker.get_value(),
+            color_func=get_color,  # 根据b值变化颜色
+            checkerboard_colors=False,
             fill_opacity=0.7,
-            color=get_color(-3),  # 初始颜色
             stroke_width=0.1
         )
+        # 整个 b 扫描预先算好并缓存到磁盘，渲染时每帧只读取对应的切片
+        surface.precompute(sweep_values(-3, 3, run_time=12))
 
         # 添加固定元素
         self.add_fixed_in_frame_mobjects(b_label, equation_label)
@@ -88,20 +88,7 @@ class ComplexLogPlotWithLabels(ThreeDScene):
         self.begin_ambient_camera_rotation(rate=0.1)
 
         # 曲面更新函数
-        def update_surface(m):
-            m.become(
-                Surface(
-                    lambda a, b: [a, b, surface_func(a, b)],
-                    u_range=[-3, 3],
-                    v_range=[-3, 3],
-                    resolution=(20, 20),
-                    fill_opacity=0.7,
-                    color=get_color(t_tracker.get_value()),  # 使用正确的颜色函数
-                    stroke_width=0.1
-                )
-            )
-
-        surface.add_updater(update_surface)
+        surface.add_updater(lambda m: m.set_parameter(t_tracker.get_value()))
 
         # 动画序列（从-3到3）
         self.play(
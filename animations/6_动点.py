@@ -1,9 +1,13 @@
 from manim import *
 
+from manim_demo.coords import coordinate_system
+from manim_demo.motion import Motion
+
 class MovingPointsOnNumberLine(Scene):
     def construct(self):
         # 数轴
-        number_line = NumberLine(
+        number_line = coordinate_system(
+            NumberLine,
             x_range=[-30, 15, 2],
             length=12,
             include_numbers=True,
@@ -28,75 +32,42 @@ class MovingPointsOnNumberLine(Scene):
             Write(VGroup(label_A, label_B, label_C))
         )
 
+        # P、Q 的运动都是时间 t 的纯函数（t 从 P 出发时算起）：
+        # P 从 A 以速度 1 一直向右；Q 在 t=14 从 A 出发，以速度 3 到 C 后原速返回 A 并停止
+        P = Motion.start(A).move_to(13, speed=1)
+        Q = Motion.start(A, time=14).bounce(C, speed=3)
+
+        # 时钟：updater 只读取它的值，任何一帧都可以单独求出
+        clock = ValueTracker(0)
+
         # 动点 P
         dot_P = Dot(number_line.n2p(A), color=YELLOW)
         label_P = Text("P", font_size=24, color=YELLOW).next_to(dot_P, UP)
         self.play(Create(dot_P), Write(label_P))
+        dot_P.add_updater(lambda m: m.move_to(number_line.n2p(P(clock.get_value()))))
+        label_P.add_updater(lambda m: m.next_to(dot_P, UP))
 
         # P 移动到 B（0 到 14 秒）
-        self.play(
-            dot_P.animate.move_to(number_line.n2p(B)),
-            label_P.animate.next_to(number_line.n2p(B), UP),
-            run_time=14,
-            rate_func=linear
-        )
+        self.play(clock.animate.set_value(14), run_time=14, rate_func=linear)
 
         # 此时创建 Q
         dot_Q = Dot(number_line.n2p(A), color=PURPLE)
         label_Q = Text("Q", font_size=24, color=PURPLE).next_to(dot_Q, UP)
         self.play(Create(dot_Q), Write(label_Q))
+        dot_Q.add_updater(lambda m: m.move_to(number_line.n2p(Q(clock.get_value()))))
+        label_Q.add_updater(lambda m: m.next_to(dot_Q, UP))
 
-        # 同步移动 P 和 Q
-        # 总时间从 t=14 开始，模拟到 t=37（足够覆盖所有解）
-        total_sim_time = 23  # 从 t=14 到 t=37
-
-        # 定义 updater
-        p_start_time = 14  # P 已经走了14秒
-        q_start_time = 0   # Q 的局部时间
-
-        def p_updater(mob, dt):
-            nonlocal p_start_time
-            p_start_time += dt
-            pos = -24 + p_start_time
-            mob.move_to(number_line.n2p(pos))
-            label_P.next_to(mob, UP)
-
-        def q_updater(mob, dt):
-            nonlocal q_start_time
-            q_start_time += dt
-            tau = q_start_time
-            if tau <= 34 / 3:
-                pos = -24 + 3 * tau
-            elif tau <= 68 / 3:
-                pos = 86 - 3 * (tau + 14) + 3 * 14  # 简化为 86 - 3*(tau + 14 - 14) = 86 - 3*tau
-                # 实际：Q(t) = 86 - 3t, t = 14 + tau → Q = 86 - 3(14 + tau) = 44 - 3*tau
-                # 但这里 tau 是 Q 的局部时间，所以 Q = -24 + 3*tau (去程), 或 10 - 3*(tau - 34/3) (返程)
-                # 更清晰写法：
-                if tau <= 34 / 3:
-                    pos = -24 + 3 * tau
-                else:
-                    pos = 10 - 3 * (tau - 34 / 3)
-            else:
-                pos = -24  # 停止
-            mob.move_to(number_line.n2p(pos))
-            label_Q.next_to(mob, UP)
-
-        dot_P.add_updater(p_updater)
-        dot_Q.add_updater(q_updater)
-
-        self.add(dot_P, label_P, dot_Q, label_Q)
-
-        # 运行动画
-        self.wait(total_sim_time)
+        # 同步移动 P 和 Q，从 t=14 模拟到 t=37（足够覆盖所有解）
+        self.play(clock.animate.set_value(37), run_time=23, rate_func=linear)
 
         # 移除 updater
-        dot_P.clear_updaters()
-        dot_Q.clear_updaters()
+        for mob in (dot_P, label_P, dot_Q, label_Q):
+            mob.clear_updaters()
 
-        # 显示答案
-        solutions = [20, 22, 27, 28]
+        # 显示答案：P、Q 相距 2 的时刻，由两段运动之差逐段解出
+        solutions = P.meetings(Q, distance=2)
         ans_text = VGroup(*[
-            MathTex(f"t = {s}") for s in solutions
+            MathTex(f"t = {s:g}") for s in solutions
         ]).arrange(DOWN).to_edge(UP)
         self.play(Write(ans_text))
-        self.wait(2)
\ No newline at end of file
+        self.wait(2)
@@ -1,16 +1,22 @@
 from manim import *
 import numpy as np
 
+from manim_demo.coords import coordinate_system
+from manim_demo.curves import sampled_curve
+from manim_demo.rbf import RBFNetwork
+from manim_demo.variants import static_mobjects
+
 class RBFAnimation(Scene):
-    def construct(self):
-        # 定义参数
-        x_range = np.linspace(0, 10, 1000)
-        centers = np.array([2, 4, 6, 8])
-        sigmas = np.array([0.5, 0.7, 0.4, 0.6])
-        weights = np.array([3, 0.8, 1.5, -1.0])
-        
-        # 创建坐标轴
-        axes = Axes(
+    # 可扫描的参数（manim-demo sweep -p "weights=[3,0.8,1.5,-1],[1,1,1,1]"）
+    centers = (2, 4, 6, 8)
+    sigmas = (0.5, 0.7, 0.4, 0.6)
+    weights = (3, 0.8, 1.5, -1.0)
+
+    @classmethod
+    def build_static(cls):
+        """与网络参数无关的坐标轴和标签，批量渲染时只构建一次"""
+        axes = coordinate_system(
+            Axes,
             x_range=[0, 10, 1],
             y_range=[-3, 3, 1],
             axis_config={"color": BLUE},
@@ -19,6 +25,18 @@ class RBFAnimation(Scene):
         # 标签坐标轴
         x_label = axes.get_x_axis_label("x")
         y_label = axes.get_y_axis_label("y")
+        return {"axes": axes, "x_label": x_label, "y_label": y_label}
+
+    def construct(self):
+        # 定义参数
+        x_range = np.linspace(0, 10, 1000)
+        centers = np.array(self.centers)
+        sigmas = np.array(self.sigmas)
+        weights = np.array(self.weights)
+        
+        # 创建坐标轴
+        static = static_mobjects(self)
+        axes, x_label, y_label = static["axes"], static["x_label"], static["y_label"]
         
         self.play(Create(axes), Write(x_label), Write(y_label))
         self.wait(1)
@@ -42,42 +60,33 @@ class RBFAnimation(Scene):
         self.play(LaggedStart(*[Create(dot) for dot in center_dots], lag_ratio=0.2))
         self.wait(1)
         
+        # 基函数矩阵 Φ（采样点 × 中心）只计算一次，后续曲线都由它得到
+        network = RBFNetwork(centers, sigmas, weights)
+        phi = network.basis(x_range)
+        
         # 步骤3：绘制多个高斯函数
-        gaussian_curves = VGroup()
-        for i, (c, sigma) in enumerate(zip(centers, sigmas)):
-            def make_curve(center, sigma_val):
-                return axes.plot(
-                    lambda x: np.exp(-((x - center) ** 2) / (2 * sigma_val ** 2)),
-                    color=TEAL,
-                    x_range=[0, 10],
-                )
-            curve = make_curve(c, sigma)
-            gaussian_curves.add(curve)
+        gaussian_curves = VGroup(*[
+            sampled_curve(axes, x_range, phi[:, i], color=TEAL)
+            for i in range(len(centers))
+        ])
         
         self.play(LaggedStart(*[Create(curve) for curve in gaussian_curves], lag_ratio=0.3))
         self.wait(1)
         
         # 步骤4：乘以权重调整高度
-        weighted_curves = VGroup()
-        for i, (c, sigma, w) in enumerate(zip(centers, sigmas, weights)):
-            def make_weighted_curve(center, sigma_val, weight):
-                return axes.plot(
-                    lambda x: weight * np.exp(-((x - center) ** 2) / (2 * sigma_val ** 2)),
-                    color=GREEN,
-                    x_range=[0, 10],
-                )
-            weighted_curve = make_weighted_curve(c, sigma, w)
-            weighted_curves.add(weighted_curve)
+        weighted = phi * weights
+        weighted_curves = VGroup(*[
+            sampled_curve(axes, x_range, weighted[:, i], color=GREEN)
+            for i in range(len(centers))
+        ])
         
         self.play(Transform(gaussian_curves, weighted_curves))
         self.wait(1)
         
         # 步骤5：叠加高斯函数形成最终曲线
-        final_curve = axes.plot(
-            lambda x: sum(w * np.exp(-((x - c) ** 2) / (2 * sigma ** 2)) 
-                         for c, sigma, w in zip(centers, sigmas, weights)),
+        final_curve = sampled_curve(
+            axes, x_range, phi @ weights,
             color=YELLOW,
-            x_range=[0, 10],
             stroke_width=4
         )
         
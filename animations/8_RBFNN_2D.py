@@ -1,21 +1,28 @@
 from manim import *
 import numpy as np
 
+from manim_demo.coords import coordinate_system
+from manim_demo.rbf import RBFNetwork
+from manim_demo.surfaces import GridSurface
+from manim_demo.variants import static_mobjects
+
 class RBF2DAnimation(ThreeDScene):
-    def construct(self):
-        # === 参数设置 ===
-        centers = np.array([
-            [-1, -1],
-            [0, 0],
-            [1, 1],
-            [-1, 1],
-            [1, -1]
-        ])  # shape: (5, 2)
-        b = 0.8  # 共享宽度
-        weights = np.array([1.2, -0.8, 1.0, 0.6, -0.5])
+    # 可扫描的参数（manim-demo sweep -p b=0.5,0.8,1.2）
+    centers = (
+        (-1, -1),
+        (0, 0),
+        (1, 1),
+        (-1, 1),
+        (1, -1),
+    )  # shape: (5, 2)
+    b = 0.8  # 共享宽度
+    weights = (1.2, -0.8, 1.0, 0.6, -0.5)
 
-        # === 创建 3D 坐标轴 ===
-        axes = ThreeDAxes(
+    @classmethod
+    def build_static(cls):
+        """与网络参数无关的 3D 坐标轴和标签，批量渲染时只构建一次"""
+        axes = coordinate_system(
+            ThreeDAxes,
             x_range=[-2, 2, 1],
             y_range=[-2, 2, 1],
             z_range=[-1.5, 2, 0.5],
@@ -27,6 +34,18 @@ class RBF2DAnimation(ThreeDScene):
         x_label = axes.get_x_axis_label("x_1")
         y_label = axes.get_y_axis_label("x_2")
         z_label = axes.get_z_axis_label("f")
+        return {"axes": axes, "x_label": x_label, "y_label": y_label, "z_label": z_label}
+
+    def construct(self):
+        # === 参数设置 ===
+        centers = np.array(self.centers)
+        b = self.b
+        weights = np.array(self.weights)
+
+        # === 创建 3D 坐标轴 ===
+        static = static_mobjects(self)
+        axes = static["axes"]
+        x_label, y_label, z_label = static["x_label"], static["y_label"], static["z_label"]
 
         self.set_camera_orientation(phi=75 * DEGREES, theta=-45 * DEGREES)
         self.add(axes, x_label, y_label, z_label)
@@ -40,64 +59,52 @@ class RBF2DAnimation(ThreeDScene):
         self.play(LaggedStart(*[Create(dot) for dot in center_dots], lag_ratio=0.2))
         self.wait(1)
 
-        # === 步骤2：绘制每个 RBF 高斯基函数（未加权）===
-        def rbf_func(x, y, center, sigma):
-            dx = x - center[0]
-            dy = y - center[1]
-            return np.exp(-(dx**2 + dy**2) / (2 * sigma**2))
+        # === 基函数矩阵只在每个网格上计算一次，三个步骤的曲面都由它得到 ===
+        network = RBFNetwork(centers, b, weights)
+        grid = np.linspace(-2, 2, 21)  # resolution=(20, 20) 的顶点
+        phi, weighted, _ = network.on_grid(grid, grid)
 
-        rbf_surfaces = VGroup()
-        for c in centers:
-            surface = Surface(
-                lambda u, v: axes.c2p(
-                    u, v,
-                    rbf_func(u, v, c, b)
-                ),
-                u_range=[-2, 2],
-                v_range=[-2, 2],
-                resolution=(20, 20),
+        # === 步骤2：绘制每个 RBF 高斯基函数（未加权）===
+        rbf_surfaces = VGroup(*[
+            GridSurface(
+                phi[:, :, i],
+                x=grid, y=grid,
+                axes=axes,
                 fill_opacity=0.6,
                 stroke_width=0.5,
                 stroke_color=TEAL
             )
-            rbf_surfaces.add(surface)
+            for i in range(len(centers))
+        ])
 
         self.begin_ambient_camera_rotation(rate=0.1)
         self.play(LaggedStart(*[Create(surf) for surf in rbf_surfaces], lag_ratio=0.3))
         self.wait(2)
 
         # === 步骤3：应用权重（改变高度）===
-        weighted_surfaces = VGroup()
-        for c, w in zip(centers, weights):
-            surface = Surface(
-                lambda u, v, c=c, w=w: axes.c2p(
-                    u, v,
-                    w * rbf_func(u, v, c, b)
-                ),
-                u_range=[-2, 2],
-                v_range=[-2, 2],
-                resolution=(20, 20),
+        weighted_surfaces = VGroup(*[
+            GridSurface(
+                weighted[:, :, i],
+                x=grid, y=grid,
+                axes=axes,
                 fill_opacity=0.6,
                 stroke_width=0.5,
                 stroke_color=GREEN
             )
-            weighted_surfaces.add(surface)
+            for i in range(len(centers))
+        ])
 
         self.play(Transform(rbf_surfaces, weighted_surfaces))
         self.wait(2)
 
         # === 步骤4：叠加形成最终输出曲面 ===
-        def final_func(x, y):
-            total = 0.0
-            for c, w in zip(centers, weights):
-                total += w * np.exp(-((x - c[0])**2 + (y - c[1])**2) / (2 * b**2))
-            return total
-
-        final_surface = Surface(
-            lambda u, v: axes.c2p(u, v, final_func(u, v)),
-            u_range=[-2, 2],
-            v_range=[-2, 2],
-            resolution=(30, 30),
+        final_grid = np.linspace(-2, 2, 31)  # resolution=(30, 30) 的顶点
+        _, _, final_values = network.on_grid(final_grid, final_grid)
+
+        final_surface = GridSurface(
+            final_values,
+            x=final_grid, y=final_grid,
+            axes=axes,
             fill_opacity=0.8,
             stroke_width=0,
             color=YELLOW
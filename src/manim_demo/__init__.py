@@ -0,0 +1 @@
+"""animations/ 下各个场景共用的数值与渲染工具"""
@@ -0,0 +1,341 @@
+"""场景基准测试与性能回归对比
+
+每个 (场景, 质量) 在独立的 spawn 进程里渲染一次，记录：
+- wall      整个 render() 的耗时
+- numeric   play 之外调用 NUMERIC_FUNCTIONS 中数值函数的耗时（积分、PDE、网格细分、缓存读写等），
+            在创建 mobject 时调用的部分同时计入 mobjects；memoize 每次都用空的临时缓存目录，
+            数值都是冷缓存下的结果，不受之前运行的影响
+- mobjects  construct 中 play 之外创建 mobject 的耗时（含 Tex 编译）
+- render    全部 play / wait 的耗时，plays 为逐个的明细
+- frames / fps   写出的帧数与渲染速度
+- peak_rss_mb    进程的峰值常驻内存
+
+结果追加到 JSON 历史文件，compare 对比其中两次运行并标出超过阈值的变慢。
+"""
+import contextlib
+import datetime
+import functools
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from .render import load_scene_class
+
+# 越大越差的指标；fps 由 render 决定，不单独比较
+COMPARED_METRICS = ("wall", "numeric", "mobjects", "render", "peak_rss_mb")
+
+# 计入 numeric 的数值函数（模块:名称）
+NUMERIC_FUNCTIONS = (
+    "manim_demo.integrate:integrate_batch",
+    "manim_demo.pde:solve_reaction_diffusion",
+    "manim_demo.cache:memoize",
+    "manim_demo.tessellation:uniform_mesh",
+    "manim_demo.tessellation:adaptive_mesh",
+    "manim_demo.curves:simplify_polylines",
+    "manim_demo.rbf:basis_matrix",
+)
+
+
+class BenchResult(NamedTuple):
+    scene: str
+    quality: str
+    wall: float
+    numeric: float
+    mobjects: float
+    render: float
+    plays: list
+    frames: int
+    fps: float
+    peak_rss_mb: float
+    error: str | None = None
+
+
+class Regression(NamedTuple):
+    scene: str
+    quality: str
+    metric: str
+    old: float
+    new: float
+
+    @property
+    def ratio(self):
+        return self.new / self.old if self.old else float("inf")
+
+
+def _all_subclasses(cls):
+    seen = set()
+    stack = [cls]
+    while stack:
+        for sub in stack.pop().__subclasses__():
+            if sub not in seen:
+                seen.add(sub)
+                stack.append(sub)
+    return seen | {cls}
+
+
+class _Timer:
+    """累计被包装的调用的耗时，嵌套调用只统计最外层；paused 时（play 期间）不计"""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.paused = False
+        self._depth = 0
+        self._patched = []
+
+    def __exit__(self, *exc):
+        for owner, name, original in reversed(self._patched):
+            setattr(owner, name, original)
+        self._patched.clear()
+
+    def _patch(self, owner, name, value):
+        self._patched.append((owner, name, vars(owner)[name]))
+        setattr(owner, name, value)
+
+    def _wrap(self, func):
+        timer = self
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            if timer._depth or timer.paused:
+                return func(*args, **kwargs)
+            timer._depth += 1
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timer.seconds += time.perf_counter() - start
+                timer._depth -= 1
+
+        return timed
+
+
+class _MobjectTimer(_Timer):
+    """给所有 Mobject 子类自己定义的 __init__ 套上计时"""
+
+    def __enter__(self):
+        from manim import Mobject
+
+        for cls in _all_subclasses(Mobject):
+            if "__init__" in cls.__dict__:
+                self._patch(cls, "__init__", self._wrap(cls.__dict__["__init__"]))
+        return self
+
+
+class _NumericTimer(_Timer):
+    """给 NUMERIC_FUNCTIONS 套上计时
+
+    manim_demo 的模块之间以及场景文件都用 from ... import 取得这些函数，
+    所以除了定义它的模块，已导入的 manim_demo 模块中指向同一函数的名字也一并替换；
+    场景文件要在进入之后再导入。
+    """
+
+    def __init__(self, functions=NUMERIC_FUNCTIONS):
+        super().__init__()
+        self.functions = functions
+
+    def __enter__(self):
+        wrappers = {}
+        for target in self.functions:
+            module_name, _, name = target.partition(":")
+            func = getattr(importlib.import_module(module_name), name)
+            wrappers[id(func)] = self._wrap(func)
+        for module_name, module in list(sys.modules.items()):
+            if module is None or not (module_name == "manim_demo" or module_name.startswith("manim_demo.")):
+                continue
+            for name, value in list(vars(module).items()):
+                if id(value) in wrappers:
+                    self._patch(module, name, wrappers[id(value)])
+        return self
+
+
+@contextlib.contextmanager
+def _cold_cache(directory):
+    """临时把 MANIM_DEMO_CACHE 指向 directory，退出时恢复"""
+    previous = os.environ.get("MANIM_DEMO_CACHE")
+    os.environ["MANIM_DEMO_CACHE"] = str(directory)
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop("MANIM_DEMO_CACHE", None)
+        else:
+            os.environ["MANIM_DEMO_CACHE"] = previous
+
+
+def benchmark_scene(spec, quality, media_dir=None, config_overrides=None, random_seed=0):
+    """在当前进程中渲染一次场景并返回 BenchResult"""
+    from manim import config, tempconfig
+
+    plays = []
+    frames = [0]
+    timer = _MobjectTimer()
+    numeric = _NumericTimer()
+    # 先替换数值函数再导入场景文件，场景中 from ... import 得到的是计时的版本；
+    # memoize 的缓存指向本次运行的临时目录，每次都从冷缓存开始
+    with tempfile.TemporaryDirectory() as tmp, _cold_cache(Path(tmp) / "data"), numeric:
+        scene_cls = load_scene_class(spec)
+
+        class Timed(scene_cls):
+            def construct(self):
+                renderer = self.renderer
+                add_frame = renderer.add_frame
+
+                def counted(frame, num_frames=1):
+                    if not renderer.skip_animations:
+                        frames[0] += num_frames
+                    return add_frame(frame, num_frames)
+
+                renderer.add_frame = counted
+                super().construct()
+
+            def play(self, *args, **kwargs):
+                timer.paused = numeric.paused = True
+                start = time.perf_counter()
+                try:
+                    super().play(*args, **kwargs)
+                finally:
+                    plays.append(time.perf_counter() - start)
+                    timer.paused = numeric.paused = False
+
+        Timed.__name__ = scene_cls.__name__
+        overrides = {"input_file": str(spec.file), "disable_caching": True, **(config_overrides or {})}
+        overrides.setdefault("media_dir", str(media_dir or Path(tmp) / "media"))
+        with tempconfig(overrides), timer:
+            config.quality = quality
+            start = time.perf_counter()
+            Timed(random_seed=random_seed).render()
+            wall = time.perf_counter() - start
+
+    render = sum(plays)
+    return BenchResult(
+        scene=spec.name,
+        quality=quality,
+        wall=wall,
+        numeric=numeric.seconds,
+        mobjects=timer.seconds,
+        render=render,
+        plays=plays,
+        frames=frames[0],
+        fps=frames[0] / render if render else 0.0,
+        peak_rss_mb=_peak_rss_mb(),
+    )
+
+
+def _peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KiB 为单位，macOS 以字节为单位
+    return rss / 1024**2 if sys.platform == "darwin" else rss / 1024
+
+
+def _run_benchmark(args):
+    spec, quality = args
+    try:
+        return benchmark_scene(spec, quality)
+    except Exception as e:
+        return BenchResult(spec.name, quality, 0.0, 0.0, 0.0, 0.0, [], 0, 0.0, _peak_rss_mb(), repr(e))
+
+
+def run_benchmarks(specs, qualities=("low_quality", "high_quality"), max_workers=1, on_result=None):
+    """每个 (场景, 质量) 使用一个全新的进程，保证峰值内存互不影响
+
+    默认串行执行，避免多个渲染进程争抢 CPU 影响计时。
+    """
+    tasks = [(spec, quality) for spec in specs for quality in qualities]
+    context = multiprocessing.get_context("spawn")
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context, max_tasks_per_child=1) as pool:
+        for result in pool.map(_run_benchmark, tasks):
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    return results
+
+
+def _git_revision():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    path = Path(path)
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding="utf-8"))["runs"]
+
+
+def append_history(path, results, label=None):
+    """把一次运行追加到历史文件，返回这次运行的记录"""
+    run = {
+        "time": datetime.datetime.now().isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "label": label,
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "results": [r._asdict() for r in results],
+    }
+    runs = load_history(path) + [run]
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"runs": runs}, ensure_ascii=False, indent=2), encoding="utf-8")
+    return run
+
+
+def compare_runs(old, new, threshold=0.1, min_seconds=0.05, metrics=COMPARED_METRICS):
+    """返回 new 相对 old 变慢（或变大）超过 threshold 的指标
+
+    old 中小于 min_seconds 的耗时只是噪声，不参与比较；出错的结果也跳过。
+    """
+    baseline = {(r["scene"], r["quality"]): r for r in old["results"] if not r.get("error")}
+    regressions = []
+    for r in new["results"]:
+        base = baseline.get((r["scene"], r["quality"]))
+        if base is None or r.get("error"):
+            continue
+        for metric in metrics:
+            before, after = base[metric], r[metric]
+            if metric != "peak_rss_mb" and before < min_seconds:
+                continue
+            if after > before * (1 + threshold):
+                regressions.append(Regression(r["scene"], r["quality"], metric, before, after))
+    return regressions
+
+
+def format_results(results):
+    width = max([len(r.scene) for r in results] + [5])
+    lines = [
+        f"{'scene':<{width}}  {'quality':<18}  {'wall':>7}  {'numeric':>7}  {'mobjects':>8}"
+        f"  {'render':>7}  {'fps':>6}  {'rss MB':>7}"
+    ]
+    for r in results:
+        if r.error:
+            lines.append(f"{r.scene:<{width}}  {r.quality:<18}  FAILED: {r.error}")
+            continue
+        lines.append(
+            f"{r.scene:<{width}}  {r.quality:<18}  {r.wall:>7.2f}  {r.numeric:>7.2f}  {r.mobjects:>8.2f}"
+            f"  {r.render:>7.2f}  {r.fps:>6.1f}  {r.peak_rss_mb:>7.0f}"
+        )
+    return "\n".join(lines)
+
+
+def format_regressions(regressions, threshold):
+    if not regressions:
+        return f"no regressions above {threshold:.0%}"
+    lines = [f"{len(regressions)} regressions above {threshold:.0%}:"]
+    for r in regressions:
+        lines.append(f"  {r.scene} [{r.quality}] {r.metric}: {r.old:.3g} -> {r.new:.3g} ({r.ratio:.2f}x)")
+    return "\n".join(lines)
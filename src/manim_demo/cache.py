@@ -0,0 +1,284 @@
+"""场景数值预计算的磁盘缓存
+
+memoize(func, *args, **kwargs) 以 func 的内容（含它读取的全局变量）、参数和随机种子的哈希为键，
+把返回的数组（或由数组组成的 NamedTuple / tuple / dict）存到缓存目录，
+之后以内存映射方式只读加载。只改排版、渲染质量或相机参数时，
+轨迹积分、PDE 求解这类计算不会重复执行。
+
+每个条目是一个目录，每个数组一个 .npy 文件，外加描述返回类型的 meta.json；
+条目先写到临时目录再整体改名，多个渲染进程同时写入也不会读到半成品。
+总大小超过上限时按最近使用时间淘汰。
+"""
+import dis
+import enum
+import functools
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+import time
+import types
+from pathlib import Path, PurePath
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+
+def default_cache_dir():
+    """环境变量 MANIM_DEMO_CACHE，默认 ~/.cache/manim-demo/data"""
+    env = os.environ.get("MANIM_DEMO_CACHE")
+    return Path(env) if env else Path.home() / ".cache" / "manim-demo" / "data"
+
+
+def _global_names(code):
+    """code 及其内部定义的函数读取的全局变量名"""
+    names = {ins.argval for ins in dis.get_instructions(code) if ins.opname in ("LOAD_GLOBAL", "LOAD_NAME")}
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _global_names(const)
+    return names
+
+
+def function_key(func):
+    """函数的内容指纹：源码加上默认参数、闭包中的值和读取的全局变量，其中的函数递归处理
+
+    manim_demo 中模块级的函数还会带上整个模块的源码，
+    这样求解器内部用到的辅助函数改动后缓存也会失效。
+    绑定方法会带上实例的属性。
+    """
+    return _function_key(func, set())
+
+
+def _function_key(func, seen):
+    if inspect.ismethod(func):
+        return _function_key(func.__func__, seen) + "\n" + _value_key(vars(func.__self__), seen)
+    func = inspect.unwrap(func)
+    if id(func) in seen:
+        # 递归引用自身（或已经展开过）的函数只记名字
+        return f"function {func.__module__}.{func.__qualname__}"
+    seen.add(id(func))
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = func.__code__.co_code.hex()
+    parts = [func.__qualname__, source, _value_key((func.__defaults__, func.__kwdefaults__), seen)]
+    module = inspect.getmodule(func)
+    if "<locals>" not in func.__qualname__ and module and module.__name__.startswith("manim_demo."):
+        parts.append(inspect.getsource(module))
+    for cell in func.__closure__ or ():
+        try:
+            parts.append(_value_key(cell.cell_contents, seen))
+        except ValueError:
+            continue
+    for name in sorted(_global_names(func.__code__)):
+        if name in func.__globals__:
+            parts.append(f"{name}={_value_key(func.__globals__[name], seen)}")
+    return "\n".join(parts)
+
+
+def _value_key(value, seen=None):
+    """按内容生成键；无法按内容区分的对象抛出 TypeError，而不是退回 repr
+
+    默认的 repr 带内存地址，每次运行都不同；大容器的 repr 会截断，不同内容可能得到同一个键。
+    """
+    seen = set() if seen is None else seen
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes, range, slice)):
+        return repr(value)
+    if isinstance(value, np.generic):
+        return f"{value.dtype}:{value.item()!r}"
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return f"ndarray{value.shape}:" + _value_key(value.ravel().tolist(), seen)
+        value = np.ascontiguousarray(value)
+        return f"ndarray{value.dtype}{value.shape}:" + hashlib.sha1(value.tobytes()).hexdigest()
+    if isinstance(value, (np.dtype, PurePath)):
+        return f"{type(value).__name__}({value})"
+    if isinstance(value, enum.Enum):
+        return f"{type(value).__qualname__}.{value.name}"
+    if isinstance(value, types.ModuleType):
+        return f"module {value.__name__}"
+    if isinstance(value, type):
+        return f"class {value.__module__}.{value.__qualname__}"
+    if inspect.isfunction(value) or inspect.ismethod(value):
+        return _function_key(value, seen)
+    if isinstance(value, functools.partial):
+        return "partial(" + ",".join(_value_key(v, seen) for v in (value.func, value.args, value.keywords)) + ")"
+    if isinstance(value, (types.BuiltinFunctionType, np.ufunc)):
+        return f"builtin {getattr(value, '__module__', None)}.{value.__name__}"
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{_value_key(k, seen)}:{_value_key(v, seen)}" for k, v in sorted(value.items(), key=lambda kv: repr(kv[0]))) + "}"
+    if isinstance(value, (list, tuple)):
+        return type(value).__name__ + "(" + ",".join(_value_key(v, seen) for v in value) + ")"
+    if isinstance(value, (set, frozenset)):
+        return type(value).__name__ + "(" + ",".join(sorted(_value_key(v, seen) for v in value)) + ")"
+    if hasattr(value, "__dict__"):
+        # 普通的值对象（如 ManimColor）按类名与属性
+        if id(value) in seen:
+            raise TypeError(f"{type(value).__qualname__} 对象引用了自身，无法按内容计算缓存键，请传入 key")
+        seen.add(id(value))
+        return f"{type(value).__module__}.{type(value).__qualname__}" + _value_key(vars(value), seen)
+    raise TypeError(f"无法按内容计算 {type(value).__qualname__} 的缓存键，请传入 key")
+
+
+def cache_key(*parts, **named):
+    """任意参数（函数、数组、嵌套容器、标量、普通的值对象）的内容哈希；不支持的类型抛出 TypeError"""
+    hasher = hashlib.sha1()
+    for part in parts:
+        hasher.update(_value_key(part).encode())
+        hasher.update(b"\0")
+    hasher.update(_value_key(named).encode())
+    return hasher.hexdigest()[:24]
+
+
+def _describe(result):
+    """把返回值拆成 ({名称: 数组}, meta)"""
+    if isinstance(result, np.ndarray):
+        return {"value": result}, {"type": "ndarray"}
+    if isinstance(result, tuple) and hasattr(result, "_fields"):
+        cls = type(result)
+        arrays = {f: np.asarray(v) for f, v in zip(result._fields, result)}
+        return arrays, {"type": "namedtuple", "class": f"{cls.__module__}:{cls.__qualname__}"}
+    if isinstance(result, tuple):
+        return {str(i): np.asarray(v) for i, v in enumerate(result)}, {"type": "tuple", "length": len(result)}
+    if isinstance(result, dict):
+        return {str(k): np.asarray(v) for k, v in result.items()}, {"type": "dict", "keys": list(result)}
+    raise TypeError(f"无法缓存 {type(result).__name__}，返回值应为数组或由数组组成的 tuple / dict")
+
+
+def _rebuild(arrays, meta):
+    kind = meta["type"]
+    if kind == "ndarray":
+        return arrays["value"]
+    if kind == "namedtuple":
+        module, qualname = meta["class"].split(":")
+        cls = importlib.import_module(module)
+        for attr in qualname.split("."):
+            cls = getattr(cls, attr)
+        return cls(**arrays)
+    if kind == "tuple":
+        return tuple(arrays[str(i)] for i in range(meta["length"]))
+    return {k: arrays[str(k)] for k in meta["keys"]}
+
+
+class ArrayCache:
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory or default_cache_dir())
+        self.max_bytes = max_bytes
+
+    def _entry(self, key):
+        return self.directory / key
+
+    def load(self, key, mmap=True):
+        """读取条目，不存在时返回 None；命中会刷新它的最近使用时间"""
+        entry = self._entry(key)
+        meta_file = entry / "meta.json"
+        try:
+            meta = json.loads(meta_file.read_text(encoding="utf-8"))
+            arrays = {
+                name: np.load(entry / f"{name}.npy", mmap_mode="r" if mmap else None)
+                for name in meta["arrays"]
+            }
+        except (FileNotFoundError, ValueError):
+            return None
+        os.utime(meta_file)
+        return _rebuild(arrays, meta)
+
+    def _publish(self, key, write):
+        # write(tmp_dir) 写出全部文件与 meta.json，然后整体改名为正式条目
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=".tmp-", dir=self.directory))
+        try:
+            write(tmp)
+            try:
+                os.replace(tmp, self._entry(key))
+            except OSError:
+                # 其他进程已经写好了同一个条目
+                shutil.rmtree(tmp, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self.evict()
+
+    def store(self, key, result):
+        arrays, meta = _describe(result)
+
+        def write(tmp):
+            for name, array in arrays.items():
+                np.save(tmp / f"{name}.npy", array)
+            (tmp / "meta.json").write_text(json.dumps({**meta, "arrays": list(arrays)}), encoding="utf-8")
+
+        self._publish(key, write)
+
+    def memmap(self, key, shape, fill, dtype=float):
+        """单个大数组的条目：不存在时创建内存映射文件，由 fill(out) 逐块写入"""
+        cached = self.load(key)
+        if cached is not None:
+            return cached
+
+        def write(tmp):
+            out = np.lib.format.open_memmap(tmp / "value.npy", mode="w+", dtype=dtype, shape=shape)
+            fill(out)
+            out.flush()
+            del out
+            (tmp / "meta.json").write_text(json.dumps({"type": "ndarray", "arrays": ["value"]}), encoding="utf-8")
+
+        self._publish(key, write)
+        return self.load(key)
+
+    def entries(self):
+        """[(最近使用时间, 字节数, 目录)]"""
+        if not self.directory.exists():
+            return []
+        result = []
+        for entry in self.directory.iterdir():
+            meta_file = entry / "meta.json"
+            if entry.name.startswith(".tmp-") or not meta_file.exists():
+                continue
+            size = sum(f.stat().st_size for f in entry.iterdir())
+            result.append((meta_file.stat().st_mtime, size, entry))
+        return result
+
+    def evict(self, max_bytes=None, stale_seconds=3600):
+        """按最近使用时间删除条目，直到总大小不超过 max_bytes；返回删除的条目数"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        now = time.time()
+        for tmp in self.directory.glob(".tmp-*"):
+            # 写入中途崩溃留下的临时目录
+            if now - tmp.stat().st_mtime > stale_seconds:
+                shutil.rmtree(tmp, ignore_errors=True)
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in entries:
+            if total <= max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def memoize(func, *args, seed=None, cache=None, key=None, **kwargs):
+    """func(*args, **kwargs) 的缓存版本
+
+    seed 给定时计入键，并以 rng=np.random.default_rng(seed) 传给 func，
+    用于内部会抽随机数的计算；全局的 random 与 numpy 随机数状态不受影响。
+    参数中有无法按内容计算键的对象时，用 key 显式指定（仍会与 func 一起哈希）。
+    返回值以只读内存映射的形式给出。
+    """
+    cache = cache or ArrayCache()
+    key = cache_key(func, args, kwargs, seed) if key is None else cache_key(func, key, seed)
+    result = cache.load(key)
+    if result is None:
+        if seed is not None:
+            kwargs["rng"] = np.random.default_rng(seed)
+        cache.store(key, func(*args, **kwargs))
+        result = cache.load(key)
+    return result
@@ -0,0 +1,448 @@
+"""命令行入口：manim-demo <子命令>"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from .render import (
+    RenderJob,
+    UsageError,
+    discover_scenes,
+    format_summary,
+    parse_quality,
+    run_jobs,
+)
+from .segments import render_segmented
+from . import bench, cache, profiling, texcache, variants
+
+
+def _scene_quality(value):
+    name, sep, quality = value.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"应为 场景名=质量，实际为 {value!r}")
+    try:
+        return name, parse_quality(quality)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _quality(value):
+    try:
+        return parse_quality(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _add_scene_arguments(parser):
+    parser.add_argument("scenes", nargs="*", help="只处理这些场景（默认全部）")
+    parser.add_argument(
+        "--path", type=Path, default=Path("animations"),
+        help="场景文件所在目录（默认 ./animations）",
+    )
+
+
+def cmd_render(args):
+    scenes = discover_scenes(args.path, args.scenes)
+    if args.list:
+        for spec in scenes:
+            print(f"{spec.name}\t{spec.file}")
+        return 0
+
+    overrides = dict(args.scene_quality or [])
+    if args.precompile_tex:
+        count = texcache.precompile(
+            scenes, args.tex_cache, max_workers=args.jobs, quality=args.quality, scene_quality=overrides,
+        )
+        print(f"precompiled {count} tex expressions into {args.tex_cache}", flush=True)
+
+    encoder = None
+    if args.stream:
+        from .streaming import EncoderSettings
+
+        encoder = EncoderSettings(args.preset, args.crf, args.ring_size)
+
+    jobs = [
+        RenderJob(
+            spec,
+            overrides.get(spec.name, args.quality),
+            args.output_dir / spec.name,
+            texcache.cache_config(args.tex_cache),
+            encoder,
+            args.incremental,
+        )
+        for spec in scenes
+    ]
+
+    def report(result):
+        status = "ok" if result.ok else "FAILED"
+        print(f"[{status}] {result.scene.name} ({result.seconds:.1f}s)", flush=True)
+        if result.plays:
+            from .incremental import format_report
+
+            print(format_report(result.plays), flush=True)
+
+    start = time.perf_counter()
+    results = run_jobs(jobs, max_workers=args.jobs, on_result=report)
+    print(format_summary(results, time.perf_counter() - start))
+    return 0 if all(r.ok for r in results) else 1
+
+
+def cmd_segments(args):
+    (spec,) = discover_scenes(args.path, [args.scene])
+    start = time.perf_counter()
+    output = render_segmented(
+        spec, args.quality, args.output_dir,
+        segments=args.segments, jobs=args.jobs, random_seed=args.seed, keep_parts=args.keep_parts,
+        config_overrides=texcache.cache_config(args.tex_cache),
+    )
+    print(f"{spec.name}: {output} ({time.perf_counter() - start:.1f}s)")
+    return 0
+
+
+def cmd_tex(args):
+    if args.clear:
+        texcache.clear_cache(args.tex_cache)
+    elif not args.stats:
+        scenes = discover_scenes(args.path, args.scenes)
+        start = time.perf_counter()
+        count = texcache.precompile(
+            scenes, args.tex_cache, max_workers=args.jobs, max_bytes=args.max_size * 1024**2,
+            quality=args.quality,
+        )
+        print(f"compiled {count} expressions ({time.perf_counter() - start:.1f}s)")
+    count, size = texcache.cache_stats(args.tex_cache) if args.tex_cache.exists() else (0, 0)
+    print(f"{args.tex_cache}: {count} svg, {size / 1024**2:.1f} MiB")
+    return 0
+
+
+def cmd_bench(args):
+    scenes = discover_scenes(args.path, args.scenes)
+    qualities = args.quality or ["low_quality", "high_quality"]
+    results = bench.run_benchmarks(
+        scenes, qualities, max_workers=args.jobs,
+        on_result=lambda r: print(f"[{'FAILED' if r.error else 'ok'}] {r.scene} {r.quality} ({r.wall:.1f}s)", flush=True),
+    )
+    print(bench.format_results(results))
+    run = bench.append_history(args.history, results, args.label)
+    history = bench.load_history(args.history)
+    if len(history) > 1:
+        print(bench.format_regressions(bench.compare_runs(history[-2], run, args.threshold), args.threshold))
+    return 0 if not any(r.error for r in results) else 1
+
+
+def cmd_compare(args):
+    history = bench.load_history(args.history)
+    try:
+        old, new = history[args.baseline], history[args.current]
+    except IndexError:
+        raise UsageError(f"{args.history} 中只有 {len(history)} 次运行")
+    print(f"{old['time']} ({old['revision']}) -> {new['time']} ({new['revision']})")
+    regressions = bench.compare_runs(old, new, args.threshold)
+    print(bench.format_regressions(regressions, args.threshold))
+    return 1 if regressions else 0
+
+
+def cmd_profile(args):
+    (spec,) = discover_scenes(args.path, [args.scene])
+    profiler, output = profiling.profile_scene(
+        spec, args.quality, args.output_dir / spec.name, memory=args.memory,
+        config_overrides=texcache.cache_config(args.tex_cache),
+    )
+    trace = profiler.write_trace(args.trace or args.output_dir / f"{spec.name}.trace.json")
+    frames = profiler.frame_times()
+    print(profiling.format_stats(profiler.stats(), args.top))
+    if frames:
+        print(f"{len(frames)} frames, update_to_time mean {1e3 * sum(frames) / len(frames):.2f} ms, max {1e3 * max(frames):.2f} ms")
+    print(f"trace: {trace}")
+    print(f"movie: {output}")
+    return 0
+
+
+def cmd_check(args):
+    # dryrun 在导入时就需要 manim，只在用到时导入
+    from . import dryrun
+
+    scenes = discover_scenes(args.path, args.scenes)
+    reports = dryrun.run_dry(
+        scenes, args.quality, check_finite=not args.no_finite_check, max_workers=args.jobs,
+        on_result=lambda r: print(f"[{'FAILED' if r.error else 'ok'}] {r.scene}", flush=True),
+    )
+    print(dryrun.format_reports(reports))
+    failed = any(r.error for r in reports) or (args.strict and any(r.anomalies for r in reports))
+    return 1 if failed else 0
+
+
+def cmd_cache(args):
+    data = cache.ArrayCache(args.dir)
+    if args.clear:
+        data.clear()
+    elif args.max_size is not None:
+        print(f"evicted {data.evict(args.max_size * 1024**2)} entries")
+    entries = data.entries()
+    print(f"{data.directory}: {len(entries)} entries, {sum(size for _, size, _ in entries) / 1024**2:.1f} MiB")
+    return 0
+
+
+def cmd_sweep(args):
+    (spec,) = discover_scenes(args.path, [args.scene])
+    grid = variants.parse_grid(args.param)
+    jobs = variants.expand_grid(spec, grid)
+    if args.list:
+        for variant in jobs:
+            print(variant.name)
+        return 0
+
+    def report(result):
+        status = "ok" if result.ok else "FAILED"
+        print(f"[{status}] {result.scene.name} ({result.seconds:.1f}s)", flush=True)
+
+    start = time.perf_counter()
+    results = variants.render_variants(
+        jobs, args.quality, args.output_dir, max_workers=args.jobs,
+        config_overrides=texcache.cache_config(args.tex_cache), on_result=report,
+    )
+    print(format_summary(results, time.perf_counter() - start))
+    return 0 if all(r.ok for r in results) else 1
+
+
+def _time_range(value):
+    try:
+        start, end, count = value.split(":")
+        return float(start), float(end), int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"应为 起点:终点:帧数，实际为 {value!r}")
+
+
+def cmd_frames(args):
+    # frames 在导入时就需要 manim，只在用到时导入
+    from . import frames
+
+    (spec,) = discover_scenes(args.path, [args.scene])
+    times = list(args.time or [])
+    for start, end, count in args.range or []:
+        times.extend(frames.frame_times(start, end, count))
+    if not times:
+        raise UsageError("至少需要一个 -t 或 --range")
+    overrides = texcache.cache_config(args.tex_cache)
+    start = time.perf_counter()
+    if args.jobs and args.jobs > 1:
+        result = frames.render_frames_parallel(
+            spec, times, args.quality, args.output_dir, args.seed, overrides, jobs=args.jobs,
+        )
+    else:
+        result = frames.render_frames(spec, times, args.quality, args.output_dir, args.seed, overrides)
+    for frame in result:
+        print(f"{frame.time:8.3f}s\t{frame.path}")
+    if args.sheet:
+        print(f"sheet: {frames.contact_sheet(result, args.sheet, columns=args.columns)}")
+    print(f"{len(result)} frames ({time.perf_counter() - start:.1f}s)")
+    return 0
+
+
+def _add_history_arguments(parser):
+    parser.add_argument(
+        "--history", type=Path, default=Path("benchmarks/history.json"),
+        help="基准测试历史文件（默认 benchmarks/history.json）",
+    )
+    parser.add_argument("--threshold", type=float, default=0.1, help="判定为回归的变慢比例（默认 0.1）")
+
+
+def _add_tex_cache_argument(parser):
+    parser.add_argument(
+        "--tex-cache", type=Path, default=texcache.default_cache_dir(),
+        help="共享的 Tex 缓存目录（默认 $MANIM_DEMO_TEX_CACHE 或 ~/.cache/manim-demo/tex）",
+    )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="manim-demo")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    render = sub.add_parser("render", help="并行渲染 animations/ 下的场景")
+    _add_scene_arguments(render)
+    render.add_argument("-j", "--jobs", type=int, default=None, help="并行进程数（默认 CPU 核数）")
+    render.add_argument(
+        "-q", "--quality", type=_quality, default="low_quality",
+        help="默认渲染质量：l/m/h/p/k 或 *_quality（默认 l）",
+    )
+    render.add_argument(
+        "--scene-quality", type=_scene_quality, action="append", metavar="SCENE=Q",
+        help="单个场景的渲染质量，可重复",
+    )
+    render.add_argument(
+        "-o", "--output-dir", type=Path, default=Path("media/batch"),
+        help="输出根目录，每个场景使用其下独立的子目录（默认 media/batch）",
+    )
+    render.add_argument("--list", action="store_true", help="只列出找到的场景")
+    render.add_argument(
+        "--precompile-tex", action="store_true", help="渲染前把所有公式放在一个 LaTeX 文档里批量编译",
+    )
+    render.add_argument(
+        "--incremental", action="store_true",
+        help="按 play 的全部输入（含 updater 与随机数状态）计算缓存键，复用未变化的 partial movie，并报告每次 play 是否命中",
+    )
+    _add_tex_cache_argument(render)
+    stream = render.add_argument_group("流式输出")
+    stream.add_argument(
+        "--stream", action="store_true",
+        help="所有帧推给同一个编码器直接写出整段视频，不生成 partial movie 文件（不使用 manim 的按 play 缓存）",
+    )
+    stream.add_argument("--preset", default="medium", help="libx264 preset（默认 medium）")
+    stream.add_argument("--crf", type=int, default=23, help="恒定质量因子（默认 23）")
+    stream.add_argument(
+        "--ring-size", type=int, default=4,
+        help="帧缓冲个数，编码跟不上时渲染等待空闲缓冲（默认 4）",
+    )
+    render.set_defaults(func=cmd_render)
+
+    segments = sub.add_parser("segments", help="把单个场景按 play 切段并行渲染后拼接")
+    segments.add_argument("scene", help="场景名")
+    segments.add_argument(
+        "--path", type=Path, default=Path("animations"),
+        help="场景文件所在目录（默认 ./animations）",
+    )
+    segments.add_argument("-j", "--jobs", type=int, default=None, help="并行进程数（默认 CPU 核数）")
+    segments.add_argument("-n", "--segments", type=int, default=None, help="分段数（默认等于进程数）")
+    segments.add_argument("-q", "--quality", type=_quality, default="low_quality", help="渲染质量（默认 l）")
+    segments.add_argument("--seed", type=int, default=0, help="所有分段共用的随机种子（默认 0）")
+    segments.add_argument(
+        "-o", "--output-dir", type=Path, default=Path("media/segments"),
+        help="最终视频的输出目录（默认 media/segments）",
+    )
+    segments.add_argument("--keep-parts", action="store_true", help="保留各分段的中间视频")
+    _add_tex_cache_argument(segments)
+    segments.set_defaults(func=cmd_segments)
+
+    tex = sub.add_parser("tex", help="批量预编译场景中的公式到共享缓存")
+    _add_scene_arguments(tex)
+    _add_tex_cache_argument(tex)
+    tex.add_argument("-j", "--jobs", type=int, default=None, help="收集公式的并行进程数")
+    tex.add_argument(
+        "-q", "--quality", type=_quality, default="low_quality",
+        help="收集公式时逐帧试运行的质量，应与渲染时一致（默认 l）",
+    )
+    tex.add_argument(
+        "--max-size", type=int, default=texcache.DEFAULT_MAX_BYTES // 1024**2,
+        help="缓存大小上限（MiB），超出时按最近使用时间淘汰",
+    )
+    tex.add_argument("--stats", action="store_true", help="只显示缓存大小")
+    tex.add_argument("--clear", action="store_true", help="清空缓存")
+    tex.set_defaults(func=cmd_tex)
+
+    bench_parser = sub.add_parser("bench", help="基准测试场景并记录到历史文件")
+    _add_scene_arguments(bench_parser)
+    _add_history_arguments(bench_parser)
+    bench_parser.add_argument(
+        "-q", "--quality", type=_quality, action="append",
+        help="测试的渲染质量，可重复（默认 l 与 h）",
+    )
+    bench_parser.add_argument("-j", "--jobs", type=int, default=1, help="并行进程数（默认 1，避免互相干扰计时）")
+    bench_parser.add_argument("--label", help="这次运行的备注")
+    bench_parser.set_defaults(func=cmd_bench)
+
+    compare = sub.add_parser("compare", help="对比历史文件中的两次基准测试")
+    _add_history_arguments(compare)
+    compare.add_argument("--baseline", type=int, default=-2, help="基准运行的下标（默认倒数第二次）")
+    compare.add_argument("--current", type=int, default=-1, help="对比运行的下标（默认最近一次）")
+    compare.set_defaults(func=cmd_compare)
+
+    profile = sub.add_parser("profile", help="统计单个场景中每个 updater 的耗时并导出 Chrome trace")
+    profile.add_argument("scene", help="场景名")
+    profile.add_argument(
+        "--path", type=Path, default=Path("animations"),
+        help="场景文件所在目录（默认 ./animations）",
+    )
+    profile.add_argument("-q", "--quality", type=_quality, default="low_quality", help="渲染质量（默认 l）")
+    profile.add_argument("--top", type=int, default=20, help="摘要中显示的 updater 个数（默认 20）")
+    profile.add_argument("--memory", action="store_true", help="用 tracemalloc 记录每次调用的净增内存（较慢）")
+    profile.add_argument("--trace", type=Path, help="trace 文件路径（默认 <输出目录>/<场景>.trace.json）")
+    profile.add_argument(
+        "-o", "--output-dir", type=Path, default=Path("media/profile"),
+        help="输出目录（默认 media/profile）",
+    )
+    _add_tex_cache_argument(profile)
+    profile.set_defaults(func=cmd_profile)
+
+    check = sub.add_parser("check", help="试运行场景：逐帧执行 updater 但不画帧、不写视频")
+    _add_scene_arguments(check)
+    check.add_argument("-j", "--jobs", type=int, default=None, help="并行进程数（默认 CPU 核数）")
+    check.add_argument(
+        "-q", "--quality", type=_quality, default="low_quality",
+        help="决定帧率与 updater 调用次数（默认 l）",
+    )
+    check.add_argument("--no-finite-check", action="store_true", help="不检查点坐标中的 NaN / inf")
+    check.add_argument("--strict", action="store_true", help="发现 NaN / inf 时也返回非零")
+    check.set_defaults(func=cmd_check)
+
+    sweep = sub.add_parser("sweep", help="在参数网格上并行渲染同一场景的全部变体")
+    sweep.add_argument("scene", help="场景名")
+    sweep.add_argument(
+        "--path", type=Path, default=Path("animations"),
+        help="场景文件所在目录（默认 ./animations）",
+    )
+    sweep.add_argument(
+        "-p", "--param", action="append", required=True, metavar="NAME=V1,V2,...",
+        help="参数及其取值（Python 字面量，逗号分隔），可重复；所有参数取笛卡尔积",
+    )
+    sweep.add_argument("-j", "--jobs", type=int, default=None, help="并行进程数（默认 CPU 核数）")
+    sweep.add_argument("-q", "--quality", type=_quality, default="low_quality", help="渲染质量（默认 l）")
+    sweep.add_argument(
+        "-o", "--output-dir", type=Path, default=Path("media/sweep"),
+        help="输出根目录，每个变体使用其下独立的子目录（默认 media/sweep）",
+    )
+    sweep.add_argument("--list", action="store_true", help="只列出将要渲染的变体")
+    _add_tex_cache_argument(sweep)
+    sweep.set_defaults(func=cmd_sweep)
+
+    frames_parser = sub.add_parser("frames", help="只渲染场景在指定时刻的画面（缩略图、预览条）")
+    frames_parser.add_argument("scene", help="场景名")
+    frames_parser.add_argument(
+        "--path", type=Path, default=Path("animations"),
+        help="场景文件所在目录（默认 ./animations）",
+    )
+    frames_parser.add_argument("-t", "--time", type=float, action="append", help="场景时刻（秒），可重复")
+    frames_parser.add_argument(
+        "--range", type=_time_range, action="append", metavar="START:END:COUNT",
+        help="在 [START, END] 内均匀取 COUNT 个时刻，可重复",
+    )
+    frames_parser.add_argument("-q", "--quality", type=_quality, default="low_quality", help="渲染质量（默认 l）")
+    frames_parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="并行进程数，各进程负责一段连续的时刻（默认 1）",
+    )
+    frames_parser.add_argument("--seed", type=int, default=0, help="随机种子（默认 0）")
+    frames_parser.add_argument(
+        "-o", "--output-dir", type=Path, default=Path("media/frames"),
+        help="输出目录（默认 media/frames）",
+    )
+    frames_parser.add_argument("--sheet", type=Path, help="把所有帧拼成一张预览图保存到该路径")
+    frames_parser.add_argument("--columns", type=int, help="预览图的列数（默认排成一行）")
+    _add_tex_cache_argument(frames_parser)
+    frames_parser.set_defaults(func=cmd_frames)
+
+    cache_parser = sub.add_parser("cache", help="查看或清理数值结果缓存")
+    cache_parser.add_argument(
+        "--dir", type=Path, default=cache.default_cache_dir(),
+        help="缓存目录（默认 $MANIM_DEMO_CACHE 或 ~/.cache/manim-demo/data）",
+    )
+    cache_parser.add_argument("--max-size", type=int, help="按最近使用时间淘汰到不超过该大小（MiB）")
+    cache_parser.add_argument("--clear", action="store_true", help="清空缓存")
+    cache_parser.set_defaults(func=cmd_cache)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    # 参数组合的检查放在任何耗时的准备工作（如 --precompile-tex）之前
+    if args.command == "render" and args.stream and args.incremental:
+        parser.error("--stream 不使用按 play 缓存，不能与 --incremental 同时使用")
+    # 只有参数错误报告为用法错误；渲染中的其他异常（包括 ValueError）保留 traceback
+    try:
+        return args.func(args)
+    except UsageError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""坐标系工厂：按配置缓存构建好的 Axes / ThreeDAxes / NumberLine，每次交出一份副本
+
+    axes = coordinate_system(Axes, x_range=[-3, 3, 1], y_range=[-3, 3, 1]).shift(DOWN)
+
+坐标轴本身、刻度和 include_numbers 生成的数字标签（每个数字都是一个 MathTex）
+在每个场景启动时都要重新构建一遍。coordinate_system 以类名和全部构造参数为键，
+第一次构建后把原型留在进程内，之后只 copy()。同一进程中的多个场景、参数扫描的各个变体
+共用原型；刻度数字的 svg 由共享的 Tex 缓存跨进程复用。
+
+键中还包含画面尺寸（决定默认的轴长）和 Tex 模板。
+构造参数应为普通的值（数字、列表、颜色、字典）；无法按内容计算键时直接构建、不缓存。
+取到的副本可以随意移动、着色。
+"""
+from manim import config
+
+from .cache import cache_key
+
+# 进程内的原型，键为 cache_key
+_PROTOTYPES = {}
+
+
+def _key(cls, args, kwargs):
+    return cache_key(
+        f"{cls.__module__}.{cls.__qualname__}",
+        (config.frame_width, config.frame_height),
+        config.tex_template.body,
+        args,
+        kwargs,
+    )
+
+
+def coordinate_system(cls, *args, **kwargs):
+    """cls(*args, **kwargs) 的副本；相同配置在进程内只构建一次"""
+    try:
+        key = _key(cls, args, kwargs)
+    except TypeError:
+        return cls(*args, **kwargs)
+    prototype = _PROTOTYPES.get(key)
+    if prototype is None:
+        prototype = _PROTOTYPES[key] = cls(*args, **kwargs)
+    return prototype.copy()
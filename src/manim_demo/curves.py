@@ -0,0 +1,85 @@
+"""由数值采样点构造曲线
+
+积分轨迹、函数采样这类折线的点通常比屏幕能分辨的多得多，每个点在
+set_points_smoothly 之后都是一段贝塞尔曲线，Create 的插值和 Cairo 描边都按段数计费。
+simplify_polylines 先用 Ramer–Douglas–Peucker 算法去掉离折线不到 tolerance 像素的点，
+再交给 smooth_curve 平滑连接。算法按层推进：每一轮对所有尚未达标的区间同时
+找出离弦最远的点，整批用数组完成，多条折线也拼在一起处理。
+"""
+import numpy as np
+from manim import VMobject, config
+
+
+def pixel_size():
+    """一个像素对应的场景长度"""
+    return config.frame_width / config.pixel_width
+
+
+def _segment_distance(points, a, b):
+    ab = b - a
+    length2 = np.einsum("ij,ij->i", ab, ab)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = np.where(length2 > 0, np.einsum("ij,ij->i", points - a, ab) / length2, 0.0)
+    t = np.clip(t, 0, 1)
+    return np.linalg.norm(points - (a + t[:, None] * ab), axis=1)
+
+
+def simplify_mask(points, tolerance, starts=()):
+    """RDP 保留的点的布尔掩码；tolerance 与 points 单位相同
+
+    starts 为拼接在一起的各条折线的起点下标，每条折线的首尾都会保留。
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    starts = np.asarray(starts, dtype=int)
+    keep[[0, n - 1]] = True
+    keep[starts] = True
+    keep[starts[starts > 0] - 1] = True
+    while True:
+        anchors = np.flatnonzero(keep)
+        if len(anchors) < 2:
+            return keep
+        # 每个点所在的区间 [anchors[k], anchors[k + 1]]
+        segment = np.minimum(np.cumsum(keep) - 1, len(anchors) - 2)
+        distance = _segment_distance(points, points[anchors[segment]], points[anchors[segment + 1]])
+        distance[keep] = 0
+        farthest = np.maximum.reduceat(distance, anchors[:-1])
+        split = farthest > tolerance
+        if not split.any():
+            return keep
+        candidates = np.flatnonzero(split[segment] & (distance == farthest[segment]))
+        # 每个区间只取第一个最远点
+        first = np.ones(len(candidates), dtype=bool)
+        first[1:] = segment[candidates[1:]] != segment[candidates[:-1]]
+        keep[candidates[first]] = True
+
+
+def simplify_polylines(polylines, tolerance=0.5):
+    """批量化简一组 (n_i, 3) 的场景坐标折线，tolerance 以像素计；为 None 或 0 时原样返回"""
+    polylines = [np.asarray(p, dtype=float) for p in polylines]
+    if not tolerance or not polylines:
+        return polylines
+    lengths = np.array([len(p) for p in polylines])
+    starts = np.cumsum(lengths) - lengths
+    points = np.concatenate(polylines)
+    keep = simplify_mask(points, tolerance * pixel_size(), starts[lengths > 0])
+    counts = np.add.reduceat(keep.astype(int), starts[lengths > 0]) if points.size else []
+    kept = iter(np.split(points[keep], np.cumsum(counts)[:-1]))
+    return [next(kept) if length else p for p, length in zip(polylines, lengths)]
+
+
+def smooth_curve(points, tolerance=0.5, **kwargs):
+    """化简后平滑连接场景坐标中的采样点 (n, 3)"""
+    (points,) = simplify_polylines([points], tolerance)
+    curve = VMobject(**kwargs)
+    curve.set_points_smoothly(points)
+    return curve
+
+
+def sampled_curve(axes, xs, ys, tolerance=0.5, **kwargs):
+    """把坐标系中的采样点 (xs, ys) 整批转换到场景坐标，化简后平滑连接成曲线"""
+    points = np.asarray(axes.c2p(np.column_stack([xs, ys]))).reshape(-1, 3)
+    return smooth_curve(points, tolerance, **kwargs)
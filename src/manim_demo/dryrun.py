@@ -0,0 +1,206 @@
+"""不光栅化、不编码的试运行
+
+DryRunRenderer 继承 CairoRenderer，保留每一帧的 update_to_time（updater、
+ValueTracker 动画、相机旋转都照常逐帧推进），但把画帧、取帧和写视频都换成空操作，
+只累计时间轴长度与帧数。每帧检查正在变化的 mobject 的点坐标，
+每次 play 结束时检查场景中的全部 mobject，记录出现 NaN / inf 的位置。
+"""
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+from manim.renderer.cairo_renderer import CairoRenderer
+
+from .render import camera_class, load_scene_class
+
+
+class Anomaly(NamedTuple):
+    play: int
+    time: float
+    mobject: str
+    count: int      # 非有限值的个数
+
+
+class DryRunReport(NamedTuple):
+    scene: str
+    duration: float         # 时间轴长度（秒）
+    plays: int
+    frames: int
+    mobjects: int           # 结束时场景中的顶层 mobject 数
+    family: int             # 结束时全部子物体数
+    max_family: int         # 各次 play 结束时子物体数的最大值
+    points: int             # 结束时全部控制点数
+    anomalies: list
+    stages: dict            # 各阶段耗时（秒）
+    error: str | None = None
+
+
+class DryRunRenderer(CairoRenderer):
+    def __init__(self, check_finite=True, **kwargs):
+        super().__init__(**kwargs)
+        self.check_finite = check_finite
+        self.frames = 0
+        self.max_family = 0
+        self.anomalies = []
+        self.check_time = 0.0
+        self._reported = set()
+
+    def update_frame(self, *args, **kwargs):
+        pass
+
+    def get_frame(self):
+        return None
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        self.static_image = None
+        return None
+
+    def add_frame(self, frame, num_frames=1):
+        if self.skip_animations:
+            return
+        self.time += num_frames / self.camera.frame_rate
+        self.frames += num_frames
+
+    def render(self, scene, time, moving_mobjects):
+        if self.check_finite:
+            self.check_points(moving_mobjects)
+        self.add_frame(None)
+
+    def play(self, scene, *args, **kwargs):
+        super().play(scene, *args, **kwargs)
+        family = [m for mob in scene.mobjects for m in mob.get_family()]
+        self.max_family = max(self.max_family, len(family))
+        if self.check_finite:
+            self.check_points(scene.mobjects)
+
+    def check_points(self, mobjects):
+        start = time.perf_counter()
+        for mob in mobjects:
+            for sub in mob.get_family():
+                points = sub.points
+                if points.size == 0:
+                    continue
+                bad = np.count_nonzero(~np.isfinite(points))
+                if bad and (self.num_plays, id(sub)) not in self._reported:
+                    # 同一次 play 中同一个物体只报告一次
+                    self._reported.add((self.num_plays, id(sub)))
+                    self.anomalies.append(Anomaly(self.num_plays, self.time, _describe(sub, mob), int(bad)))
+        self.check_time += time.perf_counter() - start
+
+
+def _describe(sub, root):
+    name = type(sub).__name__
+    return name if sub is root else f"{type(root).__name__} > {name}"
+
+
+def dry_run_scene(spec, quality="low_quality", check_finite=True, random_seed=0):
+    """试运行一个场景并返回 DryRunReport；quality 决定帧率，也就决定了 updater 的调用次数"""
+    from manim import config, tempconfig
+
+    scene_cls = load_scene_class(spec)
+    stages = {"construct": 0.0, "play": 0.0, "update": 0.0}
+
+    class DryRun(scene_cls):
+        def construct(self):
+            start = time.perf_counter()
+            try:
+                super().construct()
+            finally:
+                stages["construct"] = time.perf_counter() - start
+
+        def play(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                super().play(*args, **kwargs)
+            finally:
+                stages["play"] += time.perf_counter() - start
+
+        def update_to_time(self, t):
+            start = time.perf_counter()
+            try:
+                super().update_to_time(t)
+            finally:
+                stages["update"] += time.perf_counter() - start
+
+    DryRun.__name__ = scene_cls.__name__
+    with tempfile.TemporaryDirectory() as tmp, tempconfig({
+        "input_file": str(spec.file),
+        "media_dir": tmp,
+        "write_to_movie": False,
+        "save_last_frame": False,
+        "disable_caching": True,
+    }):
+        config.quality = quality
+        renderer = DryRunRenderer(check_finite=check_finite, camera_class=camera_class(scene_cls))
+        scene = DryRun(renderer=renderer, random_seed=random_seed)
+        start = time.perf_counter()
+        scene.render()
+        total = time.perf_counter() - start
+
+    family = [m for mob in scene.mobjects for m in mob.get_family()]
+    stages = {
+        "setup": stages["construct"] - stages["play"],
+        "update": stages["update"],
+        "check": renderer.check_time,
+        "play other": stages["play"] - stages["update"] - renderer.check_time,
+        "total": total,
+    }
+    return DryRunReport(
+        scene=spec.name,
+        duration=renderer.time,
+        plays=renderer.num_plays,
+        frames=renderer.frames,
+        mobjects=len(scene.mobjects),
+        family=len(family),
+        max_family=renderer.max_family,
+        points=sum(len(m.points) for m in family),
+        anomalies=renderer.anomalies,
+        stages=stages,
+    )
+
+
+def _run_dry(args):
+    spec, quality, check_finite = args
+    try:
+        return dry_run_scene(spec, quality, check_finite)
+    except Exception as e:
+        return DryRunReport(spec.name, 0.0, 0, 0, 0, 0, 0, 0, [], {}, f"{type(e).__name__}: {e}")
+
+
+def run_dry(specs, quality="low_quality", check_finite=True, max_workers=None, on_result=None):
+    """在 spawn 进程池中试运行多个场景，返回与 specs 顺序一致的报告"""
+    context = multiprocessing.get_context("spawn")
+    reports = []
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+        for report in pool.map(_run_dry, [(s, quality, check_finite) for s in specs]):
+            reports.append(report)
+            if on_result is not None:
+                on_result(report)
+    return reports
+
+
+def format_reports(reports, max_anomalies=5):
+    width = max([len(r.scene) for r in reports] + [5])
+    lines = [
+        f"{'scene':<{width}}  {'timeline':>8}  {'plays':>5}  {'frames':>6}  {'mobjects':>8}"
+        f"  {'family':>7}  {'points':>8}  {'setup':>6}  {'update':>6}  {'total':>6}  status"
+    ]
+    details = []
+    for r in reports:
+        if r.error:
+            lines.append(f"{r.scene:<{width}}  FAILED: {r.error}")
+            continue
+        status = f"{len(r.anomalies)} anomalies" if r.anomalies else "ok"
+        s = r.stages
+        lines.append(
+            f"{r.scene:<{width}}  {r.duration:>7.1f}s  {r.plays:>5}  {r.frames:>6}  {r.mobjects:>8}"
+            f"  {r.family:>7}  {r.points:>8}  {s['setup']:>6.2f}  {s['update']:>6.2f}  {s['total']:>6.2f}  {status}"
+        )
+        for a in r.anomalies[:max_anomalies]:
+            details.append(f"  {r.scene}: play {a.play} t={a.time:.2f}s {a.mobject} has {a.count} non-finite values")
+        if len(r.anomalies) > max_anomalies:
+            details.append(f"  {r.scene}: ... {len(r.anomalies) - max_anomalies} more")
+    return "\n".join(lines + details)
@@ -0,0 +1,198 @@
+"""数组化的向量场求值
+
+场函数一次接收全部采样点 (N, 3)，一次返回全部向量，
+长度裁剪、颜色映射、length_func 缩放也都按数组完成。
+旧的逐点回调（接收单个点、返回单个向量）用 vectorized=False 指定，
+或用 vectorized=None 自动探测。
+InstancedArrowField / TimeVaryingArrowField 的全部箭头是一个 glyphs.ArrowGlyphs，
+不再为每个箭头创建 Vector。
+"""
+import itertools as it
+
+import numpy as np
+from manim import config
+from manim.mobject.vector_field import DEFAULT_SCALAR_FIELD_COLORS
+
+from .glyphs import ArrowGlyphs
+
+
+def _as_vectors(out, n):
+    out = np.asarray(out, dtype=float)
+    if out.ndim != 2 or len(out) != n:
+        raise ValueError(f"向量场应返回 ({n}, 2) 或 ({n}, 3) 的数组，实际得到 {out.shape}")
+    if out.shape[1] < 3:
+        out = np.pad(out, ((0, 0), (0, 3 - out.shape[1])))
+    return out
+
+
+def evaluate_field(func, points, vectorized=None):
+    """对全部采样点求值，返回 (N, 3) 向量数组
+
+    vectorized=True 时整批调用，False 时逐点调用，库内的调用方都显式指定。
+    None 是为旧的逐点回调保留的自动探测：先用一个点组成的 (1, 3) 数组试调用，
+    返回 (1, k) 才认为支持整批，再对全部点调用；否则退回逐点调用。
+    只探测一个点，是为了不把逐点回调按坐标取下标（p[0]、p[1]）误当成按行取下标——
+    N 恰好为 3 时整批调用也会得到形状正确、内容错误的 (3, 3)。
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    if vectorized is None:
+        try:
+            probe = np.asarray(func(points[:1]), dtype=float)
+            vectorized = probe.ndim == 2 and probe.shape[0] == 1
+        except (TypeError, ValueError, IndexError):
+            vectorized = False
+    if vectorized:
+        return _as_vectors(func(points), len(points))
+    return _as_vectors([np.asarray(func(p), dtype=float) for p in points], len(points))
+
+
+def apply_elementwise(func, values, vectorized=None):
+    """对一维数组应用标量函数
+
+    vectorized=True 时整批调用，函数内部的错误直接抛出；False 时逐元素调用；
+    None 时先尝试整批调用，失败或形状不符再逐元素调用。
+    """
+    values = np.asarray(values, dtype=float)
+    if vectorized is not False:
+        try:
+            out = np.asarray(func(values), dtype=float)
+            if out.shape == values.shape:
+                return out
+            if vectorized:
+                raise ValueError(f"{func!r} 应返回形状为 {values.shape} 的数组，实际得到 {out.shape}")
+        except (TypeError, ValueError):
+            if vectorized:
+                raise
+    return np.array([func(v) for v in values], dtype=float).reshape(values.shape)
+
+
+def clip_norm(vectors, max_norm):
+    """把超过 max_norm 的向量缩放到 max_norm，方向不变"""
+    vectors = np.asarray(vectors, dtype=float)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    scale = np.minimum(1, max_norm / np.maximum(norms, 1e-12))
+    return vectors * scale
+
+
+def grid_points(x_range=None, y_range=None, z_range=None):
+    """与 ArrowVectorField 相同的采样网格 (N, 3)：范围缺省为整个画面，步长缺省为 0.5，含终点"""
+    x_range = list(x_range or [np.floor(-config["frame_width"] / 2), np.ceil(config["frame_width"] / 2)])
+    y_range = list(y_range or [np.floor(-config["frame_height"] / 2), np.ceil(config["frame_height"] / 2)])
+    ranges = [x_range, y_range, list(z_range) if z_range else [0, 0]]
+    for r in ranges:
+        if len(r) == 2:
+            r.append(0.5)
+        r[1] += r[2]
+    return np.array(list(it.product(*(np.arange(*r) for r in ranges))), dtype=float)
+
+
+def coords_field(axes, func):
+    """把坐标系中的场 func(x, y) -> (dx, dy) 包装成场景坐标下的批量场函数
+
+    坐标转换只做两次（整批 point_to_coords 与整批 c2p），
+    代替每个采样点各自 point_to_coords / c2p 的往返。
+    """
+    origin = np.asarray(axes.c2p(0, 0))
+
+    def field(points):
+        coords = np.asarray(axes.point_to_coords(points)).reshape(len(points), -1)
+        d = np.column_stack(func(coords[:, 0], coords[:, 1]))
+        return np.asarray(axes.c2p(d)).reshape(-1, 3) - origin
+
+    return field
+
+
+class InstancedArrowField(ArrowGlyphs):
+    """在固定采样点上整批求值场函数的箭头场，全部箭头是一个 ArrowGlyphs
+
+    func 接收 (N, 3) 的采样点，返回 (N, 2) 或 (N, 3) 向量；
+    vectorized=False 时 func 与 length_func 改为逐点 / 逐个调用。
+    显示长度由 length_func（对长度数组整批调用）或 max_length 截断决定，
+    长度不超过 min_length 的箭头隐藏（画成零长度）；颜色按向量原长在 color_range 中分层。
+    anchor、shaft_width、tip_length、levels 等其余参数见 ArrowGlyphs。
+    """
+
+    def __init__(
+        self,
+        func,
+        points,
+        length_func=None,
+        max_length=None,
+        min_length=0.0,
+        colors=DEFAULT_SCALAR_FIELD_COLORS,
+        color_range=(0, 2),
+        vectorized=True,
+        **kwargs,
+    ):
+        self.func = func
+        self.sample_points = np.asarray(points, dtype=float).reshape(-1, 3)
+        self.length_func = length_func
+        self.max_length = max_length
+        self.min_length = min_length
+        self.vectorized = vectorized
+        vectors = evaluate_field(func, self.sample_points, vectorized)
+        norms = np.linalg.norm(vectors, axis=1)
+        super().__init__(
+            self.sample_points, self.display_vectors(vectors), norms,
+            colors=colors, value_range=color_range, **kwargs,
+        )
+
+    def display_vectors(self, vectors):
+        """按 length_func / max_length / min_length 得到显示用的向量"""
+        norms = np.linalg.norm(vectors, axis=1)
+        nonzero = norms > 0
+        scale = np.ones_like(norms)
+        if self.length_func is not None:
+            scale[nonzero] = apply_elementwise(self.length_func, norms[nonzero], self.vectorized) / norms[nonzero]
+        elif self.max_length is not None:
+            scale[nonzero] = np.minimum(norms[nonzero], self.max_length) / norms[nonzero]
+        scale[norms <= self.min_length] = 0
+        return vectors * scale[:, None]
+
+    def update_field(self):
+        vectors = evaluate_field(self.func, self.sample_points, self.vectorized)
+        return self.set_vectors(vectors)
+
+    def set_vectors(self, vectors):
+        """按 (N, 3) 向量数组就地更新全部箭头，锚点保持当前位置"""
+        vectors = np.asarray(vectors, dtype=float)
+        return self.set_arrows(self.display_vectors(vectors), np.linalg.norm(vectors, axis=1))
+
+
+class TimeVaryingArrowField(InstancedArrowField):
+    """随时间变化的箭头场，以采样点为中心、显示长度不超过 max_length
+
+    每帧调用 update_field() 时整批求值场函数，重新写入各颜色层的多边形。
+    参数与原先逐个箭头的实现相同，stroke_width 按 Cairo 线宽（0.01 场景单位）换算为箭杆宽度。
+    """
+
+    def __init__(
+        self,
+        func,
+        points,
+        max_length=0.6,
+        min_length=0.0,
+        colors=DEFAULT_SCALAR_FIELD_COLORS,
+        color_range=(0, 2),
+        stroke_width=1.5,
+        tip_length=0.35,
+        max_tip_length_to_length_ratio=0.25,
+        opacity=1.0,
+        vectorized=True,
+        **kwargs,
+    ):
+        super().__init__(
+            func,
+            points,
+            max_length=max_length,
+            min_length=min_length,
+            colors=colors,
+            color_range=color_range,
+            vectorized=vectorized,
+            anchor="center",
+            shaft_width=0.01 * stroke_width,
+            tip_length=tip_length,
+            max_tip_length_to_length_ratio=max_tip_length_to_length_ratio,
+            opacity=opacity,
+            **kwargs,
+        )
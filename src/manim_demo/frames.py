@@ -0,0 +1,179 @@
+"""随机访问：只渲染场景中指定时刻的画面
+
+FrameRenderer 以跳过模式执行整个 construct：不包含请求时刻的 play 只推进到结束状态
+（每个 play 只做一次 update_to_time，不光栅化）；包含请求时刻的 play
+只在这些时刻求值并光栅化，然后直接结束。最后一个请求之后的 play 不再执行。
+
+由 ValueTracker 或 manim_demo.motion 这类时间的纯函数驱动的场景，某一时刻的画面
+与从头逐帧渲染得到的完全相同；在 updater 里按 dt 累加、且不是线性依赖 dt 的状态
+（比如按 dt 做一步显式积分）会因为步长变大而有差别。
+用于生成缩略图、封面帧、预览条，以及把各帧分给多个进程渲染。
+"""
+import multiprocessing
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.utils.exceptions import EndSceneEarlyException
+from tqdm import tqdm
+
+from .render import camera_class, load_scene_class
+
+
+class Frame(NamedTuple):
+    time: float
+    path: Path
+
+
+class FrameRenderer(CairoRenderer):
+    """on_frame(场景时刻, PIL.Image) 在每个请求的时刻渲染完成时调用"""
+
+    def __init__(self, times, on_frame, **kwargs):
+        super().__init__(skip_animations=True, **kwargs)
+        self.requests = np.unique(np.asarray(times, dtype=float))
+        self.on_frame = on_frame
+        self.play_start = 0.0
+        self._next = 0              # 下一个尚未渲染的请求
+        self._pending = deque()     # 当前 play 中的 (局部时刻, 场景时刻)
+        self._active = False        # 当前 play 是否包含请求的时刻
+
+    def _take(self, end):
+        """取出 end 之前（不含）的请求，返回 [(局部时刻, 场景时刻)]"""
+        stop = np.searchsorted(self.requests, end, side="left")
+        taken = [(max(t - self.play_start, 0.0), t) for t in self.requests[self._next:stop]]
+        self._next = stop
+        return taken
+
+    def _capture(self, time):
+        self.on_frame(float(time), self.camera.get_image())
+
+    def play(self, scene, *args, **kwargs):
+        if self._next >= len(self.requests):
+            raise EndSceneEarlyException()
+        # 跳过模式下 CairoRenderer.play 一开始就把 time 推进到本次 play 的结尾
+        self.play_start = self.time
+        self._active = False
+        super().play(scene, *args, **kwargs)
+
+    def local_times(self, run_time):
+        """本次 play 里需要求值的局部时刻：请求的时刻加上结尾"""
+        self._pending = deque(self._take(self.play_start + run_time))
+        return [local for local, _ in self._pending] + [run_time]
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        # play 中第一个在 compile_animation_data 之后调用的钩子，此时已知本次 play 的时长
+        end = self.play_start + scene.duration
+        self._active = self._next < len(self.requests) and self.requests[self._next] < end
+        if not self._active:
+            self.static_image = None
+            return None
+        return super().save_static_frame_data(scene, static_mobjects)
+
+    def update_frame(self, scene, *args, **kwargs):
+        # 不包含请求时刻的 play 不光栅化（静止的 wait 也会调用 update_frame）
+        if self._active:
+            super().update_frame(scene, *args, **kwargs)
+
+    def render(self, scene, time, moving_mobjects):
+        while self._pending and self._pending[0][0] == time:
+            _, scene_time = self._pending.popleft()
+            self.update_frame(scene, moving_mobjects)
+            self._capture(scene_time)
+
+    def freeze_current_frame(self, duration):
+        # 静止的 wait：整段画面相同，调用前已经 update_frame
+        for _, scene_time in self._take(self.play_start + duration):
+            self._capture(scene_time)
+
+    def scene_finished(self, scene):
+        # 超出场景时长的请求取最后一帧
+        remaining = self.requests[self._next:]
+        if remaining.size:
+            self._active = True
+            self.static_image = None
+            self.update_frame(scene)
+            for t in remaining:
+                self._capture(t)
+            self._next = len(self.requests)
+
+
+def render_frames(spec, times, quality="low_quality", output_dir="media/frames", random_seed=0, config_overrides=None, image_format="png"):
+    """渲染场景在 times（秒）时刻的画面，按时刻顺序返回 Frame 列表"""
+    from manim import config, tempconfig
+
+    scene_cls = load_scene_class(spec)
+
+    class Seek(scene_cls):
+        def get_time_progression(self, run_time, description, n_iterations=None, override_skip_animations=False):
+            return tqdm(self.renderer.local_times(run_time), desc=description, disable=True)
+
+    Seek.__name__ = scene_cls.__name__
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    frames = []
+
+    def save(time, image):
+        path = output_dir / f"{spec.name}_{time:08.3f}.{image_format}"
+        image.save(path)
+        frames.append(Frame(time, path))
+
+    with tempfile.TemporaryDirectory() as tmp, tempconfig({
+        **(config_overrides or {}),
+        "input_file": str(spec.file),
+        "media_dir": tmp,
+        "write_to_movie": False,
+        "save_last_frame": False,
+        "disable_caching": True,
+    }):
+        config.quality = quality
+        renderer = FrameRenderer(times, save, camera_class=camera_class(scene_cls))
+        Seek(renderer=renderer, random_seed=random_seed).render()
+    return frames
+
+
+def frame_times(start, end, count):
+    """[start, end] 内均匀分布的 count 个时刻"""
+    return list(np.linspace(start, end, count))
+
+
+def _render_chunk(args):
+    return render_frames(*args)
+
+
+def render_frames_parallel(spec, times, quality="low_quality", output_dir="media/frames", random_seed=0, config_overrides=None, jobs=None):
+    """把请求的时刻按先后切成 jobs 段，各段在独立的 spawn 进程中渲染
+
+    每个进程都从头执行 construct，但在自己最后一个时刻之后就停止，
+    所以靠前的段结束得更早。
+    """
+    times = np.unique(np.asarray(times, dtype=float))
+    jobs = max(1, min(jobs or multiprocessing.cpu_count(), len(times)))
+    chunks = [c for c in np.array_split(times, jobs) if c.size]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(chunks), mp_context=context) as pool:
+        parts = pool.map(_render_chunk, [(spec, list(c), quality, output_dir, random_seed, config_overrides) for c in chunks])
+        return [frame for part in parts for frame in part]
+
+
+def contact_sheet(frames, output, height=180, columns=None):
+    """把若干帧缩放到同一高度后拼成一张预览图；columns 缺省时排成一行"""
+    from PIL import Image
+
+    images = [Image.open(f.path) for f in frames]
+    if not images:
+        raise ValueError("没有可拼接的帧")
+    width = round(images[0].width * height / images[0].height)
+    columns = columns or len(images)
+    rows = -(-len(images) // columns)
+    sheet = Image.new("RGB", (width * columns, height * rows))
+    for k, image in enumerate(images):
+        thumb = image.convert("RGB").resize((width, height), Image.LANCZOS)
+        sheet.paste(thumb, ((k % columns) * width, (k // columns) * height))
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    sheet.save(output)
+    return output
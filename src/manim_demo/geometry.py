@@ -0,0 +1,12 @@
+"""贝塞尔控制点等几何数组的批量构造"""
+import numpy as np
+
+
+def line_beziers(corners, closed=False):
+    """把折线顶点 (N, k, 3) 转成直线段的三次贝塞尔控制点 (N, 4 * 段数, 3)"""
+    corners = np.asarray(corners, dtype=float)
+    if closed:
+        corners = np.concatenate([corners, corners[:, :1]], axis=1)
+    start, end = corners[:, :-1], corners[:, 1:]
+    handles = [start, start + (end - start) / 3, start + 2 * (end - start) / 3, end]
+    return np.stack(handles, axis=2).reshape(len(corners), -1, 3)
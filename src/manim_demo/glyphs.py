@@ -0,0 +1,202 @@
+"""成千上万个箭头作为一个 mobject：按颜色分层的批量多边形
+
+每个 Vector 都是带箭头子物体、各自样式的完整 VMobject，箭头多了以后，
+内存和渲染开销都被每个对象的固定成本主导。ArrowGlyphs 把每个箭头画成一个
+7 个顶点的填充多边形（箭杆矩形加三角形箭头），按颜色层级分到 levels 个
+_ArrowBatch 里：同一层的全部箭头是同一个 VMobject 的若干子路径，
+Cairo 对每层只设置一次颜色、填充一次。
+
+几何以各层的点为准，平移、旋转、缩放、Transform 等作用在点上的操作都按整体生效，
+glyphs 从点上读回每个箭头的 (位置, 方向, 长度, 颜色) 结构化数组。
+颜色属于层：set_color_by_gradient 给各层重新配色，可以用 .animate 平滑过渡。
+Create 这类按比例显示的动画让每个箭头从箭尾长出，各层依次出现（由弱到强）。
+"""
+import numpy as np
+from manim import VGroup, VMobject
+from manim.mobject.vector_field import DEFAULT_SCALAR_FIELD_COLORS
+from manim.utils.color import color_gradient
+
+from .geometry import line_beziers
+
+ARROW_DTYPE = np.dtype([
+    ("position", float, 3),
+    ("direction", float, 3),    # 单位向量，长度为 0 时为零向量
+    ("length", float),
+    ("color", float, 4),        # rgba
+])
+
+# 每个箭头 7 条直线段，每段 4 个控制点
+VERTICES = 7
+POINTS_PER_ARROW = VERTICES * 4
+# 锚点在箭尾到箭头尖之间的位置
+_ANCHOR_FRACTION = {"tail": 0.0, "center": 0.5}
+
+
+def arrow_polygons(tails, vectors, width, tip_length, tip_width):
+    """箭头多边形的顶点 (N, 7, 3)：箭尾两角、箭杆与箭头交界、箭头三角形
+
+    width、tip_length、tip_width 可以是标量或 (N,) 数组；箭头在 xy 平面内展开。
+    """
+    tails = np.asarray(tails, dtype=float)
+    vectors = np.asarray(vectors, dtype=float)
+    lengths = np.linalg.norm(vectors, axis=1)
+    unit = vectors / np.maximum(lengths, 1e-12)[:, None]
+    tip = np.minimum(tip_length, lengths)[:, None]
+    perp = np.column_stack([-unit[:, 1], unit[:, 0], np.zeros(len(unit))])
+    shaft = perp * (np.broadcast_to(width, lengths.shape) / 2)[:, None]
+    head = perp * (np.broadcast_to(tip_width, lengths.shape) / 2)[:, None]
+    ends = tails + vectors
+    bases = ends - unit * tip
+    return np.stack(
+        [tails + shaft, bases + shaft, bases + head, ends, bases - head, bases - shaft, tails - shaft],
+        axis=1,
+    )
+
+
+class _ArrowBatch(VMobject):
+    """同一颜色层的全部箭头；indices 为这些箭头在 ArrowGlyphs 中的编号"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.indices = np.zeros(0, dtype=int)
+
+    def arrow_vertices(self):
+        """(n, 7, 3) 顶点；点的排列不是整箭头时（如 Transform 对齐之后）返回 None"""
+        if len(self.points) != len(self.indices) * POINTS_PER_ARROW:
+            return None
+        return self.points.reshape(len(self.indices), VERTICES, 4, 3)[:, :, 0]
+
+    def gen_subpaths_from_points_2d(self, points):
+        # 与 VMobject 的判定相同（consider_points_equals_2d），整批比较相邻曲线的首尾
+        n = self.n_points_per_cubic_curve
+        ends, starts = points[n - 1:-1:n, :2], points[n::n, :2]
+        apart = np.any(np.abs(ends - starts) > self.tolerance_for_point_equality + 1e-5 * np.abs(starts), axis=1)
+        splits = [0, *((np.flatnonzero(apart) + 1) * n), len(points)]
+        return (points[i:j] for i, j in zip(splits, splits[1:]) if j - i >= n)
+
+    def pointwise_become_partial(self, vmobject, a, b):
+        # 每个箭头沿自身从 a 到 b 的一段，整体按比例缩放，与 GrowArrow 相同
+        vertices = vmobject.arrow_vertices() if isinstance(vmobject, _ArrowBatch) else None
+        if vertices is None:
+            return super().pointwise_become_partial(vmobject, a, b)
+        tails = (vertices[:, :1, :] + vertices[:, -1:, :]) / 2
+        vectors = vertices[:, 3:4, :] - tails
+        points = vmobject.points.reshape(len(vertices), POINTS_PER_ARROW, 3)
+        self.points = (tails + a * vectors + (points - tails) * (b - a)).reshape(-1, 3)
+        self.indices = vmobject.indices
+        return self
+
+
+class ArrowGlyphs(VGroup):
+    """N 个箭头，按 values 在 value_range 中的位置分到 levels 个颜色层
+
+    positions 为箭头的锚点（anchor 为 "center" 时是中点，"tail" 时是箭尾），
+    vectors 为显示的向量，values 缺省时取向量长度。
+    shaft_width 为箭杆宽度（场景单位），箭头长度不超过 tip_length 与
+    max_tip_length_to_length_ratio 倍的箭头长度，宽度为其 tip_width_ratio 倍。
+    """
+
+    def __init__(
+        self,
+        positions,
+        vectors,
+        values=None,
+        colors=DEFAULT_SCALAR_FIELD_COLORS,
+        value_range=(0, 2),
+        levels=32,
+        anchor="center",
+        shaft_width=0.02,
+        tip_length=0.35,
+        max_tip_length_to_length_ratio=0.25,
+        tip_width_ratio=1.0,
+        opacity=1.0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        if anchor not in _ANCHOR_FRACTION:
+            raise ValueError(f"anchor 应为 {' / '.join(_ANCHOR_FRACTION)}，实际为 {anchor!r}")
+        self.value_range = value_range
+        self.levels = levels
+        self.anchor_fraction = _ANCHOR_FRACTION[anchor]
+        self.shaft_width = shaft_width
+        self.tip_length = tip_length
+        self.max_tip_length_to_length_ratio = max_tip_length_to_length_ratio
+        self.tip_width_ratio = tip_width_ratio
+        self.add(*(_ArrowBatch(stroke_width=0, fill_opacity=opacity) for _ in range(levels)))
+        self.set_color_by_gradient(*colors)
+        self.set_arrows(vectors, values, positions)
+
+    @property
+    def batches(self):
+        return [m for m in self.submobjects if isinstance(m, _ArrowBatch)]
+
+    def set_color_by_gradient(self, *colors):
+        """按层从低到高配色；只给一种颜色时全部同色"""
+        batches = self.batches
+        for batch, color in zip(batches, color_gradient(colors, len(batches))):
+            batch.set_fill(color, family=False)
+        return self
+
+    def level_of(self, values):
+        lo, hi = self.value_range
+        alphas = np.nan_to_num((np.asarray(values, dtype=float) - lo) / (hi - lo))
+        return np.clip((alphas * self.levels).astype(int), 0, self.levels - 1)
+
+    def set_arrows(self, vectors, values=None, positions=None):
+        """整批设置全部箭头；positions 缺省时保持各箭头当前的锚点"""
+        vectors = np.asarray(vectors, dtype=float).reshape(-1, 3)
+        positions = self.positions() if positions is None else np.asarray(positions, dtype=float).reshape(-1, 3)
+        if len(positions) != len(vectors):
+            raise ValueError(f"箭头数 {len(vectors)} 与锚点数 {len(positions)} 不一致")
+        lengths = np.linalg.norm(vectors, axis=1)
+        level = self.level_of(lengths if values is None else values)
+        tip = np.minimum(self.tip_length, self.max_tip_length_to_length_ratio * lengths)
+        polygons = arrow_polygons(
+            positions - self.anchor_fraction * vectors, vectors, self.shaft_width, tip, self.tip_width_ratio * tip,
+        )
+        beziers = line_beziers(polygons, closed=True)
+
+        order = np.argsort(level, kind="stable")
+        counts = np.bincount(level, minlength=self.levels)
+        for batch, members in zip(self.batches, np.split(order, np.cumsum(counts)[:-1])):
+            batch.indices = members
+            batch.points = beziers[members].reshape(-1, 3)
+        self._positions = positions.copy()
+        return self
+
+    def _geometry(self):
+        """从各层的点读回 (箭尾, 箭头尖, 颜色)；点不是整箭头排列时返回 None"""
+        n = len(self._positions)
+        tails, tips, rgbas = np.zeros((n, 3)), np.zeros((n, 3)), np.zeros((n, 4))
+        for batch in self.batches:
+            vertices = batch.arrow_vertices()
+            if vertices is None:
+                return None
+            tails[batch.indices] = (vertices[:, 0] + vertices[:, -1]) / 2
+            tips[batch.indices] = vertices[:, 3]
+            rgbas[batch.indices] = batch.get_fill_rgbas()[0]
+        return tails, tips, rgbas
+
+    def positions(self):
+        """各箭头当前的锚点 (N, 3)"""
+        geometry = self._geometry()
+        if geometry is None:
+            return self._positions.copy()
+        tails, tips, _ = geometry
+        return tails + self.anchor_fraction * (tips - tails)
+
+    @property
+    def glyphs(self):
+        """全部箭头的结构化数组，dtype 为 ARROW_DTYPE"""
+        geometry = self._geometry()
+        if geometry is None:
+            raise ValueError("箭头的点已被重新排列（例如正处于 Transform 中），无法读回")
+        tails, tips, rgbas = geometry
+        vectors = tips - tails
+        lengths = np.linalg.norm(vectors, axis=1)
+        records = np.zeros(len(lengths), dtype=ARROW_DTYPE)
+        records["position"] = tails + self.anchor_fraction * vectors
+        records["direction"] = vectors / np.maximum(lengths, 1e-12)[:, None]
+        records["length"] = lengths
+        records["color"] = rgbas
+        return records
@@ -0,0 +1,292 @@
+"""增量重渲染：按 play 的全部输入计算内容哈希，复用没有变化的 partial movie
+
+manim 用 play 开始时相机、动画和场景中 mobject 的 JSON 摘要作为 partial movie 的文件名，
+但这个摘要对 updater 驱动的 play 并不可靠：超过 1000 个元素的数组只取 repr 的首尾，
+updater 闭包引用的场景本身（self）被替换成占位符，随机数状态和场景时间都不参与，
+最后只保留 32 位的 crc32。结果要么不敢开缓存，要么改了一处不相干的文字后整段重渲染。
+
+PlayHasher 在生效期间替换 manim 的 get_hash_from_play_call，对下面这些内容做 sha1：
+- 相机的全部参数（分辨率、帧率、背景色、三维相机的角度等）；
+- 本次 play 的动画及其目标值（包括 .animate 的方法与参数、rate_func）；
+- 场景中全部 mobject 的状态：点、样式数组的完整内容，ValueTracker 的当前值，
+  updater 的源码、默认参数、闭包中的值以及它引用的全局变量；
+- 场景对象自身的属性与场景类上的参数（sweep 覆盖的类属性），但不含场景类的源码，
+  所以改标题、改后面的 play 不会让前面的 play 失效；
+- 场景时间、random_seed 以及 random 与 numpy 全局随机数的当前状态。
+
+场景文件和 manim_demo 中定义的函数、类按源码计入（不论 manim_demo 是否以 editable 方式安装），
+已安装的库（manim、numpy 等）只计名称，再加上 manim 的版本号。每次 play 的命中与否记录在 records 中。
+"""
+import functools
+import hashlib
+import inspect
+import random
+import sys
+import sysconfig
+import time
+import types
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+from manim import Scene, __version__ as manim_version
+from manim.camera.camera import Camera
+
+# 不参与哈希的属性：相机的画布与缓冲区，以及场景中由 manim 维护、单独处理或与画面无关的状态
+_CAMERA_SKIP = {"pixel_array", "background", "pixel_array_to_cairo_context", "canvas"}
+_SCENE_SKIP = {
+    "renderer", "queue", "time_progression", "animations", "mobjects", "foreground_mobjects",
+    "moving_mobjects", "static_mobjects", "last_t", "stop_condition", "skip_animations",
+    "random_seed", "interactive_mode", "widgets", "key_to_function_map", "mouse_press_callbacks",
+    "mouse_point", "mouse_drag_point", "dearpygui_imported",
+}
+_OBJECT_SKIP = {"original_id"}
+
+
+class PlayRecord(NamedTuple):
+    index: int          # 第几次 play / wait
+    key: str
+    hit: bool           # partial movie 已存在，直接复用
+    run_time: float     # 秒
+    hash_time: float    # 计算哈希的耗时（秒）
+    animations: str
+
+
+@functools.lru_cache(maxsize=None)
+def _is_library(module_name):
+    """模块是否来自标准库或 site-packages；这些代码在两次渲染之间不会变，只计名称
+
+    manim_demo 自身总按源码计入：非 editable 安装（pip install .）时它也在 site-packages 里，
+    按路径判断会让 fields.py 等的改动不影响缓存键。
+    """
+    if module_name == "manim_demo" or (module_name or "").startswith("manim_demo."):
+        return False
+    if not module_name or module_name in sys.builtin_module_names:
+        return True
+    module = sys.modules.get(module_name)
+    file = getattr(module, "__file__", None)
+    if file is None:
+        return True
+    paths = sysconfig.get_paths()
+    roots = {Path(paths[k]).resolve() for k in ("stdlib", "platstdlib", "purelib", "platlib")}
+    return any(root in Path(file).resolve().parents for root in roots)
+
+
+@functools.lru_cache(maxsize=None)
+def _source(obj):
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        code = getattr(obj, "co_code", None)
+        return code.hex() if code is not None else ""
+
+
+def _global_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _global_names(const)
+    return names
+
+
+class StateHasher:
+    """把任意对象图按内容写进 sha1；同一对象第二次出现时只写它第一次出现的序号"""
+
+    def __init__(self):
+        self.hasher = hashlib.sha1()
+        self._seen = {}
+        self._alive = []    # 保持临时对象存活，避免 id 在遍历中被复用
+
+    def hexdigest(self):
+        return self.hasher.hexdigest()
+
+    def _write(self, *parts):
+        for part in parts:
+            self.hasher.update(part if isinstance(part, bytes) else str(part).encode())
+            self.hasher.update(b"\0")
+
+    def feed(self, obj):
+        if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+            self._write(type(obj).__name__, repr(obj))
+            return
+        if isinstance(obj, np.generic):
+            self._write(obj.dtype.str, repr(obj.item()))
+            return
+        if isinstance(obj, types.ModuleType):
+            self._write("module", obj.__name__)
+            return
+        if id(obj) in self._seen:
+            self._write("@", self._seen[id(obj)])
+            return
+        self._seen[id(obj)] = len(self._seen)
+        self._alive.append(obj)
+
+        if isinstance(obj, np.ndarray):
+            self._feed_array(obj)
+        elif isinstance(obj, (list, tuple)):
+            self._write(type(obj).__name__, len(obj))
+            for item in obj:
+                self.feed(item)
+        elif isinstance(obj, dict):
+            self._feed_dict(obj)
+        elif isinstance(obj, (set, frozenset)):
+            # 集合的迭代顺序随字符串哈希的随机化而变，按元素各自的摘要排序
+            digests = []
+            for item in obj:
+                sub = StateHasher()
+                sub.feed(item)
+                digests.append(sub.hexdigest())
+            self._write(type(obj).__name__, *sorted(digests))
+        elif isinstance(obj, type):
+            self._feed_class(obj)
+        elif isinstance(obj, types.MethodType):
+            self._write("method")
+            self.feed(obj.__func__)
+            self.feed(obj.__self__)
+        elif isinstance(obj, types.FunctionType):
+            self._feed_function(obj)
+        elif isinstance(obj, functools.partial):
+            self._write("partial")
+            self.feed(obj.func)
+            self.feed(obj.args)
+            self.feed(obj.keywords)
+        elif isinstance(obj, (types.BuiltinFunctionType, np.ufunc)):
+            self._write("builtin", getattr(obj, "__module__", ""), getattr(obj, "__qualname__", obj.__name__))
+        elif isinstance(obj, np.random.RandomState):
+            self.feed(obj.get_state())
+        elif isinstance(obj, np.random.Generator):
+            self.feed(obj.bit_generator.state)
+        elif isinstance(obj, Scene):
+            self._feed_scene(obj)
+        elif isinstance(obj, Camera):
+            self._feed_object(obj, _CAMERA_SKIP)
+        elif hasattr(obj, "__dict__"):
+            self._feed_object(obj, _OBJECT_SKIP)
+        else:
+            text = repr(obj)
+            # 带内存地址的 repr 每次运行都不同，只记类型
+            self._write(type(obj).__qualname__, "" if " at 0x" in text else text)
+
+    def _feed_array(self, array):
+        self._write("ndarray", array.dtype.str, array.shape)
+        if array.dtype == object:
+            for item in array.ravel():
+                self.feed(item)
+        else:
+            self.hasher.update(np.ascontiguousarray(array).data)
+
+    def _feed_dict(self, mapping, skip=()):
+        # dict 保持插入顺序，属性的赋值顺序在两次运行之间相同
+        items = [(k, v) for k, v in mapping.items() if k not in skip]
+        self._write("dict", len(items))
+        for key, value in items:
+            self.feed(key)
+            self.feed(value)
+
+    def _feed_class(self, cls):
+        self._write("class", cls.__module__, cls.__qualname__)
+        if not _is_library(cls.__module__) and not issubclass(cls, Scene):
+            self._write(_source(cls))
+
+    def _feed_function(self, func):
+        self._write("function", func.__module__, func.__qualname__)
+        if _is_library(func.__module__):
+            return
+        code = func.__code__
+        self._write(_source(code))
+        self.feed(func.__defaults__)
+        self.feed(func.__kwdefaults__)
+        for cell in func.__closure__ or ():
+            try:
+                self.feed(cell.cell_contents)
+            except ValueError:      # 尚未赋值的闭包变量
+                self._write("empty cell")
+        for name in sorted(_global_names(code)):
+            if name in func.__globals__:
+                self._write("global", name)
+                self.feed(func.__globals__[name])
+
+    def _feed_object(self, obj, skip):
+        self.feed(type(obj))
+        self._feed_dict(vars(obj), skip)
+
+    def _feed_scene(self, scene):
+        # 场景类只计入参数（非可调用的类属性），不计源码
+        self._write("scene", type(scene).__qualname__)
+        for cls in type(scene).__mro__:
+            if _is_library(cls.__module__):
+                continue
+            for name, value in vars(cls).items():
+                if not name.startswith("__") and not callable(value) and not isinstance(value, (classmethod, staticmethod, property)):
+                    self._write(name)
+                    self.feed(value)
+        self._feed_dict(vars(scene), _SCENE_SKIP)
+
+
+def play_key(scene, camera, animations, mobjects):
+    """一次 play 的全部输入的 sha1，签名与 manim 的 get_hash_from_play_call 相同"""
+    hasher = StateHasher()
+    hasher._write("manim", manim_version)
+    hasher.feed(camera)
+    hasher.feed(list(animations))
+    hasher.feed(list(mobjects))
+    hasher.feed(scene)
+    hasher.feed(scene.renderer.time)
+    hasher.feed(scene.random_seed)
+    hasher.feed(random.getstate())
+    hasher.feed(np.random.get_state())
+    return hasher.hexdigest()
+
+
+class PlayHasher:
+    """生效期间用 play_key 代替 manim 的 play 哈希，并记录每次 play 是否命中缓存"""
+
+    def __init__(self):
+        self.records = []
+        self._patched = []
+
+    def hash_play(self, scene, camera, animations, mobjects):
+        start = time.perf_counter()
+        key = play_key(scene, camera, animations, mobjects)
+        elapsed = time.perf_counter() - start
+        self.records.append(PlayRecord(
+            len(self.records),
+            key,
+            scene.renderer.file_writer.is_already_cached(key),
+            float(scene.duration or 0.0),
+            elapsed,
+            ", ".join(type(a).__name__ for a in animations),
+        ))
+        return key
+
+    def _patch(self, owner, name, value):
+        self._patched.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, value)
+
+    def __enter__(self):
+        import manim.renderer.cairo_renderer as cairo_renderer
+        import manim.utils.caching as caching
+
+        self._patch(cairo_renderer, "get_hash_from_play_call", self.hash_play)
+        self._patch(caching, "get_hash_from_play_call", self.hash_play)
+        return self
+
+    def __exit__(self, *exc):
+        for owner, name, value in reversed(self._patched):
+            setattr(owner, name, value)
+        self._patched.clear()
+
+
+def format_report(records):
+    """每次 play 一行：命中与否、时长、哈希耗时、动画；最后汇总复用的动画时长"""
+    lines = [f"{'play':>4}  {'cache':<5}  {'run s':>6}  {'hash ms':>8}  animations"]
+    for r in records:
+        lines.append(
+            f"{r.index:>4}  {'hit' if r.hit else 'miss':<5}  {r.run_time:>6.2f}  {r.hash_time * 1e3:>8.1f}  {r.animations}"
+        )
+    hits = [r for r in records if r.hit]
+    total = sum(r.run_time for r in records)
+    lines.append(
+        f"{len(hits)}/{len(records)} plays reused, {sum(r.run_time for r in hits):.1f}s of {total:.1f}s animation"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,120 @@
+"""批量轨迹积分器
+
+把所有初值拼成一个 (N, d) 的状态数组一起推进，用于相图这类
+需要同时积分成百上千条轨迹的场景。
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+
+class Trajectories(NamedTuple):
+    t: np.ndarray        # (T,) 采样时刻
+    states: np.ndarray   # (T, N, d) 各时刻的状态，逃逸后保持最后的有效值
+    lengths: np.ndarray  # (N,) 每条轨迹的有效采样点数（含初值）
+
+
+# Dormand–Prince 5(4) 系数
+_DP_C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1, 1])
+_DP_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+]
+_DP_B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0])
+_DP_E = _DP_B - np.array([5179/57600, 0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40])
+
+
+def _euler_step(f, t, y, h):
+    return y + h * f(t, y)
+
+
+def _rk4_step(f, t, y, h):
+    k1 = f(t, y)
+    k2 = f(t + h/2, y + h/2 * k1)
+    k3 = f(t + h/2, y + h/2 * k2)
+    k4 = f(t + h, y + h * k3)
+    return y + h/6 * (k1 + 2*k2 + 2*k3 + k4)
+
+
+def _rk45_step(f, t, y, h, rtol, atol, h_min=1e-8):
+    # 在 [t, t+h] 内做自适应子步，整批轨迹共用一个步长，误差取所有轨迹的最大值
+    t_end = t + h
+    sub = h
+    while t < t_end:
+        sub = min(sub, t_end - t)
+        ks = []
+        for c, a in zip(_DP_C, _DP_A):
+            yi = y + sub * sum(aj * kj for aj, kj in zip(a, ks)) if a else y
+            ks.append(f(t + c * sub, yi))
+        y_new = y + sub * sum(b * k for b, k in zip(_DP_B, ks) if b)
+        err = sub * sum(e * k for e, k in zip(_DP_E, ks) if e)
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        err_norm = np.max(np.abs(err) / scale) if err.size else 0.0
+        if not np.isfinite(err_norm):
+            err_norm = np.inf
+        if err_norm <= 1 or sub <= h_min:
+            t += sub
+            y = y_new
+        factor = 5.0 if err_norm == 0 else 0.9 * err_norm ** -0.2
+        sub = max(sub * min(5.0, max(0.2, factor)), h_min)
+    return y
+
+
+_STEPPERS = {
+    "euler": _euler_step,
+    "rk4": _rk4_step,
+}
+
+
+def integrate_batch(f, y0, t_max, dt, method="rk4", escape=None, rtol=1e-6, atol=1e-9):
+    """同时积分一批初值
+
+    f(t, Y) 接收 (N, d) 的状态数组，返回同形状的导数。
+    method 可选 "euler"、"rk4" 或自适应的 "rk45"（按 dt 输出采样）。
+    escape 给定时，任一分量绝对值超过它的轨迹在该步之前截断，
+    对应原来逐点循环里的 ``if abs(x) > 10 or abs(y) > 10: break``。
+    """
+    y = np.array(y0, dtype=float)
+    if y.ndim == 1:
+        y = y[:, None]
+    n_steps = int(t_max / dt)
+    t = np.arange(n_steps + 1) * dt
+
+    states = np.empty((n_steps + 1,) + y.shape)
+    states[0] = y
+    lengths = np.full(len(y), n_steps + 1)
+    alive = np.ones(len(y), dtype=bool)
+
+    for i in range(n_steps):
+        idx = np.flatnonzero(alive)
+        if idx.size == 0:
+            states[i + 1:] = y
+            break
+        # 只推进仍在范围内的轨迹
+        if method == "rk45":
+            y_new = _rk45_step(f, t[i], y[idx], dt, rtol, atol)
+        else:
+            y_new = _STEPPERS[method](f, t[i], y[idx], dt)
+        if escape is not None:
+            escaped = ~np.all(np.abs(y_new) <= escape, axis=1)
+            lengths[idx[escaped]] = i + 1
+            alive[idx[escaped]] = False
+            idx, y_new = idx[~escaped], y_new[~escaped]
+        y[idx] = y_new
+        states[i + 1] = y
+    return Trajectories(t, states, lengths)
+
+
+def trajectories_to_points(axes, traj):
+    """一次性把全部有效采样点转换成场景坐标，返回每条轨迹的 (n_i, 3) 点列"""
+    n_t = traj.states.shape[0]
+    valid = np.arange(n_t)[:, None] < traj.lengths[None, :]
+    # 按轨迹连续排列，便于之后按长度切分
+    coords = traj.states.transpose(1, 0, 2)[valid.T]
+    points = np.asarray(axes.c2p(coords[:, :2])).reshape(-1, 3)
+    return np.split(points, np.cumsum(traj.lengths)[:-1])
@@ -0,0 +1,97 @@
+"""时间的纯函数形式的一维运动
+
+Motion 用一串 (时刻, 位置) 节点描述匀速分段运动：节点之间线性插值，
+第一个节点之前停在起点，最后一个节点之后停在终点。位置只取决于时间，
+不像在 updater 里累加 dt 那样依赖帧的先后，任意时刻都可以直接求值；
+场景里用一个按 linear 推进的 ValueTracker 作时钟，updater 只读时钟的值。
+
+两个分段线性运动之差仍是分段线性的，所以"何时相遇""何时相距 d"
+可以在合并后的节点上逐段解一次方程精确求出，不需要数值搜索。
+"""
+import numpy as np
+
+
+class Motion:
+    def __init__(self, times, positions):
+        self.times = np.asarray(times, dtype=float)
+        self.positions = np.asarray(positions, dtype=float)
+        if self.times.shape != self.positions.shape or self.times.ndim != 1 or len(self.times) == 0:
+            raise ValueError("times 与 positions 应为等长的一维数组")
+        if np.any(np.diff(self.times) < 0):
+            raise ValueError("节点时刻必须单调不减")
+
+    @classmethod
+    def start(cls, position, time=0.0):
+        """在 time 时刻位于 position，之后用 move_to / stop / bounce 接上各段"""
+        return cls([time], [position])
+
+    @property
+    def end_time(self):
+        return self.times[-1]
+
+    @property
+    def end_position(self):
+        return self.positions[-1]
+
+    def _then(self, duration, position):
+        return Motion(np.append(self.times, self.end_time + duration), np.append(self.positions, position))
+
+    def move_to(self, target, speed):
+        """以 speed 匀速走到 target"""
+        if speed <= 0:
+            raise ValueError("speed 必须为正")
+        return self._then(abs(target - self.end_position) / speed, target)
+
+    def stop(self, duration):
+        """原地停留 duration"""
+        return self._then(duration, self.end_position)
+
+    def bounce(self, target, speed):
+        """以 speed 走到 target 后原速返回出发点"""
+        return self.move_to(target, speed).move_to(self.end_position, speed)
+
+    def __call__(self, t):
+        """t 时刻的位置，t 可以是数组"""
+        return np.interp(t, self.times, self.positions)
+
+    def velocity(self, t):
+        """t 时刻的速度；节点处取之后一段的速度"""
+        t = np.asarray(t, dtype=float)
+        if len(self.times) < 2:
+            return np.zeros_like(t)
+        dt = np.diff(self.times)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            speeds = np.where(dt > 0, np.diff(self.positions) / dt, 0.0)
+        i = np.searchsorted(self.times, t, side="right") - 1
+        inside = (i >= 0) & (i < len(speeds))
+        return np.where(inside, speeds[np.clip(i, 0, len(speeds) - 1)], 0.0)
+
+    def _combine(self, other, op):
+        times = np.union1d(self.times, other.times)
+        return Motion(times, op(self(times), other(times)))
+
+    def __sub__(self, other):
+        return self._combine(other, np.subtract)
+
+    def __add__(self, other):
+        return self._combine(other, np.add)
+
+    def solve(self, level):
+        """位置等于 level 的全部时刻（升序）
+
+        停在 level 上的一段只报告它开始的时刻。
+        """
+        t, x = self.times, self.positions - level
+        roots = list(t[:1][x[:1] == 0])
+        a, b = x[:-1], x[1:]
+        # 从非零值到达或穿过 0 的各段
+        crossing = (a != 0) & (a * b <= 0)
+        ta, tb = t[:-1][crossing], t[1:][crossing]
+        roots.extend(ta + (tb - ta) * a[crossing] / (a[crossing] - b[crossing]))
+        return np.unique(roots)
+
+    def meetings(self, other, distance=0.0):
+        """两者都已出发后，与 other 相距 distance 的全部时刻"""
+        gap = self - other
+        roots = np.unique(np.concatenate([gap.solve(distance), gap.solve(-distance)]))
+        return roots[roots >= max(self.times[0], other.times[0])]
@@ -0,0 +1,125 @@
+"""一维反应扩散方程求解器
+
+    u_t = D u_xx + λ u,   x ∈ [0, L]
+    u(x, 0) = initial(x),   u(0, t) = left(t),   u(L, t) = right(t)
+
+空间用二阶中心差分，时间推进可选：
+- "explicit"：向量化的前向 Euler，要求 D dt / dx² <= 1/2
+- "backward-euler"：隐式，无条件稳定
+- "crank-nicolson"：隐式，二阶精度，无条件稳定
+
+隐式格式的三对角矩阵不随时间变化，只做一次 LU 分解（LAPACK gttrf），
+之后每步只需一次 O(nx) 的回代，网格到上万个点也不需要 Python 循环。
+"""
+import warnings
+from typing import NamedTuple
+
+import numpy as np
+from scipy.linalg.lapack import dgttrf, dgttrs
+
+_THETA = {
+    "explicit": 0.0,
+    "backward-euler": 1.0,
+    "crank-nicolson": 0.5,
+}
+
+
+class PDESolution(NamedTuple):
+    x: np.ndarray  # (nx,) 空间网格，含两端点
+    t: np.ndarray  # (nt_saved,) 保存下来的时刻
+    u: np.ndarray  # (nx, nt_saved)，u[i, n] 对应 x[i], t[n]
+
+
+def _boundary_values(g, t):
+    # 边界条件可以是常数、接收数组的函数或只接收标量的函数
+    if not callable(g):
+        return np.full(t.shape, float(g))
+    try:
+        values = np.asarray(g(t), dtype=float)
+        if values.shape == t.shape:
+            return values
+        return np.broadcast_to(values, t.shape).copy()
+    except (TypeError, ValueError):
+        return np.array([g(ti) for ti in t], dtype=float)
+
+
+def solve_reaction_diffusion(
+    initial,
+    left=0.0,
+    right=0.0,
+    L=1.0,
+    T=1.0,
+    nx=101,
+    nt=201,
+    D=1.0,
+    lam=0.0,
+    method="crank-nicolson",
+    save_every=1,
+):
+    """在 nx 个等距空间点、nt 个等距时刻（含 t=0 与 t=T）上求解
+
+    save_every > 1 时只保存每隔 save_every 步的结果，
+    长时间积分时内存只与保存的帧数成正比。
+    """
+    if method not in _THETA:
+        raise ValueError(f"未知的时间格式 {method!r}，可选 {sorted(_THETA)}")
+    theta = _THETA[method]
+
+    x = np.linspace(0, L, nx)
+    t = np.linspace(0, T, nt)
+    dx = x[1] - x[0]
+    dt = t[1] - t[0]
+    r = D * dt / dx**2
+    if theta < 0.5 and r > 0.5:
+        warnings.warn(
+            f"显式格式不稳定：D dt / dx² = {r:.3g} > 0.5，请减小 dt 或改用隐式格式",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+
+    lefts = _boundary_values(left, t)
+    rights = _boundary_values(right, t)
+
+    u = np.asarray(initial(x) if callable(initial) else initial, dtype=float).copy()
+    u[0], u[-1] = lefts[0], rights[0]
+
+    saved = range(0, nt, save_every)
+    out = np.empty((nx, len(saved)))
+    out[:, 0] = u
+    col = 1
+
+    # 内部点上的算子 A = D Δ + λ I，只存三条对角线
+    m = nx - 2
+    main = -2 * r + lam * dt
+    off = r
+    if theta > 0:
+        lu = dgttrf(
+            np.full(m - 1, -theta * off),
+            np.full(m, 1 - theta * main),
+            np.full(m - 1, -theta * off),
+        )
+        if lu[-1] != 0:
+            raise np.linalg.LinAlgError(f"三对角矩阵分解失败（dgttrf info={lu[-1]}）")
+        dl, d, du, du2, ipiv = lu[:-1]
+
+    for n in range(nt - 1):
+        inner = u[1:-1]
+        # 右端项 (I + (1-θ) dt A) u^n
+        rhs = inner + (1 - theta) * (main * inner + off * (u[:-2] + u[2:]))
+        u_next = np.empty_like(u)
+        u_next[0], u_next[-1] = lefts[n + 1], rights[n + 1]
+        if theta > 0:
+            # 隐式部分的边界贡献
+            rhs[0] += theta * off * u_next[0]
+            rhs[-1] += theta * off * u_next[-1]
+            u_next[1:-1], info = dgttrs(dl, d, du, du2, ipiv, rhs)
+            if info != 0:
+                raise np.linalg.LinAlgError(f"三对角方程组求解失败（dgttrs info={info}）")
+        else:
+            u_next[1:-1] = rhs
+        u = u_next
+        if (n + 1) % save_every == 0:
+            out[:, col] = u
+            col += 1
+
+    return PDESolution(x, t[::save_every], out)
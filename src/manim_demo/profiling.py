@@ -0,0 +1,227 @@
+"""updater 性能剖析
+
+UpdaterProfiler 在生效期间替换 Mobject.add_updater / remove_updater 与 always_redraw，
+把之后注册的每个 updater 和 always_redraw 的工厂函数都包一层计时：
+记录调用次数、累计耗时、每帧耗时（按 Scene.update_to_time 划分帧），
+开启 memory 时还用 tracemalloc 记录每次调用后净增的内存。
+每帧的 update_to_time 与光栅化（renderer.render）也作为事件记录下来，
+可导出为 Chrome trace-event JSON，在 chrome://tracing 或 Perfetto 中查看。
+
+场景文件通过 from manim import * 取得 always_redraw，因此要在导入场景之前进入剖析。
+"""
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from typing import NamedTuple
+
+
+class UpdaterStats(NamedTuple):
+    label: str
+    calls: int
+    total: float        # 秒
+    frames: int         # 被调用过的帧数
+    max_frame: float    # 单帧内的最大耗时（秒）
+    allocated: int      # 净增内存（字节），未开启 memory 时为 0
+
+    @property
+    def per_frame(self):
+        return self.total / self.frames if self.frames else 0.0
+
+
+def label_of(func):
+    """函数名加定义位置，例如 update_vector_field (3_反应扩散方程.py:62)"""
+    func = getattr(func, "__wrapped__", func)
+    code = getattr(func, "__code__", None)
+    name = getattr(func, "__qualname__", repr(func)).replace(".<locals>", "")
+    if code is None:
+        return name
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class UpdaterProfiler:
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.events = []
+        self.frame = -1
+        self._calls = defaultdict(int)
+        self._total = defaultdict(float)
+        self._allocated = defaultdict(int)
+        self._per_frame = defaultdict(lambda: defaultdict(float))
+        self._origin = time.perf_counter_ns()
+        self._patched = []
+        self._stop_tracing = False
+
+    # ---- 计时包装 ----
+
+    def _record(self, name, category, start, end, args=None):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self._origin) / 1000,
+            "dur": (end - start) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def wrap(self, func, label=None, category="updater"):
+        """返回计时版本的 func；签名保持不变，manim 依然能识别 dt 参数"""
+        if getattr(func, "_profiled", False):
+            return func
+        label = label or label_of(func)
+        profiler = self
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            before = tracemalloc.get_traced_memory()[0] if profiler.memory else 0
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = time.perf_counter_ns()
+                seconds = (end - start) / 1e9
+                profiler._calls[label] += 1
+                profiler._total[label] += seconds
+                profiler._per_frame[label][profiler.frame] += seconds
+                extra = {"frame": profiler.frame}
+                if profiler.memory:
+                    delta = tracemalloc.get_traced_memory()[0] - before
+                    profiler._allocated[label] += delta
+                    extra["bytes"] = delta
+                profiler._record(label, category, start, end, extra)
+
+        timed._profiled = True
+        return timed
+
+    def _span(self, func, name, new_frame=False):
+        # 每帧的 update_to_time 与 render 只记事件，不计入 updater 统计
+        profiler = self
+
+        @functools.wraps(func)
+        def spanned(*args, **kwargs):
+            if new_frame:
+                profiler.frame += 1
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler._record(name, "frame", start, time.perf_counter_ns(), {"frame": profiler.frame})
+
+        return spanned
+
+    # ---- 替换 manim 的入口 ----
+
+    def _patch(self, owner, name, value):
+        self._patched.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, value)
+
+    def __enter__(self):
+        import manim
+        import manim.animation.updaters.mobject_update_utils as update_utils
+        from manim import Mobject, Scene
+        from manim.renderer.cairo_renderer import CairoRenderer
+
+        profiler = self
+        add_updater = Mobject.add_updater
+        remove_updater = Mobject.remove_updater
+        original_always_redraw = update_utils.always_redraw
+
+        def profiled_add_updater(mob, update_function, *args, **kwargs):
+            return add_updater(mob, profiler.wrap(update_function), *args, **kwargs)
+
+        def profiled_remove_updater(mob, update_function):
+            # 按原函数移除时，同时移除它的计时包装
+            for updater in list(mob.updaters):
+                if getattr(updater, "__wrapped__", None) is update_function:
+                    remove_updater(mob, updater)
+            return remove_updater(mob, update_function)
+
+        @functools.wraps(original_always_redraw)
+        def always_redraw(func):
+            label = "always_redraw " + label_of(func)
+            factory = profiler.wrap(func, label + " [factory]")
+            mob = factory()
+            mob.add_updater(profiler.wrap(lambda _: mob.become(factory()), label))
+            return mob
+
+        self._patch(Mobject, "add_updater", profiled_add_updater)
+        self._patch(Mobject, "remove_updater", profiled_remove_updater)
+        self._patch(update_utils, "always_redraw", always_redraw)
+        self._patch(manim, "always_redraw", always_redraw)
+        self._patch(Scene, "update_to_time", self._span(Scene.update_to_time, "update_to_time", new_frame=True))
+        self._patch(CairoRenderer, "render", self._span(CairoRenderer.render, "render"))
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._stop_tracing = True
+        return self
+
+    def __exit__(self, *exc):
+        for owner, name, value in reversed(self._patched):
+            setattr(owner, name, value)
+        self._patched.clear()
+        if self._stop_tracing:
+            tracemalloc.stop()
+            self._stop_tracing = False
+
+    # ---- 结果 ----
+
+    def stats(self):
+        """按累计耗时从大到小排列的 UpdaterStats 列表"""
+        rows = [
+            UpdaterStats(
+                label,
+                self._calls[label],
+                self._total[label],
+                len(self._per_frame[label]),
+                max(self._per_frame[label].values(), default=0.0),
+                self._allocated[label],
+            )
+            for label in self._calls
+        ]
+        return sorted(rows, key=lambda r: r.total, reverse=True)
+
+    def frame_times(self, name="update_to_time"):
+        """每帧某类事件的耗时（秒），默认为 update_to_time（全部 updater 与动画插值）"""
+        return [e["dur"] / 1e6 for e in self.events if e["name"] == name]
+
+    def write_trace(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps({"traceEvents": self.events, "displayTimeUnit": "ms"}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        return path
+
+
+def format_stats(stats, top=20):
+    """前 top 个 updater 的摘要表，耗时以毫秒显示"""
+    width = max([len(s.label) for s in stats[:top]] + [7])
+    lines = [
+        f"{'updater':<{width}}  {'calls':>7}  {'total ms':>10}  {'ms/frame':>9}  {'max frame ms':>12}  {'KiB':>9}"
+    ]
+    for s in stats[:top]:
+        lines.append(
+            f"{s.label:<{width}}  {s.calls:>7}  {s.total * 1e3:>10.1f}  {s.per_frame * 1e3:>9.2f}"
+            f"  {s.max_frame * 1e3:>12.2f}  {s.allocated / 1024:>9.1f}"
+        )
+    if len(stats) > top:
+        lines.append(f"... {len(stats) - top} more")
+    return "\n".join(lines)
+
+
+def profile_scene(spec, quality="low_quality", media_dir=None, memory=False, config_overrides=None):
+    """剖析一次渲染，返回 (UpdaterProfiler, 视频路径)"""
+    from .render import render_scene
+
+    with UpdaterProfiler(memory=memory) as profiler:
+        output = render_scene(spec, quality, media_dir, config_overrides)
+    return profiler, output
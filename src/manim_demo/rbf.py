@@ -0,0 +1,98 @@
+"""高斯 RBF 网络的基函数矩阵
+
+Φ[k, j] = exp(-|p_k - c_j|² / (2 σ_j²))，按 (采样点, 中心, 宽度) 缓存。
+未加权的基函数、加权后的各分量以及最终输出都只是 Φ 上的
+逐列缩放或一次矩阵乘法，中心数增加时不会再出现逐点的 Python 循环。
+"""
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+_CACHE_SIZE = 32
+_cache = OrderedDict()
+
+
+def _as_rows(a):
+    a = np.asarray(a, dtype=float)
+    return a[:, None] if a.ndim == 1 else a
+
+
+def _key(*arrays):
+    h = hashlib.sha1()
+    for a in arrays:
+        a = np.ascontiguousarray(a)
+        h.update(str((a.dtype, a.shape)).encode())
+        h.update(a.tobytes())
+    return h.hexdigest()
+
+
+def gaussian_basis(points, centers, widths):
+    """直接计算 Φ，points (N, d)，centers (C, d)，一维时可省略最后一维"""
+    points, centers = _as_rows(points), _as_rows(centers)
+    widths = np.broadcast_to(np.asarray(widths, dtype=float), (len(centers),))
+    # |p - c|² = |p|² + |c|² - 2 p·c，避免生成 (N, C, d) 的中间数组
+    d2 = (
+        np.einsum("ij,ij->i", points, points)[:, None]
+        + np.einsum("ij,ij->i", centers, centers)[None, :]
+        - 2 * points @ centers.T
+    )
+    return np.exp(-np.maximum(d2, 0) / (2 * widths**2))
+
+
+def basis_matrix(points, centers, widths):
+    """带缓存的 gaussian_basis，同一组 (采样点, 中心, 宽度) 只计算一次"""
+    points, centers = _as_rows(points), _as_rows(centers)
+    widths = np.broadcast_to(np.asarray(widths, dtype=float), (len(centers),))
+    key = _key(points, centers, widths)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+    phi = gaussian_basis(points, centers, widths)
+    phi.setflags(write=False)
+    _cache[key] = phi
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return phi
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def grid_points(u, v):
+    """二维网格 u × v 展平成 (len(u) * len(v), 2)，顺序与 meshgrid(indexing="ij") 一致"""
+    U, V = np.meshgrid(u, v, indexing="ij")
+    return np.column_stack([U.ravel(), V.ravel()])
+
+
+class RBFNetwork:
+    """f(p) = Σ_j w_j exp(-|p - c_j|² / (2 σ_j²))"""
+
+    def __init__(self, centers, widths, weights):
+        self.centers = _as_rows(centers)
+        self.widths = np.broadcast_to(np.asarray(widths, dtype=float), (len(self.centers),))
+        self.weights = np.asarray(weights, dtype=float)
+
+    def basis(self, points):
+        """未加权的各基函数，(N, C)"""
+        return basis_matrix(points, self.centers, self.widths)
+
+    def weighted(self, points):
+        """加权后的各分量，(N, C)"""
+        return self.basis(points) * self.weights
+
+    def __call__(self, points):
+        """网络输出，(N,)"""
+        return self.basis(points) @ self.weights
+
+    def on_grid(self, u, v):
+        """在二维网格上返回 (基函数, 加权分量, 输出)，形状分别为
+        (nu, nv, C)、(nu, nv, C)、(nu, nv)"""
+        shape = (len(u), len(v))
+        phi = self.basis(grid_points(u, v))
+        return (
+            phi.reshape(shape + (-1,)),
+            (phi * self.weights).reshape(shape + (-1,)),
+            (phi @ self.weights).reshape(shape),
+        )
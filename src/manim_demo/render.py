@@ -0,0 +1,204 @@
+"""场景发现与批量渲染
+
+discover_scenes 只用 ast 解析 animations/ 下的文件，不需要导入 manim；
+真正的渲染在独立进程里完成，每个场景使用自己的 media_dir，互不干扰。
+"""
+import ast
+import hashlib
+import importlib.util
+import inspect
+import multiprocessing
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import NamedTuple
+
+QUALITY_FLAGS = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+
+class UsageError(ValueError):
+    """调用方给出的参数有误（场景名、渲染质量、参数网格等）
+
+    命令行只把这一类错误报告为用法错误，场景与数值代码中的其他异常照常抛出。
+    """
+
+
+class SceneSpec(NamedTuple):
+    file: Path
+    name: str
+
+
+class RenderJob(NamedTuple):
+    scene: SceneSpec
+    quality: str
+    media_dir: Path
+    config: dict | None = None
+    encoder: object = None      # streaming.EncoderSettings
+    incremental: bool = False   # 用 incremental.PlayHasher 计算 play 的缓存键
+
+
+class RenderResult(NamedTuple):
+    scene: SceneSpec
+    quality: str
+    seconds: float
+    output: Path | None
+    error: str | None = None
+    plays: tuple = ()           # incremental.PlayRecord，仅 incremental 任务
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def parse_quality(value):
+    """接受 l/m/h/p/k 或完整的 *_quality 名称"""
+    quality = QUALITY_FLAGS.get(value, value)
+    if quality not in QUALITY_FLAGS.values():
+        raise UsageError(f"未知的渲染质量 {value!r}，可选 {', '.join(QUALITY_FLAGS)}")
+    return quality
+
+
+def discover_scenes(directory, names=None):
+    """找出目录下所有 *Scene 子类，按文件名、定义顺序排列
+
+    只看类定义的基类名是否以 Scene 结尾（Scene、ThreeDScene 等），不执行文件。
+    names 给定时只保留其中的场景，并检查是否都存在。
+    """
+    scenes = []
+    for file in sorted(Path(directory).glob("*.py")):
+        tree = ast.parse(file.read_text(encoding="utf-8"), filename=str(file))
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and any(
+                _base_name(base).endswith("Scene") for base in node.bases
+            ):
+                scenes.append(SceneSpec(file, node.name))
+    if names:
+        missing = set(names) - {s.name for s in scenes}
+        if missing:
+            raise UsageError(f"找不到场景：{', '.join(sorted(missing))}")
+        scenes = [s for s in scenes if s.name in names]
+    return scenes
+
+
+def _base_name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return ""
+
+
+def load_scene_class(spec):
+    """按 manim 的方式导入场景文件：文件所在目录加入 sys.path"""
+    file = Path(spec.file).resolve()
+    module_name = "manim_demo_scene_" + hashlib.sha1(str(file).encode()).hexdigest()[:12]
+    module = sys.modules.get(module_name)
+    if module is None:
+        if str(file.parent) not in sys.path:
+            sys.path.insert(0, str(file.parent))
+        module_spec = importlib.util.spec_from_file_location(module_name, file)
+        module = importlib.util.module_from_spec(module_spec)
+        sys.modules[module_name] = module
+        module_spec.loader.exec_module(module)
+    return getattr(module, spec.name)
+
+
+def camera_class(scene_cls):
+    """场景使用的相机类：ThreeDScene 等在 __init__ 的默认参数里指定，这里按 MRO 找出来"""
+    for cls in scene_cls.__mro__:
+        init = cls.__dict__.get("__init__")
+        if init is None:
+            continue
+        param = inspect.signature(init).parameters.get("camera_class")
+        if param is not None and param.default is not inspect.Parameter.empty:
+            return param.default
+    from manim import Camera
+
+    return Camera
+
+
+def render_scene(spec, quality="low_quality", media_dir=None, config_overrides=None, random_seed=None, encoder=None):
+    """在当前进程中渲染一个场景，返回生成的视频文件路径
+
+    random_seed 会传给 Scene，在 construct 之前同时设置 random 与 numpy 的种子。
+    encoder 为 streaming.EncoderSettings 时，所有帧推给同一个编码器直接写出整段视频。
+    """
+    from manim import config, tempconfig
+
+    overrides = {"input_file": str(spec.file), **(config_overrides or {})}
+    if media_dir is not None:
+        overrides["media_dir"] = str(media_dir)
+    if encoder is not None:
+        overrides["disable_caching"] = True
+    with tempconfig(overrides):
+        config.quality = quality
+        scene_cls = load_scene_class(spec)
+        if encoder is None:
+            scene = scene_cls(random_seed=random_seed)
+        else:
+            from .streaming import streaming_renderer
+
+            scene = scene_cls(renderer=streaming_renderer(scene_cls, encoder), random_seed=random_seed)
+        scene.render()
+        return Path(scene.renderer.file_writer.movie_file_path)
+
+
+def _run_job(job):
+    start = time.perf_counter()
+    try:
+        if job.incremental:
+            from .incremental import PlayHasher
+
+            with PlayHasher() as hasher:
+                output = render_scene(job.scene, job.quality, job.media_dir, job.config)
+            return RenderResult(
+                job.scene, job.quality, time.perf_counter() - start, output, plays=tuple(hasher.records),
+            )
+        output = render_scene(job.scene, job.quality, job.media_dir, job.config, encoder=job.encoder)
+        return RenderResult(job.scene, job.quality, time.perf_counter() - start, output)
+    except Exception:
+        return RenderResult(
+            job.scene, job.quality, time.perf_counter() - start, None, traceback.format_exc(),
+        )
+
+
+def run_jobs(jobs, max_workers=None, on_result=None):
+    """用进程池并行执行渲染任务，返回与 jobs 顺序一致的结果列表
+
+    使用 spawn 启动子进程，避免 fork 继承父进程里 manim 的全局配置与缓存。
+    on_result(result) 在每个任务完成时调用，可用于打印进度。
+    """
+    jobs = list(jobs)
+    results = [None] * len(jobs)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+        futures = {pool.submit(_run_job, job): i for i, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            if on_result is not None:
+                on_result(result)
+    return results
+
+
+def format_summary(results, wall_time=None):
+    """每个场景一行：名称、质量、耗时、状态或输出文件"""
+    width = max([len(r.scene.name) for r in results] + [5])
+    lines = [f"{'scene':<{width}}  {'quality':<18}  {'seconds':>8}  output"]
+    for r in results:
+        status = str(r.output) if r.ok else "FAILED: " + r.error.strip().splitlines()[-1]
+        lines.append(f"{r.scene.name:<{width}}  {r.quality:<18}  {r.seconds:>8.1f}  {status}")
+    total = sum(r.seconds for r in results)
+    footer = f"{len(results)} scenes, {sum(not r.ok for r in results)} failed, {total:.1f}s scene time"
+    if wall_time is not None:
+        footer += f", {wall_time:.1f}s wall time"
+    lines.append(footer)
+    return "\n".join(lines)
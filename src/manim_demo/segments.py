@@ -0,0 +1,146 @@
+"""把单个长场景拆成若干段并行渲染
+
+做法基于 manim 自带的 from_animation_number / upto_animation_number：
+每个工作进程都从头执行 construct，但在自己负责的区间之前跳过光栅化。
+manim 跳过的 play 只做一次 update_to_time(run_time)，按 dt 累加的 updater
+会因此走一大步；这里让跳过的 play 仍按帧率逐帧推进 updater（只是不画帧），
+dt 序列与顺序渲染相同，到达区间起点时的物体状态也就相同；
+随后只渲染区间内的 play 并合成该段视频。
+最后用 concat 分离器直接拼接各段的压缩数据包，不重新编码。
+
+各进程使用相同的 random_seed，保证含随机数的场景在每个进程里得到相同的状态。
+"""
+import multiprocessing
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from .render import load_scene_class
+
+
+def measure_plays(spec, random_seed=0):
+    """不渲染任何帧地执行一遍场景，返回每次 play / wait 的时长"""
+    from manim import config, tempconfig
+
+    durations = []
+    scene_cls = load_scene_class(spec)
+
+    class Timed(scene_cls):
+        def play(self, *args, **kwargs):
+            super().play(*args, **kwargs)
+            durations.append(self.duration or 0.0)
+
+    Timed.__name__ = scene_cls.__name__
+    with tempconfig({"write_to_movie": False, "save_last_frame": False, "disable_caching": True}):
+        config.quality = "low_quality"
+        Timed(random_seed=random_seed, skip_animations=True).render()
+    return durations
+
+
+def split_segments(durations, n):
+    """按累计时长把 play 序列切成至多 n 段连续区间 [start, end)，各段时长尽量相等"""
+    durations = np.asarray(durations, dtype=float)
+    n = max(1, min(n, len(durations)))
+    cumulative = np.cumsum(durations)
+    targets = cumulative[-1] * np.arange(1, n) / n
+    cuts = np.searchsorted(cumulative, targets, side="left") + 1
+    bounds = np.unique(np.concatenate([[0], cuts, [len(durations)]]))
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def stepped_class(scene_cls):
+    """跳过的 play 也逐帧调用 update_to_time 的子类，只是不光栅化"""
+
+    class Stepped(scene_cls):
+        def get_time_progression(self, run_time, description, n_iterations=None, override_skip_animations=False):
+            return super().get_time_progression(run_time, description, n_iterations, override_skip_animations=True)
+
+        def play_internal(self, skip_rendering=False):
+            skipped = self.renderer.skip_animations
+            super().play_internal(skip_rendering=skip_rendering or skipped)
+            if skipped:
+                # 顺序渲染在 play 结束后还会以 dt=0 调用一次 updater
+                self.update_mobjects(0)
+
+    Stepped.__name__ = scene_cls.__name__
+    return Stepped
+
+
+def render_segment(spec, quality, media_dir, start, end, random_seed=0, config_overrides=None):
+    """在当前进程中只渲染第 start 到 end - 1 次 play，返回该段视频路径"""
+    from manim import config, tempconfig
+
+    overrides = {
+        "input_file": str(spec.file),
+        **(config_overrides or {}),
+        "media_dir": str(media_dir),
+        "from_animation_number": start,
+        "upto_animation_number": end - 1,
+        "disable_caching": True,
+    }
+    with tempconfig(overrides):
+        config.quality = quality
+        scene = stepped_class(load_scene_class(spec))(random_seed=random_seed)
+        scene.render()
+        return Path(scene.renderer.file_writer.movie_file_path)
+
+
+def _render_segment(args):
+    return render_segment(*args)
+
+
+def concat_movies(files, output):
+    """无损拼接编码参数相同的视频文件（只复制数据包，不重新编码）"""
+    import av
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    file_list = output.with_suffix(".txt")
+    file_list.write_text(
+        "".join(f"file 'file:{Path(f).resolve().as_posix()}'\n" for f in files),
+        encoding="utf-8",
+    )
+    try:
+        with av.open(str(file_list), format="concat", options={"safe": "0", "an": "1"}) as source:
+            in_stream = source.streams.video[0]
+            with av.open(str(output), mode="w") as target:
+                out_stream = target.add_stream(template=in_stream)
+                for packet in source.demux(in_stream):
+                    if packet.dts is None:
+                        continue
+                    # 各段的 dts 各自从 0 开始，交给 libav 重新计算
+                    packet.dts = None
+                    packet.stream = out_stream
+                    target.mux(packet)
+    finally:
+        file_list.unlink(missing_ok=True)
+    return output
+
+
+def render_segmented(spec, quality="low_quality", output_dir="media/segments", segments=None, jobs=None, random_seed=0, keep_parts=False, config_overrides=None):
+    """分段并行渲染一个场景，返回最终视频路径
+
+    segments 默认等于 jobs（再默认为 CPU 核数）；段数不会超过 play 的次数。
+    config_overrides 会传给每个分段进程。
+    """
+    jobs = jobs or multiprocessing.cpu_count()
+    durations = measure_plays(spec, random_seed)
+    bounds = split_segments(durations, segments or jobs)
+
+    output_dir = Path(output_dir)
+    work_dir = Path(tempfile.mkdtemp(prefix=f"{spec.name}-", dir=output_dir if output_dir.exists() else None))
+    tasks = [
+        (spec, quality, work_dir / f"segment_{i:03d}", start, end, random_seed, config_overrides)
+        for i, (start, end) in enumerate(bounds)
+    ]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+        parts = list(pool.map(_render_segment, tasks))
+
+    output = concat_movies(parts, output_dir / f"{spec.name}{parts[0].suffix}")
+    if not keep_parts:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return output
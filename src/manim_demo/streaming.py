@@ -0,0 +1,201 @@
+"""把帧直接推给一个常驻编码器的输出方式
+
+manim 默认每次 play 打开一个新的编码器写一个 partial movie 文件，
+场景结束后再把它们拼接成完整视频；帧通过无界队列交给编码线程，
+编码跟不上时每帧一份 pixel_array 的副本会一直堆积在内存里。
+
+StreamingFileWriter 在第一次 play 时打开唯一的编码器，一直用到场景结束，
+视频直接写到最终路径，没有 partial movie 文件和拼接步骤。
+帧缓冲是预先分配的 ring_size 个 (高, 宽, 4) 数组，循环使用：
+渲染线程把相机画面复制进空闲缓冲，编码线程编码完毕后再归还；
+没有空闲缓冲时渲染线程等待（背压），所以内存占用与场景长度、编码速度无关。
+
+因为不再有 partial movie 文件，流式输出不使用 manim 的按 play 缓存，也不支持 save_sections。
+"""
+import os
+import queue
+import threading
+import time
+from functools import partial
+from typing import NamedTuple
+
+import av
+import numpy as np
+from manim import config, logger
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter, to_av_frame_rate
+from manim.utils.file_ops import is_gif_format, is_png_format
+
+from .render import camera_class
+
+
+class EncoderSettings(NamedTuple):
+    preset: str = "medium"      # libx264 的 preset，ultrafast ... veryslow
+    crf: int = 23
+    ring_size: int = 4          # 帧缓冲个数
+    codec: str | None = None    # 默认与 manim 相同：mp4 用 libx264，webm 用 libvpx-vp9
+
+
+def _codec_options(settings):
+    """(编码器, 像素格式, 选项)，默认值与 manim 写 partial movie 时一致"""
+    codec, pix_fmt = "libx264", "yuv420p"
+    options = {"an": "1", "crf": str(settings.crf)}
+    if config.movie_file_extension == ".webm":
+        codec = "libvpx-vp9"
+        options["auto-alt-ref"] = "1"
+        if config.transparent:
+            pix_fmt = "yuva420p"
+    elif config.transparent:
+        codec, pix_fmt = "qtrle", "argb"
+        del options["crf"]
+    if codec == "libx264":
+        options["preset"] = settings.preset
+    return settings.codec or codec, pix_fmt, options
+
+
+class StreamingFileWriter(SceneFileWriter):
+    def __init__(self, renderer, scene_name, settings=EncoderSettings(), **kwargs):
+        super().__init__(renderer, scene_name, **kwargs)
+        self.settings = settings
+        self.container = None
+        self.frames = 0
+        self.stall_time = 0.0       # 渲染线程等待空闲缓冲的总时间（秒）
+        self._error = None
+
+    # ---- manim 的按 play 写文件接口：这里只保持下标对齐 ----
+
+    def add_partial_movie_file(self, hash_animation):
+        self.partial_movie_files.append(None)
+        self.sections[-1].partial_movie_files.append(None)
+
+    def is_already_cached(self, hash_invocation):
+        return False
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        if allow_write and self.container is None and self._writes_movie():
+            self.open_stream()
+
+    def end_animation(self, allow_write=False):
+        pass
+
+    def _writes_movie(self):
+        return config.write_to_movie and not is_gif_format() and not is_png_format()
+
+    # ---- 编码线程 ----
+
+    def open_stream(self):
+        codec, pix_fmt, options = _codec_options(self.settings)
+        self.stream_path = self.movie_file_path.with_name(
+            f"{self.movie_file_path.stem}.part{self.movie_file_path.suffix}"
+        )
+        self.container = av.open(str(self.stream_path), mode="w")
+        self.video_stream = self.container.add_stream(codec, rate=to_av_frame_rate(config.frame_rate), options=options)
+        self.video_stream.pix_fmt = pix_fmt
+        self.video_stream.width = config.pixel_width
+        self.video_stream.height = config.pixel_height
+
+        shape = (config.pixel_height, config.pixel_width, 4)
+        self.ring = np.empty((self.settings.ring_size,) + shape, dtype=np.uint8)
+        self.free = queue.Queue()
+        for i in range(self.settings.ring_size):
+            self.free.put(i)
+        self.filled = queue.Queue()
+        self.encoder_thread = threading.Thread(target=self._encode_loop, name="manim-demo-encoder", daemon=True)
+        self.encoder_thread.start()
+
+    def _encode_loop(self):
+        try:
+            while True:
+                slot, num_frames = self.filled.get()
+                if slot is None:
+                    break
+                try:
+                    for _ in range(num_frames):
+                        # from_ndarray 会复制数据；av_frame 不能复用，见 SceneFileWriter.encode_and_write_frame
+                        av_frame = av.VideoFrame.from_ndarray(self.ring[slot], format="rgba")
+                        for packet in self.video_stream.encode(av_frame):
+                            self.container.mux(packet)
+                finally:
+                    self.free.put(slot)
+            for packet in self.video_stream.encode():
+                self.container.mux(packet)
+        except BaseException as e:
+            self._error = e
+            # 让渲染线程不会因为等不到空闲缓冲而卡住
+            for i in range(self.settings.ring_size):
+                self.free.put(i)
+
+    def _acquire(self):
+        try:
+            return self.free.get_nowait()
+        except queue.Empty:
+            pass
+        start = time.perf_counter()
+        slot = self.free.get()
+        self.stall_time += time.perf_counter() - start
+        return slot
+
+    def write_frame(self, frame_or_renderer, num_frames=1):
+        if self.container is None:
+            return super().write_frame(frame_or_renderer, num_frames)
+        if self._error is not None:
+            raise RuntimeError("视频编码线程出错") from self._error
+        slot = self._acquire()
+        np.copyto(self.ring[slot], frame_or_renderer)
+        self.filled.put((slot, num_frames))
+        self.frames += num_frames
+
+    def close_stream(self):
+        self.filled.put((None, 0))
+        self.encoder_thread.join()
+        self.container.close()
+        self.container = None
+        self.ring = None
+        if self._error is not None:
+            self.stream_path.unlink(missing_ok=True)
+            raise RuntimeError("视频编码线程出错") from self._error
+
+    # ---- 场景结束 ----
+
+    def combine_to_movie(self):
+        if self.container is None:
+            logger.info("No animations are contained in this scene.")
+            return
+        self.close_stream()
+        if self.includes_sound:
+            # 有声音时借用 manim 的合成流程：把整段视频当作唯一的 partial movie
+            self.partial_movie_files = [str(self.stream_path)]
+            super().combine_to_movie()
+            self.stream_path.unlink(missing_ok=True)
+        else:
+            os.replace(self.stream_path, self.movie_file_path)
+            self.print_file_ready_message(str(self.movie_file_path))
+        logger.info(
+            "Streamed %(frames)d frames, renderer waited %(stall).2fs for the encoder",
+            {"frames": self.frames, "stall": self.stall_time},
+        )
+
+    def clean_cache(self):
+        pass
+
+
+class StreamingRenderer(CairoRenderer):
+    """把相机的 pixel_array 直接交给 StreamingFileWriter，由它复制进帧缓冲，省去 get_frame 的一次复制"""
+
+    def render(self, scene, time, moving_mobjects):
+        self.update_frame(scene, moving_mobjects)
+        self.add_frame(self.camera.pixel_array)
+
+
+def streaming_renderer(scene_cls, settings=EncoderSettings()):
+    """按当前 config 为场景类创建流式输出的 renderer"""
+    if is_gif_format():
+        raise ValueError("流式输出不支持 gif")
+    if config.save_sections:
+        raise ValueError("流式输出不支持 save_sections")
+    if settings.ring_size < 1:
+        raise ValueError("ring_size 至少为 1")
+    return StreamingRenderer(
+        file_writer_class=partial(StreamingFileWriter, settings=settings),
+        camera_class=camera_class(scene_cls),
+    )
@@ -0,0 +1,414 @@
+"""由数组直接生成的曲面
+
+manim 的 Surface 对每个网格顶点（包括贝塞尔控制点）逐个调用 Python 函数；
+这里的 GridSurface 接收已经算好的高度数组，整批完成插值、裁剪和
+坐标变换，然后一次性生成全部面片的控制点。MeshSurface 则在
+manim_demo.tessellation 的四边形网格上求值，网格默认按曲面的弯曲程度自适应细分。
+"""
+import numpy as np
+from manim import BLUE_D, BLUE_E, LIGHT_GREY, ManimColor, Surface, ThreeDVMobject, VGroup
+
+from .geometry import line_beziers
+from .sweep import ParameterSweep
+from .tessellation import adaptive_mesh, uniform_mesh
+
+
+def bilinear_at(z, x, y, us, vs):
+    """在 (x, y) 网格（可非均匀）上对 z 做逐点双线性插值，us、vs 可广播成同一形状"""
+    z = np.asarray(z, dtype=float)
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    us, vs = np.broadcast_arrays(np.asarray(us, dtype=float), np.asarray(vs, dtype=float))
+    ix = np.clip(np.searchsorted(x, us, side="right") - 1, 0, len(x) - 2)
+    iy = np.clip(np.searchsorted(y, vs, side="right") - 1, 0, len(y) - 2)
+    tx = np.clip((us - x[ix]) / (x[ix + 1] - x[ix]), 0, 1)
+    ty = np.clip((vs - y[iy]) / (y[iy + 1] - y[iy]), 0, 1)
+    return (
+        (1 - tx) * (1 - ty) * z[ix, iy] + tx * (1 - ty) * z[ix + 1, iy]
+        + (1 - tx) * ty * z[ix, iy + 1] + tx * ty * z[ix + 1, iy + 1]
+    )
+
+
+def bilinear_sample(z, x, y, xs, ys):
+    """在 (x, y) 网格（可非均匀）上对 z 做双线性插值，返回 (len(xs), len(ys))"""
+    xs, ys = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+    return bilinear_at(z, x, y, xs[:, None], ys[None, :])
+
+
+def nearest_sample(z, x, y, xs, ys):
+    """取最近的数据点，返回 (len(xs), len(ys))"""
+    z = np.asarray(z, dtype=float)
+    ix = np.abs(np.subtract.outer(np.asarray(xs, dtype=float), x)).argmin(axis=1)
+    iy = np.abs(np.subtract.outer(np.asarray(ys, dtype=float), y)).argmin(axis=1)
+    return z[np.ix_(ix, iy)]
+
+
+def quad_corners(points):
+    """顶点网格 (nu+1, nv+1, 3) -> 每个面片的四个角 (nu*nv, 4, 3)，面片按 (i, j) 行优先排列"""
+    corners = np.stack(
+        [points[:-1, :-1], points[1:, :-1], points[1:, 1:], points[:-1, 1:]],
+        axis=2,
+    )
+    return corners.reshape(-1, 4, 3)
+
+
+class GridSurface(Surface):
+    """由二维高度数组 z[i, j]（对应 x[i], y[j]）直接生成的曲面
+
+    resolution 与数据分辨率不同时按 interpolation（"bilinear" 或 "nearest"）重采样；
+    clip 给定时把高度截断到 (lo, hi)；NaN、inf 以及超出 valid_range 的值
+    按 invalid 处理：为 "mask" 时去掉相关面片，为数值时替换成该值。
+    传入 axes 时 (x, y, z) 会整批经过 axes.c2p 转为场景坐标。
+    其余样式参数与 Surface 相同。
+    """
+
+    def __init__(
+        self,
+        z,
+        x=None,
+        y=None,
+        axes=None,
+        resolution=None,
+        interpolation="bilinear",
+        clip=None,
+        valid_range=None,
+        invalid="mask",
+        fill_color=BLUE_D,
+        fill_opacity=1.0,
+        checkerboard_colors=[BLUE_D, BLUE_E],
+        stroke_color=LIGHT_GREY,
+        stroke_width=0.5,
+        **kwargs,
+    ):
+        z = np.asarray(z, dtype=float)
+        self.data_x = np.arange(z.shape[0], dtype=float) if x is None else np.asarray(x, dtype=float)
+        self.data_y = np.arange(z.shape[1], dtype=float) if y is None else np.asarray(y, dtype=float)
+        self.data_z = z
+        self.interpolation = interpolation
+        self._init_surface(
+            [self.data_x[0], self.data_x[-1]],
+            [self.data_y[0], self.data_y[-1]],
+            axes, clip, valid_range, invalid,
+            fill_color, fill_opacity, checkerboard_colors, stroke_color, stroke_width,
+            **kwargs,
+        )
+        self.resolution = resolution or (len(self.data_x) - 1, len(self.data_y) - 1)
+
+        u_values, v_values = self._get_u_values_and_v_values()
+        heights, valid = self.clean_heights(self.sample(u_values, v_values))
+        points = self.to_points(*np.meshgrid(u_values, v_values, indexing="ij"), heights)
+        face_mask = valid[:-1, :-1] & valid[1:, :-1] & valid[1:, 1:] & valid[:-1, 1:]
+        self._setup_faces(u_values, v_values, points, face_mask)
+
+    def _init_surface(
+        self, u_range, v_range, axes, clip, valid_range, invalid,
+        fill_color, fill_opacity, checkerboard_colors, stroke_color, stroke_width, **kwargs,
+    ):
+        # Surface.__init__ 会逐点调用 func 生成面片，这里只设置它的属性
+        self.axes = axes
+        self.clip = clip
+        self.valid_range = valid_range
+        self.invalid = invalid
+        self.u_range = list(u_range)
+        self.v_range = list(v_range)
+        VGroup.__init__(self, **kwargs)
+        self.surface_piece_config = {}
+        self.fill_color = ManimColor(fill_color)
+        self.fill_opacity = fill_opacity
+        if checkerboard_colors:
+            self.checkerboard_colors = [ManimColor(c) for c in checkerboard_colors]
+        else:
+            self.checkerboard_colors = checkerboard_colors
+        self.stroke_color = ManimColor(stroke_color)
+        self.stroke_width = stroke_width
+        self.should_make_jagged = False
+        self._func = self._point_at
+
+    @classmethod
+    def from_function(cls, func, u_range, v_range, resolution=32, axes=None, **kwargs):
+        """在网格上整批求值 func(U, V)（须接受数组），再生成曲面"""
+        u_res, v_res = (resolution, resolution) if np.isscalar(resolution) else resolution
+        u = np.linspace(*u_range, u_res + 1)
+        v = np.linspace(*v_range, v_res + 1)
+        z = np.asarray(func(*np.meshgrid(u, v, indexing="ij")), dtype=float)
+        return cls(z, x=u, y=v, axes=axes, resolution=(u_res, v_res), **kwargs)
+
+    def sample(self, u_values, v_values):
+        if (
+            len(u_values) == len(self.data_x) and np.allclose(u_values, self.data_x)
+            and len(v_values) == len(self.data_y) and np.allclose(v_values, self.data_y)
+        ):
+            return self.data_z.copy()
+        if self.interpolation == "nearest":
+            return nearest_sample(self.data_z, self.data_x, self.data_y, u_values, v_values)
+        return bilinear_sample(self.data_z, self.data_x, self.data_y, u_values, v_values)
+
+    def clean_heights(self, heights):
+        """按 clip / valid_range / invalid 处理高度，返回 (高度, 有效顶点掩码)"""
+        valid = np.isfinite(heights)
+        if self.valid_range is not None:
+            lo, hi = self.valid_range
+            with np.errstate(invalid="ignore"):
+                valid &= (heights >= lo) & (heights <= hi)
+        if self.invalid != "mask":
+            heights = np.where(valid, heights, self.invalid)
+            valid = np.ones_like(valid)
+        if self.clip is not None:
+            heights = np.clip(heights, *self.clip)
+        return np.where(valid, heights, 0), valid
+
+    def to_points(self, u, v, heights):
+        coords = np.stack(np.broadcast_arrays(u, v, heights), axis=-1)
+        if self.axes is None:
+            return coords
+        flat = np.asarray(self.axes.c2p(coords.reshape(-1, 3)), dtype=float)
+        return flat.reshape(coords.shape)
+
+    def _point_at(self, u, v):
+        heights, _ = self.clean_heights(self.sample([u], [v]))
+        return self.to_points(np.array(u), np.array(v), heights[0, 0])
+
+    def _setup_faces(self, u_values, v_values, points, face_mask):
+        index = np.argwhere(face_mask)
+        i, j = index.T
+        cells = np.stack([u_values[i], u_values[i + 1], v_values[j], v_values[j + 1]], axis=1)
+        self._add_faces(quad_corners(points)[face_mask.ravel()], cells, index)
+
+    def _add_faces(self, corners, cells, index):
+        """corners (N, 4, 3) 为面片四角，cells 为 (u1, u2, v1, v2)，index 为棋盘格着色用的 (i, j)"""
+        beziers = line_beziers(corners, closed=True)
+        faces = VGroup()
+        for (i, j), (u1, u2, v1, v2), face_points in zip(index, cells, beziers):
+            face = ThreeDVMobject()
+            face.points = face_points
+            face.u_index, face.v_index = i, j
+            face.u1, face.u2 = u1, u2
+            face.v1, face.v2 = v1, v2
+            faces.add(face)
+        faces.set_fill(color=self.fill_color, opacity=self.fill_opacity)
+        faces.set_stroke(
+            color=self.stroke_color,
+            width=self.stroke_width,
+            opacity=self.stroke_opacity,
+        )
+        self.add(*faces)
+        if self.checkerboard_colors:
+            self.set_fill_by_checkerboard(*self.checkerboard_colors)
+
+
+class MeshSurface(GridSurface):
+    """在四边形网格上由 func(U, V)（须接受数组）生成的曲面
+
+    mesh 缺省时用 tessellation.adaptive_mesh 自适应细分：从 base_resolution 的均匀网格出发，
+    把在屏幕上偏离平面超过 tolerance 像素的面片一分为四，总数不超过 max_faces。
+    平坦处面片大、陡峭处面片小，同样的面片数比均匀网格更贴近曲面。
+    传入 tessellation.uniform_mesh(...) 则为普通的均匀网格。
+    clip、valid_range、invalid、axes 以及样式参数与 GridSurface 相同。
+    data_z 是各顶点（mesh.u, mesh.v）处的高度。
+    """
+
+    def __init__(
+        self,
+        func,
+        u_range,
+        v_range,
+        mesh=None,
+        axes=None,
+        base_resolution=8,
+        max_faces=1024,
+        tolerance=1.0,
+        max_depth=6,
+        clip=None,
+        valid_range=None,
+        invalid="mask",
+        fill_color=BLUE_D,
+        fill_opacity=1.0,
+        checkerboard_colors=[BLUE_D, BLUE_E],
+        stroke_color=LIGHT_GREY,
+        stroke_width=0.5,
+        **kwargs,
+    ):
+        self.height_func = func
+        self._init_surface(
+            u_range, v_range, axes, clip, valid_range, invalid,
+            fill_color, fill_opacity, checkerboard_colors, stroke_color, stroke_width,
+            **kwargs,
+        )
+        self.resolution = (base_resolution, base_resolution) if np.isscalar(base_resolution) else base_resolution
+        if mesh is None:
+            mesh = adaptive_mesh(
+                self._measure, u_range, v_range, base_resolution, max_faces, tolerance, max_depth=max_depth,
+            )
+        self.mesh = mesh
+
+        self.data_z, valid = self.vertex_heights(self.evaluate(mesh.u, mesh.v))
+        points = self.to_points(mesh.u, mesh.v, self.data_z)
+        face_mask = valid[mesh.faces].all(axis=1)
+        self._add_faces(mesh.corners(points)[face_mask], mesh.cells[face_mask], mesh.index[face_mask])
+
+    @classmethod
+    def from_function(cls, func, u_range, v_range, resolution=32, axes=None, **kwargs):
+        """均匀网格"""
+        return cls(func, u_range, v_range, mesh=uniform_mesh(u_range, v_range, resolution), axes=axes, **kwargs)
+
+    @classmethod
+    def from_data(cls, z, x, y, **kwargs):
+        """由 z[i, j]（对应 x[i], y[j]）的双线性插值生成曲面，网格按数据的起伏细分"""
+        x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+        return cls(lambda U, V: bilinear_at(z, x, y, U, V), [x[0], x[-1]], [y[0], y[-1]], **kwargs)
+
+    def evaluate(self, u, v):
+        return np.asarray(self.height_func(u, v), dtype=float)
+
+    def vertex_heights(self, heights):
+        """clean_heights 之后再把悬挂顶点移到相邻粗面片的边上；无效顶点经插值传给依赖它的顶点"""
+        heights, valid = self.clean_heights(heights)
+        heights = self.mesh.conform(np.where(valid, heights, np.nan))
+        valid = np.isfinite(heights)
+        return np.where(valid, heights, 0), valid
+
+    def _measure(self, U, V):
+        # 自适应细分时的误差估计：无效值记为 NaN，交界处会被加密
+        heights, valid = self.clean_heights(self.evaluate(U, V))
+        return self.to_points(U, V, np.where(valid, heights, np.nan))
+
+    def _point_at(self, u, v):
+        heights, _ = self.clean_heights(self.evaluate(np.array([u]), np.array([v])))
+        return self.to_points(np.array(u), np.array(v), heights[0])
+
+
+class DeformableSurface(MeshSurface):
+    """拓扑固定、只随参数改变形状的曲面
+
+    func(U, V, p) 对全部顶点一次性返回高度数组。set_parameter(p) 只重算
+    顶点高度并把新的控制点写回已有面片，不新建 Surface、也不调用 become。
+    因为面片数量必须固定，invalid 不能为 "mask"，无效值统一替换成 invalid。
+    color_func(p) 给定时，每次更新参数会把所有面片填充成同一颜色。
+    precompute(values) 之后，参数值落在扫描上的帧直接读取缓存的高度。
+
+    默认是 resolution 的均匀网格；adaptive 给出一组参数值时，网格按这些参数下的
+    最大误差自适应细分（max_faces、tolerance 等见 MeshSurface），之后保持不变。
+    """
+
+    def __init__(
+        self,
+        func,
+        u_range,
+        v_range,
+        resolution=32,
+        parameter=0.0,
+        color_func=None,
+        invalid=0.0,
+        axes=None,
+        adaptive=None,
+        **kwargs,
+    ):
+        if invalid == "mask":
+            raise ValueError("DeformableSurface 的面片数量固定，invalid 不能为 'mask'")
+        self.deform_func = func
+        self.color_func = color_func
+        self.parameter = parameter
+        self.sweep = None
+        self.adaptive = None if adaptive is None else np.atleast_1d(np.asarray(adaptive, dtype=float))
+        mesh = uniform_mesh(u_range, v_range, resolution) if adaptive is None else None
+        super().__init__(
+            None, u_range, v_range, mesh=mesh, axes=axes, invalid=invalid, **kwargs,
+        )
+        # 填充色缓冲区只分配一次，各面片的 fill_rgbas 引用其中的行
+        self._fill_rgbas = np.zeros((len(self.submobjects), 1, 4))
+        if color_func is not None:
+            self.set_uniform_fill(color_func(parameter))
+
+    def evaluate(self, u, v, parameter=None):
+        parameter = self.parameter if parameter is None else parameter
+        return np.asarray(self.deform_func(u, v, parameter), dtype=float)
+
+    def _measure(self, U, V):
+        # 参数轴放在最前面，按各参数下的最大误差细分
+        p = self.adaptive.reshape((-1,) + (1,) * np.ndim(U))
+        heights, valid = self.clean_heights(self.evaluate(U, V, p))
+        return self.to_points(U, V, np.where(valid, heights, np.nan))
+
+    def precompute(self, values, cache=None):
+        """对一组参数值整体求值并缓存（见 manim_demo.sweep），func 需支持数组参数"""
+        self.sweep = ParameterSweep.compute(self.deform_func, (self.mesh.u, self.mesh.v), values, cache)
+        return self
+
+    def set_parameter(self, value):
+        self.parameter = value
+        heights = None if self.sweep is None else self.sweep.get(value)
+        if heights is None:
+            heights = self.evaluate(self.mesh.u, self.mesh.v, value)
+        self.data_z, _ = self.vertex_heights(heights)
+        points = self.to_points(self.mesh.u, self.mesh.v, self.data_z)
+        beziers = line_beziers(self.mesh.corners(points), closed=True)
+        for face, face_points in zip(self.submobjects, beziers):
+            face.points = face_points
+        if self.color_func is not None:
+            self.set_uniform_fill(self.color_func(value))
+        return self
+
+    def set_uniform_fill(self, color):
+        self._fill_rgbas[:, 0, :3] = ManimColor(color).to_rgb()
+        self._fill_rgbas[:, 0, 3] = self.fill_opacity
+        for face, rgba in zip(self.submobjects, self._fill_rgbas):
+            face.fill_rgbas = rgba
+        return self
+
+
+def bilinear_corners(corners, s, t):
+    """在每个面片四角 (N, 4, 3) 围成的双线性片上取参数 (s, t) 处的点，s、t 形状 (N,)"""
+    p00, p10, p11, p01 = (corners[:, k] for k in range(4))
+    s, t = s[:, None], t[:, None]
+    return (1 - s) * (1 - t) * p00 + s * (1 - t) * p10 + s * t * p11 + (1 - s) * t * p01
+
+
+class RevealedSurface(GridSurface):
+    """整张网格只求值一次，之后只显示参数窗口 [u_min, u_max] × [v_min, v_max] 内的部分
+
+    set_window 不会重新求值函数：完全在窗口内的面片保持原样，
+    跨越窗口边界的面片在其自身的双线性片上按边界精确裁剪，
+    完全在窗口外的面片收缩成一个点。每次只改写状态发生变化的面片。
+    """
+
+    def __init__(self, z, x=None, y=None, window=None, **kwargs):
+        super().__init__(z, x=x, y=y, **kwargs)
+        faces = self.submobjects
+        self._full_corners = np.array([face.points[[0, 4, 8, 12]] for face in faces]).reshape(-1, 4, 3)
+        self._cells = np.array([[f.u1, f.u2, f.v1, f.v2] for f in faces], dtype=float).reshape(-1, 4)
+        self._shown_corners = self._full_corners.copy()
+        self.window = (self.u_range[0], self.u_range[1], self.v_range[0], self.v_range[1])
+        if window is not None:
+            self.set_window(*window)
+
+    def set_window(self, u_max, v_max, u_min=None, v_min=None):
+        u_min = self.u_range[0] if u_min is None else u_min
+        v_min = self.v_range[0] if v_min is None else v_min
+        self.window = (u_min, u_max, v_min, v_max)
+
+        u1, u2, v1, v2 = self._cells.T
+        s0 = np.clip((u_min - u1) / (u2 - u1), 0, 1)
+        s1 = np.clip((u_max - u1) / (u2 - u1), 0, 1)
+        t0 = np.clip((v_min - v1) / (v2 - v1), 0, 1)
+        t1 = np.clip((v_max - v1) / (v2 - v1), 0, 1)
+        visible = (s1 > s0) & (t1 > t0)
+
+        full = self._full_corners
+        corners = np.stack(
+            [
+                bilinear_corners(full, s0, t0),
+                bilinear_corners(full, s1, t0),
+                bilinear_corners(full, s1, t1),
+                bilinear_corners(full, s0, t1),
+            ],
+            axis=1,
+        )
+        # 窗口外的面片收缩到一个点，既不填充也不描边
+        corners[~visible] = corners[~visible, :1]
+
+        changed = np.flatnonzero(np.any(corners != self._shown_corners, axis=(1, 2)))
+        if changed.size:
+            beziers = line_beziers(corners[changed], closed=True)
+            for i, face_points in zip(changed, beziers):
+                self.submobjects[i].points = face_points
+            self._shown_corners[changed] = corners[changed]
+        return self
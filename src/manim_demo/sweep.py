@@ -0,0 +1,68 @@
+"""参数扫描的预计算缓存
+
+动画里参数按已知的 rate_func 从 start 变到 end 时，每一帧的参数值事先就能算出。
+这里把整个扫描一次性向量化求值成 (参数数,) + 网格形状的数组，
+存进 manim_demo.cache 的缓存目录并以内存映射方式读取；渲染时按参数值取出对应的切片。
+
+缓存键由函数（源码与闭包中的值）、网格和参数序列决定，
+所以换渲染质量或相机路径重新渲染时不会重复计算。默认的扫描帧率是
+manim 各质量档帧率的最小公倍数，任一质量的帧时刻都落在扫描的采样点上。
+"""
+import math
+from functools import reduce
+
+import numpy as np
+from manim.constants import QUALITIES
+
+from .cache import ArrayCache, cache_key
+
+SWEEP_FRAME_RATE = reduce(math.lcm, {q["frame_rate"] for q in QUALITIES.values()})
+
+
+def sweep_values(start, end, run_time, frame_rate=SWEEP_FRAME_RATE, rate_func=None):
+    """按 Scene.play 的方式给出每一帧的参数值（含动画结束时的 end）"""
+    times = np.arange(0, run_time, 1 / frame_rate)
+    alphas = times / run_time
+    if rate_func is not None:
+        alphas = np.array([rate_func(a) for a in alphas])
+    return np.append(start + (end - start) * alphas, end)
+
+
+class ParameterSweep:
+    """func(U, V, p) 在一组参数值上的全部结果，heights[i] 对应 values[i]"""
+
+    def __init__(self, values, heights):
+        self.values = np.asarray(values, dtype=float)
+        self.heights = heights
+        self._order = np.argsort(self.values, kind="stable")
+        self._sorted = self.values[self._order]
+
+    @classmethod
+    def compute(cls, func, grid, values, cache=None, chunk=64):
+        """读取或生成缓存；func 需要能接收带参数轴的广播数组"""
+        values = np.asarray(values, dtype=float)
+        U, V = (np.asarray(g, dtype=float) for g in grid)
+
+        def fill(out):
+            # 参数轴放在最前面整块广播求值，按块写入避免一次占用过多内存
+            for i in range(0, len(values), chunk):
+                p = values[i:i + chunk].reshape((-1,) + (1,) * U.ndim)
+                out[i:i + chunk] = np.broadcast_to(func(U, V, p), (len(p),) + U.shape)
+
+        cache = cache or ArrayCache()
+        key = cache_key("sweep", func, U, V, values)
+        return cls(values, cache.memmap(key, (len(values),) + U.shape, fill))
+
+    def index(self, value, tol=1e-9):
+        """与 value 相等（容差 tol × 参数范围）的采样下标，不存在时返回 None"""
+        i = np.searchsorted(self._sorted, value)
+        scale = tol * max(1.0, np.ptp(self._sorted))
+        for j in (i - 1, i):
+            if 0 <= j < len(self._sorted) and abs(self._sorted[j] - value) <= scale:
+                return int(self._order[j])
+        return None
+
+    def get(self, value):
+        """返回对应切片；不是扫描中的参数值时返回 None"""
+        i = self.index(value)
+        return None if i is None else self.heights[i]
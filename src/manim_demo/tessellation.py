@@ -0,0 +1,208 @@
+"""曲面的四边形网格：均匀网格与按误差自适应细分的四叉树网格
+
+adaptive_mesh 从一个较粗的均匀网格出发，估计每个面片用平面四边形近似曲面的误差
+（面片中心与四条边中点处，真实位置与四角双线性插值的距离），
+误差超过 tolerance 像素的面片一分为四，误差大的优先，直到没有需要细分的面片、
+面片数达到 max_faces，或面片在屏幕上已经小于 min_size 像素。
+平坦的区域保持粗网格，陡峭处（比如对数在原点附近）自动加密。
+
+相邻面片层级不同时，细面片在粗面片边上的顶点（悬挂顶点）会让曲面出现裂缝。
+QuadMesh.conform 把这些顶点的高度改成粗边两端的线性插值，使它们正好落在粗边上。
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+
+class QuadMesh(NamedTuple):
+    u: np.ndarray           # (V,) 顶点的参数坐标
+    v: np.ndarray
+    faces: np.ndarray       # (N, 4) 顶点下标，顺序与 surfaces.quad_corners 相同
+    cells: np.ndarray       # (N, 4) 每个面片的 u1, u2, v1, v2
+    index: np.ndarray       # (N, 2) 面片在所在层级网格中的 (i, j)，用于棋盘格着色
+    snaps: tuple            # 悬挂顶点 ((h, a, b, t), ...)，按层级从粗到细
+
+    def conform(self, z):
+        """悬挂顶点 h 的值改为 (1 - t) * z[a] + t * z[b]；顶点在最后一维，前面可以带参数轴"""
+        z = np.array(z, dtype=float)
+        for h, a, b, t in self.snaps:
+            z[..., h] = (1 - t) * z[..., a] + t * z[..., b]
+        return z
+
+    def corners(self, points):
+        """顶点坐标 (V, 3) -> 每个面片的四个角 (N, 4, 3)"""
+        return np.asarray(points)[self.faces]
+
+
+def _pair(value):
+    return (value, value) if np.isscalar(value) else tuple(value)
+
+
+def _leaf_bounds(level, i, j, max_depth):
+    # 叶子在最细层级整数坐标下的范围 [x0, x1] × [y0, y1]
+    size = 1 << (max_depth - level)
+    x0, y0 = i * size, j * size
+    return x0, x0 + size, y0, y0 + size
+
+
+def _to_uv(x, y, base, max_depth, u_range, v_range):
+    scale = 1 << max_depth
+    u = u_range[0] + (u_range[1] - u_range[0]) * x / (base[0] * scale)
+    v = v_range[0] + (v_range[1] - v_range[0]) * y / (base[1] * scale)
+    return u, v
+
+
+def _expand_ranges(starts, ends):
+    """把若干区间 [start, end) 展开成 (所属区间号, 下标)"""
+    counts = np.maximum(ends - starts, 0)
+    owner = np.repeat(np.arange(len(starts)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owner, starts[owner] + offsets
+
+
+def _hanging(keys_along, vertex_ids, x_along, line, lo, hi, a, b, level):
+    """在一组平行的边上找悬挂顶点
+
+    keys_along 是按 (line, along) 排序的顶点键，边位于坐标 line、沿线从 lo 到 hi，
+    两端顶点为 a、b。返回 (h, a, b, t, level)。
+    """
+    width = x_along.max() + 1
+    order = np.argsort(keys_along, kind="stable")
+    sorted_keys = keys_along[order]
+    starts = np.searchsorted(sorted_keys, line * width + lo, side="right")
+    ends = np.searchsorted(sorted_keys, line * width + hi, side="left")
+    edge, pos = _expand_ranges(starts, ends)
+    h = vertex_ids[order[pos]]
+    t = (x_along[h] - lo[edge]) / (hi[edge] - lo[edge])
+    return h, a[edge], b[edge], t, level[edge]
+
+
+def _build_mesh(level, i, j, base, max_depth, u_range, v_range):
+    x0, x1, y0, y1 = _leaf_bounds(level, i, j, max_depth)
+    order = np.lexsort((y0, x0))
+    level, i, j = level[order], i[order], j[order]
+    x0, x1, y0, y1 = x0[order], x1[order], y0[order], y1[order]
+
+    # 角点顺序与 quad_corners 一致：(u1, v1), (u2, v1), (u2, v2), (u1, v2)
+    corner_x = np.stack([x0, x1, x1, x0], axis=1)
+    corner_y = np.stack([y0, y0, y1, y1], axis=1)
+    height = int(corner_y.max()) + 1
+    unique, faces = np.unique((corner_x * height + corner_y).ravel(), return_inverse=True)
+    faces = faces.reshape(-1, 4)
+    vx, vy = unique // height, unique % height
+    ids = np.arange(len(unique))
+
+    # 水平边（下边、上边）和竖直边（左边、右边）内部的顶点都是悬挂顶点
+    rows = [
+        _hanging(vy * (vx.max() + 1) + vx, ids, vx, y, x0, x1, faces[:, a], faces[:, b], level)
+        for y, a, b in ((y0, 0, 1), (y1, 3, 2))
+    ] + [
+        _hanging(vx * (vy.max() + 1) + vy, ids, vy, x, y0, y1, faces[:, a], faces[:, b], level)
+        for x, a, b in ((x0, 0, 3), (x1, 1, 2))
+    ]
+    h, a, b, t, lv = (np.concatenate(parts) for parts in zip(*rows))
+    # 同一层级的悬挂顶点互不依赖，可以整批插值；粗层级先处理
+    snaps = tuple(
+        (h[lv == L], a[lv == L], b[lv == L], t[lv == L]) for L in np.unique(lv)
+    )
+
+    u, v = _to_uv(vx, vy, base, max_depth, u_range, v_range)
+    cu = _to_uv(np.stack([x0, x1]), np.stack([y0, y1]), base, max_depth, u_range, v_range)
+    cells = np.stack([cu[0][0], cu[0][1], cu[1][0], cu[1][1]], axis=1)
+    return QuadMesh(u, v, faces, cells, np.stack([i, j], axis=1), snaps)
+
+
+def uniform_mesh(u_range, v_range, resolution=32):
+    """nu × nv 的均匀网格"""
+    nu, nv = _pair(resolution)
+    i, j = (g.ravel() for g in np.meshgrid(np.arange(nu), np.arange(nv), indexing="ij"))
+    return _build_mesh(np.zeros(nu * nv, dtype=int), i, j, (nu, nv), 0, u_range, v_range)
+
+
+def _estimate(measure, cells):
+    """每个面片的 (近似误差, 最长边)，单位与 measure 返回的坐标相同"""
+    u1, u2, v1, v2 = cells.T
+    s = np.array([0.0, 0.5, 1.0])
+    U = u1[:, None, None] + (u2 - u1)[:, None, None] * s[None, :, None]
+    V = v1[:, None, None] + (v2 - v1)[:, None, None] * s[None, None, :]
+    U, V = np.broadcast_arrays(U, V)
+    points = np.asarray(measure(U, V), dtype=float)
+    # 可以带前置的参数轴：(P, N, 3, 3, 3)，统一成这个形状
+    points = points.reshape((-1,) + U.shape + (3,))
+
+    p00, p10 = points[:, :, 0, 0], points[:, :, 2, 0]
+    p01, p11 = points[:, :, 0, 2], points[:, :, 2, 2]
+    w = 1 - s
+    finite = np.isfinite(points).all(axis=-1)
+    with np.errstate(invalid="ignore"):
+        bilinear = (
+            w[:, None, None] * w[None, :, None] * p00[:, :, None, None]
+            + s[:, None, None] * w[None, :, None] * p10[:, :, None, None]
+            + w[:, None, None] * s[None, :, None] * p01[:, :, None, None]
+            + s[:, None, None] * s[None, :, None] * p11[:, :, None, None]
+        )
+        error = np.nanmax(np.linalg.norm(points - bilinear, axis=-1), axis=(2, 3), initial=0.0)
+        edges = np.stack([p10 - p00, p11 - p10, p11 - p01, p01 - p00], axis=-2)
+        size = np.nanmax(np.linalg.norm(edges, axis=-1), axis=-1, initial=0.0)
+    # 有效与无效区域的交界（如奇点附近）按无穷大误差处理，全部无效的面片不再细分
+    partial = finite.any(axis=(2, 3)) & ~finite.all(axis=(2, 3))
+    error = np.where(partial, np.inf, error).max(axis=0)
+    size = np.where(partial & (size == 0), np.inf, size).max(axis=0)
+    return error, size
+
+
+def adaptive_mesh(
+    measure,
+    u_range,
+    v_range,
+    base_resolution=8,
+    max_faces=1024,
+    tolerance=1.0,
+    min_size=2.0,
+    max_depth=6,
+    pixel_size=None,
+):
+    """按近似误差细分的四叉树网格
+
+    measure(U, V) 返回参数 (U, V) 处曲面在场景中的坐标 (..., 3)，须接受数组；
+    也可以在最前面多一个参数轴 (P, ..., 3)，此时按各参数下的最大误差细分，
+    用于形状随参数变化、但网格必须固定的曲面。
+    tolerance 与 min_size 以像素计，pixel_size 为一个像素对应的场景长度，
+    默认按 manim 当前的 frame_width / pixel_width 换算。
+    """
+    if pixel_size is None:
+        from manim import config
+
+        pixel_size = config.frame_width / config.pixel_width
+    base = _pair(base_resolution)
+    i, j = (g.ravel() for g in np.meshgrid(np.arange(base[0]), np.arange(base[1]), indexing="ij"))
+    level = np.zeros(len(i), dtype=int)
+
+    def cells_of(level, i, j):
+        x0, x1, y0, y1 = _leaf_bounds(level, i, j, max_depth)
+        (ua, ub), (va, vb) = _to_uv(np.stack([x0, x1]), np.stack([y0, y1]), base, max_depth, u_range, v_range)
+        return np.stack([ua, ub, va, vb], axis=1)
+
+    error, size = _estimate(measure, cells_of(level, i, j))
+    tolerance, min_size = tolerance * pixel_size, min_size * pixel_size
+    while True:
+        room = (max_faces - len(level)) // 3
+        split = np.flatnonzero((error > tolerance) & (size > 2 * min_size) & (level < max_depth))
+        if room <= 0 or split.size == 0:
+            break
+        if split.size > room:
+            split = split[np.argsort(-error[split], kind="stable")[:room]]
+        keep = np.ones(len(level), dtype=bool)
+        keep[split] = False
+        di = np.array([0, 1, 0, 1])
+        dj = np.array([0, 0, 1, 1])
+        child_level = np.repeat(level[split] + 1, 4)
+        child_i = (2 * i[split][:, None] + di).ravel()
+        child_j = (2 * j[split][:, None] + dj).ravel()
+        child_error, child_size = _estimate(measure, cells_of(child_level, child_i, child_j))
+        level = np.concatenate([level[keep], child_level])
+        i = np.concatenate([i[keep], child_i])
+        j = np.concatenate([j[keep], child_j])
+        error = np.concatenate([error[keep], child_error])
+        size = np.concatenate([size[keep], child_size])
+    return _build_mesh(level, i, j, base, max_depth, u_range, v_range)
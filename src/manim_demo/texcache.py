@@ -0,0 +1,311 @@
+"""LaTeX 批量预编译与跨场景共享的 Tex 缓存
+
+manim 以完整 tex 源码的哈希命名 Tex 目录下的 svg，文件已存在时直接复用。
+这里把所有渲染进程的 tex_dir 指向同一个缓存目录，使这个命名天然成为
+内容寻址缓存；预编译阶段先收集场景用到的全部公式，再把它们放进同一个
+多页 LaTeX 文档里只编译一次，用 dvisvgm 按页拆成各自的 svg 写入缓存。
+每组的第一个公式同时按 manim 的方式单独编译，两者的尺寸（viewBox、width、height，
+也就包含了基线位置）不一致时，整组改为逐个编译，保证缓存中的 svg 与单独编译的相同。
+
+收集公式时用 dryrun.DryRunRenderer 试运行场景（逐帧推进 updater，但不光栅化），
+并替换 tex_mobject 中的 tex_to_svg_file：缓存命中直接返回，未命中则记录下来并返回
+一个占位 svg。always_redraw 与 updater 中每帧重建的公式（比如随 ValueTracker 变化的数值标签）
+也因此都能收集到；这类公式与帧时刻有关，所以要按正式渲染的质量（帧率）收集。
+若场景因占位图形（例如按下标取公式的某一部分）中途出错，就先编译已收集到的公式再重新执行，
+直到不再有新的未命中。
+"""
+import math
+import multiprocessing
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from .render import load_scene_class
+
+DEFAULT_MAX_BYTES = 256 * 1024**2
+
+# 多页文档里包裹每个公式的环境，standalone 的 multi 选项会让它各占一页
+_PAGE_ENV = "manimdemotex"
+
+_PLACEHOLDER_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10" viewBox="0 0 10 10">'
+    '<path d="M0 0H10V10H0Z"/></svg>'
+)
+
+
+class TexDocument(NamedTuple):
+    code: str            # 完整的 tex 源码，与 manim 写出的 .tex 文件一致
+    compiler: str
+    output_format: str   # ".dvi"、".xdv" 或 ".pdf"
+
+    @property
+    def name(self):
+        from manim.utils.tex_file_writing import tex_hash
+
+        return tex_hash(self.code)
+
+
+def default_cache_dir():
+    """环境变量 MANIM_DEMO_TEX_CACHE，默认 ~/.cache/manim-demo/tex"""
+    env = os.environ.get("MANIM_DEMO_TEX_CACHE")
+    return Path(env) if env else Path.home() / ".cache" / "manim-demo" / "tex"
+
+
+def cache_config(cache_dir):
+    """让渲染进程共用缓存目录的 config 覆盖项
+
+    多个进程共用同一个 tex_dir 时，manim 编译后的清理会删掉别的进程
+    尚未转换的 .dvi，因此关闭清理，残留的中间文件由 evict 统一删除。
+    """
+    return {"tex_dir": str(Path(cache_dir).resolve()), "no_latex_cleanup": True}
+
+
+def _document(expression, environment, tex_template):
+    from manim import config
+
+    template = tex_template or config["tex_template"]
+    if environment is not None:
+        code = template.get_texcode_for_expression_in_env(expression, environment)
+    else:
+        code = template.get_texcode_for_expression(expression)
+    return TexDocument(code, template.tex_compiler, template.output_format)
+
+
+def collect_tex(spec, cache_dir, quality="low_quality", random_seed=0):
+    """以 quality 的帧率逐帧试运行场景，返回 (未命中的文档集合, 是否完整执行)"""
+    import manim.mobject.text.tex_mobject as tex_mobject
+    from manim import config, tempconfig
+
+    from .dryrun import DryRunRenderer
+    from .render import camera_class
+
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    missing = set()
+    with tempfile.TemporaryDirectory() as tmp:
+        placeholder = Path(tmp) / "placeholder.svg"
+        placeholder.write_text(_PLACEHOLDER_SVG, encoding="utf-8")
+
+        def lookup(expression, environment=None, tex_template=None):
+            doc = _document(expression, environment, tex_template)
+            svg = cache_dir / f"{doc.name}.svg"
+            if svg.exists():
+                os.utime(svg)
+                return svg
+            missing.add(doc)
+            return placeholder
+
+        original = tex_mobject.tex_to_svg_file
+        tex_mobject.tex_to_svg_file = lookup
+        try:
+            with tempconfig({
+                "write_to_movie": False,
+                "save_last_frame": False,
+                "disable_caching": True,
+                "media_dir": tmp,
+            }):
+                config.quality = quality
+                scene_cls = load_scene_class(spec)
+                renderer = DryRunRenderer(check_finite=False, camera_class=camera_class(scene_cls))
+                scene_cls(renderer=renderer, random_seed=random_seed).render()
+            complete = True
+        except Exception:
+            complete = False
+        finally:
+            tex_mobject.tex_to_svg_file = original
+    return missing, complete
+
+
+def _split_document(code):
+    head, sep, rest = code.partition(r"\begin{document}")
+    body, sep2, _ = rest.rpartition(r"\end{document}")
+    if not (sep and sep2):
+        return None
+    return head, body
+
+
+def _batch_source(docs):
+    """把 preamble 相同的文档合成一个多页文档；不是 standalone[preview] 时返回 None"""
+    split = _split_document(docs[0].code)
+    documentclass = r"\documentclass[preview]{standalone}"
+    if split is None or documentclass not in split[0]:
+        return None
+    head = split[0].replace(
+        documentclass,
+        rf"\documentclass[preview,multi={_PAGE_ENV}]{{standalone}}" + "\n"
+        + rf"\newenvironment{{{_PAGE_ENV}}}{{}}{{}}",
+        1,
+    )
+    pages = [
+        rf"\begin{{{_PAGE_ENV}}}{_split_document(doc.code)[1]}\end{{{_PAGE_ENV}}}"
+        for doc in docs
+    ]
+    return head + "\\begin{document}\n" + "\n".join(pages) + "\n\\end{document}\n"
+
+
+def _svg_box(path):
+    """svg 根元素 viewBox、width、height 中的数值，用于比较两次编译的尺寸与基线"""
+    root = re.search(r"<svg\b[^>]*>", Path(path).read_text(encoding="utf-8"))
+    attrs = dict(re.findall(r"""([\w:-]+)=['"]([^'"]*)['"]""", root.group(0))) if root else {}
+    values = " ".join(attrs.get(name, "") for name in ("viewBox", "width", "height"))
+    return [float(v) for v in re.findall(r"-?\d*\.?\d+(?:e-?\d+)?", values)]
+
+
+def _same_box(a, b):
+    return bool(a) and len(a) == len(b) and all(math.isclose(x, y, rel_tol=1e-4, abs_tol=1e-4) for x, y in zip(a, b))
+
+
+def _compile_one(doc, cache_dir):
+    # 逐个编译，沿用 manim 自己的流程与报错信息
+    from manim import tempconfig
+    from manim.utils.tex_file_writing import compile_tex, convert_to_svg
+
+    tex_file = Path(cache_dir) / f"{doc.name}.tex"
+    tex_file.write_text(doc.code, encoding="utf-8")
+    with tempconfig({"tex_dir": str(Path(cache_dir).resolve())}):
+        return convert_to_svg(compile_tex(tex_file, doc.compiler, doc.output_format), doc.output_format)
+
+
+def _compile_group(docs, cache_dir):
+    from manim.utils.tex_file_writing import make_tex_compilation_command
+
+    source = _batch_source(docs)
+    if source is None or len(docs) == 1:
+        for doc in docs:
+            _compile_one(doc, cache_dir)
+        return
+
+    compiler, output_format = docs[0].compiler, docs[0].output_format
+    with tempfile.TemporaryDirectory(dir=cache_dir) as tmp:
+        tmp = Path(tmp)
+        tex_file = tmp / "batch.tex"
+        tex_file.write_text(source, encoding="utf-8")
+        command = make_tex_compilation_command(compiler, output_format, tex_file, tmp)
+        compiled = subprocess.run(command, stdout=subprocess.DEVNULL, cwd=tmp).returncode == 0
+        if compiled:
+            subprocess.run(
+                [
+                    "dvisvgm",
+                    *(["--pdf"] if output_format == ".pdf" else []),
+                    "--page=1-",
+                    "--no-fonts",
+                    "--verbosity=0",
+                    f"--output={(tmp / 'page-%p.svg').as_posix()}",
+                    tex_file.with_suffix(output_format).as_posix(),
+                ],
+                stdout=subprocess.DEVNULL,
+            )
+        pages = {int(p.stem.rpartition("-")[2]): p for p in tmp.glob("page-*.svg")}
+        if not compiled or len(pages) != len(docs):
+            # 整批失败时逐个编译，以便定位出错的公式
+            for doc in docs:
+                _compile_one(doc, cache_dir)
+            return
+        # 第一页与单独编译的结果对比尺寸，不一致说明这个 preamble 下多页文档的排版不同
+        if not _same_box(_svg_box(pages[1]), _svg_box(_compile_one(docs[0], cache_dir))):
+            from manim import logger
+
+            logger.warning(
+                "Batched tex output differs from single compilation, compiling %(count)s expressions one by one",
+                {"count": len(docs) - 1},
+            )
+            for doc in docs[1:]:
+                _compile_one(doc, cache_dir)
+            return
+        for i, doc in enumerate(docs[1:], start=2):
+            # 先写 .tex 再原子地移入 svg，其他进程看到 svg 时它一定是完整的
+            (Path(cache_dir) / f"{doc.name}.tex").write_text(doc.code, encoding="utf-8")
+            os.replace(pages[i], Path(cache_dir) / f"{doc.name}.svg")
+
+
+def compile_batch(docs, cache_dir):
+    """按 (preamble, 编译器, 输出格式) 分组，每组只运行一次 LaTeX 与 dvisvgm"""
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    groups = {}
+    for doc in sorted(docs):
+        if (cache_dir / f"{doc.name}.svg").exists():
+            continue
+        split = _split_document(doc.code)
+        key = (split[0] if split else doc.code, doc.compiler, doc.output_format)
+        groups.setdefault(key, []).append(doc)
+    for group in groups.values():
+        _compile_group(group, cache_dir)
+    return sum(len(g) for g in groups.values())
+
+
+def evict(cache_dir, max_bytes=DEFAULT_MAX_BYTES, stale_seconds=3600):
+    """按最近使用时间淘汰 svg，使缓存总大小不超过 max_bytes
+
+    同时删除超过 stale_seconds 的编译中间文件（.aux、.log、.dvi 等）。
+    返回删除的 svg 数量。
+    """
+    cache_dir = Path(cache_dir)
+    if not cache_dir.exists():
+        return 0
+    now = time.time()
+    svgs = []
+    for f in cache_dir.iterdir():
+        if not f.is_file():
+            continue
+        stat = f.stat()
+        if f.suffix == ".svg":
+            svgs.append((stat.st_mtime, stat.st_size, f))
+        elif f.suffix != ".tex" and now - stat.st_mtime > stale_seconds:
+            f.unlink(missing_ok=True)
+
+    total = sum(size for _, size, _ in svgs)
+    removed = 0
+    for _, size, f in sorted(svgs):
+        if total <= max_bytes:
+            break
+        f.unlink(missing_ok=True)
+        f.with_suffix(".tex").unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed
+
+
+def cache_stats(cache_dir):
+    """返回 (svg 个数, 总字节数)"""
+    svgs = list(Path(cache_dir).glob("*.svg"))
+    return len(svgs), sum(f.stat().st_size for f in svgs)
+
+
+def clear_cache(cache_dir):
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def precompile(
+    specs, cache_dir=None, max_workers=None, max_rounds=5, max_bytes=DEFAULT_MAX_BYTES,
+    quality="low_quality", scene_quality=None,
+):
+    """收集并批量编译 specs 中全部场景用到的公式，返回新编译的公式数量
+
+    每个场景按 scene_quality.get(名称, quality) 的帧率收集，应与正式渲染的质量一致。
+    收集在 spawn 进程池中并行进行；没有完整执行的场景在编译之后重新收集，
+    最多 max_rounds 轮或直到不再发现新的公式。
+    """
+    scene_quality = scene_quality or {}
+    cache_dir = Path(cache_dir or default_cache_dir())
+    pending = list(specs)
+    compiled = 0
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+        for _ in range(max_rounds):
+            if not pending:
+                break
+            qualities = [scene_quality.get(s.name, quality) for s in pending]
+            results = list(pool.map(collect_tex, pending, [cache_dir] * len(pending), qualities))
+            missing = set().union(*(m for m, _ in results))
+            compiled += compile_batch(missing, cache_dir)
+            # 本轮没有新公式却仍未完整执行的场景，是场景本身出错，交给正式渲染报告
+            pending = [s for s, (m, complete) in zip(pending, results) if m and not complete]
+    evict(cache_dir, max_bytes)
+    return compiled
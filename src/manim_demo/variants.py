@@ -0,0 +1,176 @@
+"""同一场景在参数网格上的批量渲染
+
+场景把可调参数写成类属性（如 StableReactionDiffusion3D.lam），
+每个参数组合生成一个只覆盖这些属性的子类，在进程池中并行渲染。
+
+与参数无关的 mobject（坐标轴、标签、标题等）由场景的类方法 build_static()
+返回，construct 中通过 static_mobjects(self) 取得。批量渲染时它们只在父进程
+构建一次：工作进程以 fork 方式启动，直接继承这些对象（内存页写时复制），
+每个变体再各自拿一份 copy()，不会互相影响。不支持 fork 的平台上，
+每个工作进程在初始化时构建一次。build_static 不能读取被扫描的参数。
+"""
+import ast
+import itertools
+import multiprocessing
+import re
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import NamedTuple
+
+from .render import RenderResult, UsageError, load_scene_class
+
+# 预先构建的静态 mobject，键为定义 build_static 的类
+_PREBUILT = {}
+
+
+class Variant(NamedTuple):
+    scene: object       # SceneSpec
+    params: dict
+
+    @property
+    def name(self):
+        """场景名加参数，例如 StableReactionDiffusion3D_lam=5.0_U_control=0.5"""
+        parts = [self.scene.name] + [f"{k}={_format_value(v)}" for k, v in self.params.items()]
+        return re.sub(r"[^\w.=,+-]", "", "_".join(parts))
+
+
+def _format_value(value):
+    if isinstance(value, (list, tuple)):
+        return ",".join(_format_value(v) for v in value)
+    return str(value)
+
+
+def _static_owner(cls):
+    for klass in cls.__mro__:
+        if "build_static" in klass.__dict__:
+            return klass
+    return None
+
+
+def _owner_key(klass):
+    return f"{klass.__module__}:{klass.__qualname__}"
+
+
+def static_mobjects(scene):
+    """返回 build_static() 构建的 mobject 字典
+
+    批量渲染时返回预先构建好的对象的副本，单独渲染时直接调用 build_static()。
+    """
+    owner = _static_owner(type(scene))
+    if owner is None:
+        raise TypeError(f"{type(scene).__name__} 没有定义 build_static()")
+    prebuilt = _PREBUILT.get(_owner_key(owner))
+    if prebuilt is None:
+        return owner.build_static()
+    return {name: mob.copy() for name, mob in prebuilt.items()}
+
+
+def prebuild(spec, config_overrides=None):
+    """构建场景的静态 mobject 并登记，供之后的变体复用"""
+    from manim import tempconfig
+
+    owner = _static_owner(load_scene_class(spec))
+    if owner is not None and _owner_key(owner) not in _PREBUILT:
+        with tempconfig({"input_file": str(spec.file), **(config_overrides or {})}):
+            _PREBUILT[_owner_key(owner)] = owner.build_static()
+
+
+def parse_grid(assignments):
+    """把 ["lam=1,5,15", "U_control=0.5"] 解析成 {"lam": [1, 5, 15], "U_control": [0.5]}
+
+    值按 Python 字面量解析，逗号分隔多个取值；同名参数可以重复给出。
+    列表取值写成 "weights=[1,2,3],[3,2,1]"。
+    """
+    grid = {}
+    for item in assignments:
+        name, sep, text = item.partition("=")
+        if not sep or not name.isidentifier():
+            raise UsageError(f"参数应写成 名称=取值，实际为 {item!r}")
+        try:
+            values = ast.literal_eval(f"[{text}]")
+        except (ValueError, SyntaxError):
+            raise UsageError(f"无法解析参数 {name} 的取值 {text!r}")
+        grid.setdefault(name, []).extend(values)
+    return grid
+
+
+def expand_grid(spec, grid):
+    """参数网格的笛卡尔积，检查每个参数都是场景已有的类属性"""
+    cls = load_scene_class(spec)
+    unknown = [name for name in grid if not hasattr(cls, name)]
+    if unknown:
+        raise UsageError(f"{spec.name} 没有参数 {', '.join(unknown)}")
+    names = list(grid)
+    return [Variant(spec, dict(zip(names, combo))) for combo in itertools.product(*grid.values())]
+
+
+def variant_class(variant):
+    cls = load_scene_class(variant.scene)
+    return type(cls.__name__, (cls,), dict(variant.params))
+
+
+def render_variant(variant, quality="low_quality", media_dir=None, config_overrides=None):
+    """在当前进程中渲染一个变体，视频文件以 Variant.name 命名"""
+    from manim import config, tempconfig
+
+    overrides = {
+        "input_file": str(variant.scene.file),
+        "output_file": variant.name,
+        **(config_overrides or {}),
+    }
+    if media_dir is not None:
+        overrides["media_dir"] = str(media_dir)
+    with tempconfig(overrides):
+        config.quality = quality
+        scene = variant_class(variant)()
+        scene.render()
+        return Path(scene.renderer.file_writer.movie_file_path)
+
+
+def _init_worker(spec, config_overrides):
+    # fork 启动时父进程已经构建好，这里什么也不做
+    prebuild(spec, config_overrides)
+
+
+def _run_variant(args):
+    variant, quality, media_dir, config_overrides = args
+    start = time.perf_counter()
+    try:
+        output = render_variant(variant, quality, media_dir, config_overrides)
+        return RenderResult(variant, quality, time.perf_counter() - start, output)
+    except Exception:
+        return RenderResult(variant, quality, time.perf_counter() - start, None, traceback.format_exc())
+
+
+def render_variants(variants, quality="low_quality", output_dir="media/sweep", max_workers=None,
+                    config_overrides=None, on_result=None):
+    """并行渲染同一场景的全部变体，返回与 variants 顺序一致的 RenderResult 列表
+
+    RenderResult.scene 为对应的 Variant。
+    """
+    variants = list(variants)
+    spec = variants[0].scene
+    methods = multiprocessing.get_all_start_methods()
+    if "fork" in methods:
+        prebuild(spec, config_overrides)
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context("spawn")
+
+    output_dir = Path(output_dir)
+    results = [None] * len(variants)
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=context, initializer=_init_worker, initargs=(spec, config_overrides),
+    ) as pool:
+        futures = {
+            pool.submit(_run_variant, (v, quality, output_dir / v.name, config_overrides)): i
+            for i, v in enumerate(variants)
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            if on_result is not None:
+                on_result(result)
+    return results
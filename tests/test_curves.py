@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from manim_demo.curves import pixel_size, simplify_mask, simplify_polylines
+
+
+def segment_distance(p, a, b):
+    ab = b - a
+    t = 0.0 if not ab @ ab else np.clip((p - a) @ ab / (ab @ ab), 0, 1)
+    return np.linalg.norm(p - (a + t * ab))
+
+
+def reference_rdp(points, tolerance):
+    """逐段递归的 RDP，返回保留的下标"""
+    def recurse(lo, hi):
+        if hi - lo < 2:
+            return []
+        distances = [segment_distance(points[k], points[lo], points[hi]) for k in range(lo + 1, hi)]
+        k = int(np.argmax(distances))
+        if distances[k] <= tolerance:
+            return []
+        mid = lo + 1 + k
+        return recurse(lo, mid) + [mid] + recurse(mid, hi)
+
+    if len(points) == 0:
+        return []
+    return sorted({0, len(points) - 1, *recurse(0, len(points) - 1)})
+
+
+def polylines():
+    rng = np.random.default_rng(0)
+    t = np.linspace(0, 4 * np.pi, 400)
+    yield np.column_stack([t, np.sin(t), np.zeros_like(t)])
+    # 闭合，首尾重合；角度不等距，避免对称带来的并列最远点
+    angles = np.concatenate([[0], np.sort(rng.uniform(0, 2 * np.pi, 398)), [2 * np.pi]])
+    yield np.column_stack([np.cos(angles), np.sin(angles), 0 * angles])
+    yield np.cumsum(rng.normal(size=(300, 3)), axis=0)                         # 随机游走
+    yield np.column_stack([np.linspace(0, 1, 50), np.zeros(50), np.zeros(50)])  # 共线
+
+
+@pytest.mark.parametrize("tolerance", [0.01, 0.1, 0.5])
+@pytest.mark.parametrize("points", list(polylines()), ids=["sine", "circle", "walk", "line"])
+def test_matches_reference(points, tolerance):
+    keep = simplify_mask(points, tolerance)
+    assert np.flatnonzero(keep).tolist() == reference_rdp(points, tolerance)
+
+
+@pytest.mark.parametrize("points", list(polylines()), ids=["sine", "circle", "walk", "line"])
+def test_endpoints_kept_and_distance_bounded(points):
+    tolerance = 0.05
+    kept = np.flatnonzero(simplify_mask(points, tolerance))
+    assert kept[0] == 0 and kept[-1] == len(points) - 1
+    # 每个去掉的点到保留下来的相邻两点所成线段（也就是到所在直线）的距离不超过 tolerance
+    for lo, hi in zip(kept[:-1], kept[1:]):
+        a, b = points[lo], points[hi]
+        for p in points[lo + 1:hi]:
+            assert segment_distance(p, a, b) <= tolerance
+            if np.any(a != b):
+                d = (b - a) / np.linalg.norm(b - a)
+                assert np.linalg.norm((p - a) - ((p - a) @ d) * d) <= tolerance + 1e-12
+
+
+def test_collinear_points_reduce_to_endpoints():
+    points = list(polylines())[3]
+    assert np.flatnonzero(simplify_mask(points, 1e-9)).tolist() == [0, len(points) - 1]
+
+
+@pytest.mark.parametrize("n", [0, 1, 2])
+def test_fewer_than_three_points(n):
+    points = np.arange(3 * n, dtype=float).reshape(n, 3)
+    assert simplify_mask(points, 0.1).tolist() == [True] * n
+    (out,) = simplify_polylines([points])
+    np.testing.assert_array_equal(out, points)
+
+
+def test_repeated_points():
+    same = np.ones((10, 3))
+    assert np.flatnonzero(simplify_mask(same, 0.1)).tolist() == [0, 9]
+    # 相邻重复的点不会被当作偏离
+    square = np.array([[0, 0, 0], [0, 0, 0], [1, 0, 0], [1, 0, 0], [1, 1, 0], [1, 1, 0], [0, 1, 0]], dtype=float)
+    keep = simplify_mask(square, 0.1)
+    np.testing.assert_array_equal(np.unique(square[keep], axis=0), np.unique(square, axis=0))
+    assert np.flatnonzero(keep).tolist() == reference_rdp(square, 0.1)
+
+
+def test_batched_polylines_match_individual_runs():
+    lines = list(polylines()) + [np.zeros((0, 3)), np.ones((1, 3))]
+    tolerance = 0.5
+    batched = simplify_polylines(lines, tolerance)
+    assert len(batched) == len(lines)
+    for points, out in zip(lines, batched):
+        expected = points[simplify_mask(points, tolerance * pixel_size())] if len(points) else points
+        np.testing.assert_array_equal(out, expected)
+
+
+def test_zero_tolerance_returns_input():
+    lines = list(polylines())
+    for points, out in zip(lines, simplify_polylines(lines, tolerance=0)):
+        np.testing.assert_array_equal(out, points)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from manim_demo.integrate import Trajectories, integrate_batch, trajectories_to_points
+
+
+def decay(t, y):
+    return -y
+
+
+Y0 = np.array([[1.0, -2.0], [0.5, 3.0], [-4.0, 0.25]])
+
+
+@pytest.mark.parametrize("method, dt, tol", [
+    ("rk4", 0.1, 1e-5),
+    ("rk45", 0.5, 1e-5),
+    ("euler", 0.001, 5e-3),
+])
+def test_linear_decay_matches_closed_form(method, dt, tol):
+    traj = integrate_batch(decay, Y0, t_max=3.0, dt=dt, method=method)
+    exact = Y0[None] * np.exp(-traj.t)[:, None, None]
+    assert traj.states.shape == (len(traj.t), *Y0.shape)
+    np.testing.assert_allclose(traj.states, exact, rtol=tol, atol=tol)
+    assert np.all(traj.lengths == len(traj.t))
+
+
+def test_rk4_is_fourth_order():
+    errors = []
+    for dt in (0.2, 0.1):
+        traj = integrate_batch(decay, Y0, t_max=2.0, dt=dt, method="rk4")
+        errors.append(np.max(np.abs(traj.states[-1] - Y0 * np.exp(-2.0))))
+    assert errors[0] / errors[1] == pytest.approx(16, rel=0.1)
+
+
+def test_one_dimensional_initial_values():
+    traj = integrate_batch(decay, [1.0, 2.0], t_max=1.0, dt=0.1)
+    assert traj.states.shape == (11, 2, 1)
+    np.testing.assert_allclose(traj.states[-1, :, 0], [np.exp(-1), 2 * np.exp(-1)], rtol=1e-6)
+
+
+@pytest.mark.parametrize("method", ["euler", "rk4", "rk45"])
+def test_escaped_trajectories_are_frozen(method):
+    # x' = x：初值 1 在 t = ln 5 附近越过 5，初值 0.1 不会在 t_max 内越过
+    grow = lambda t, y: y
+    traj = integrate_batch(grow, [[1.0], [0.1]], t_max=2.0, dt=0.05, method=method, escape=5.0)
+    n = traj.lengths[0]
+    assert n < len(traj.t)
+    assert traj.lengths[1] == len(traj.t)
+    # 截断前的全部采样都在范围内，之后保持最后的有效值
+    assert np.all(np.abs(traj.states[:n, 0]) <= 5.0)
+    assert np.all(traj.states[n:, 0] == traj.states[n - 1, 0])
+    # 再走一步就会越界
+    assert traj.states[n - 1, 0, 0] * np.exp(0.05) > 5.0 * 0.99
+    # 没有逃逸的轨迹不受影响
+    np.testing.assert_allclose(traj.states[:, 1, 0], 0.1 * np.exp(traj.t), rtol=0.05)
+
+
+def test_all_escaped_stops_early():
+    traj = integrate_batch(lambda t, y: y, [[10.0]], t_max=1.0, dt=0.1, escape=5.0)
+    assert traj.lengths[0] == 1
+    assert np.all(traj.states == 10.0)
+
+
+def test_points_match_per_point_c2p():
+    manim = pytest.importorskip("manim")
+    axes = manim.Axes(x_range=[-3, 3, 1], y_range=[-2, 2, 1], x_length=7, y_length=5).shift(manim.LEFT)
+    t = np.arange(4) * 0.5
+    states = np.random.default_rng(0).uniform(-2, 2, size=(4, 3, 2))
+    traj = Trajectories(t, states, np.array([4, 1, 3]))
+
+    polylines = trajectories_to_points(axes, traj)
+    assert [len(p) for p in polylines] == [4, 1, 3]
+    for k, points in enumerate(polylines):
+        expected = [axes.c2p(x, y) for x, y in states[:traj.lengths[k], k]]
+        np.testing.assert_allclose(points, expected)
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from manim_demo.motion import Motion
+
+A, C = -24, 10
+
+# 场景 MovingPointsOnNumberLine 中的两个动点
+P = Motion.start(A).move_to(13, speed=1)
+Q = Motion.start(A, time=14).bounce(C, speed=3)
+
+
+def simulate(fps=60, t_end=37):
+    """原先逐帧按 dt 累加的 updater：P 一直以速度 1 向右，Q 在 t=14 出发往返 A、C"""
+    dt = 1 / fps
+    elapsed, tau = 0.0, 0.0
+    times, ps, qs = [], [], []
+    for frame in range(round(t_end * fps) + 1):
+        if frame:
+            elapsed += dt
+            if frame > 14 * fps:
+                tau += dt
+        t = frame * dt
+        p = A + elapsed
+        if tau <= 34 / 3:
+            q = A + 3 * tau
+        elif tau <= 68 / 3:
+            q = C - 3 * (tau - 34 / 3)
+        else:
+            q = A
+        times.append(t)
+        ps.append(p)
+        qs.append(q)
+    return np.array(times), np.array(ps), np.array(qs)
+
+
+@pytest.mark.parametrize("fps", [15, 30, 60])
+def test_matches_per_frame_simulation(fps):
+    t, p, q = simulate(fps)
+    np.testing.assert_allclose(P(t), p, atol=1e-9)
+    np.testing.assert_allclose(Q(t), q, atol=1e-9)
+
+
+def test_scalar_and_array_evaluation():
+    assert P(14) == -10
+    assert Q(0) == A and Q(14 + 34 / 3) == pytest.approx(C) and Q(100) == A
+    np.testing.assert_allclose(Q([14, 20, 36]), [A, A + 18, 86 - 3 * 36])
+
+
+def test_meeting_times():
+    np.testing.assert_allclose(P.meetings(Q, distance=2), [20, 22, 27, 28])
+    gap = np.abs(P([20, 22, 27, 28]) - Q([20, 22, 27, 28]))
+    np.testing.assert_allclose(gap, 2)
+    # 相遇（距离为 0）发生在追及与返回途中各一次
+    np.testing.assert_allclose(P.meetings(Q), [21, 27.5])
+
+
+def test_meetings_ignore_times_before_both_started():
+    # Q 出发前停在 A，与 P 在 t=2 相距 2，但不算
+    assert np.all(P.meetings(Q, distance=2) >= 14)
+
+
+def test_velocity():
+    np.testing.assert_allclose(Q.velocity([13, 14, 20, 14 + 34 / 3 + 1, 40]), [0, 3, 3, -3, 0])
+    assert Motion.start(0).velocity(5.0) == 0
+
+
+def test_stop_and_solve():
+    m = Motion.start(0).move_to(4, speed=2).stop(3).move_to(0, speed=1)
+    np.testing.assert_allclose(m.times, [0, 2, 5, 9])
+    # 停在 4 上的一段只报告开始的时刻
+    np.testing.assert_allclose(m.solve(4), [2])
+    np.testing.assert_allclose(m.solve(1), [0.5, 8])
+    assert m.solve(10).size == 0
+
+
+def test_invalid_motion():
+    with pytest.raises(ValueError):
+        Motion([0, 1], [0])
+    with pytest.raises(ValueError):
+        Motion([1, 0], [0, 1])
+    with pytest.raises(ValueError):
+        Motion.start(0).move_to(1, speed=0)
@@ -0,0 +1,92 @@
+import math
+
+import numpy as np
+import pytest
+
+from manim_demo.pde import solve_reaction_diffusion
+
+D, LAM, L, T = 0.5, 0.3, 2.0, 0.5
+
+
+def decaying_mode(nx, nt, method):
+    """u(x, 0) = sin(πx/L)，零边界；返回数值解与半离散（空间差分后）的精确解"""
+    sol = solve_reaction_diffusion(
+        lambda x: np.sin(np.pi * x / L), L=L, T=T, nx=nx, nt=nt, D=D, lam=LAM, method=method,
+    )
+    dx = sol.x[1] - sol.x[0]
+    # 正弦模态是差分 Laplace 算子的特征向量，特征值为 -4/dx² sin²(π dx / 2L)
+    rate = LAM - 4 * D / dx**2 * np.sin(np.pi * dx / (2 * L)) ** 2
+    exact = np.sin(np.pi * sol.x / L)[:, None] * np.exp(rate * sol.t)[None, :]
+    return sol, exact
+
+
+@pytest.mark.parametrize("method", ["crank-nicolson", "backward-euler", "explicit"])
+def test_matches_analytic_decaying_mode(method):
+    sol = solve_reaction_diffusion(
+        lambda x: np.sin(np.pi * x / L), L=L, T=T, nx=41, nt=401, D=D, lam=LAM, method=method,
+    )
+    exact = np.sin(np.pi * sol.x / L)[:, None] * np.exp((LAM - D * np.pi**2 / L**2) * sol.t)[None, :]
+    assert sol.u.shape == (41, 401)
+    np.testing.assert_allclose(sol.u, exact, atol=2e-3)
+
+
+@pytest.mark.parametrize("method, order", [("crank-nicolson", 2), ("backward-euler", 1)])
+def test_convergence_order_in_dt(method, order):
+    errors = []
+    for nt in (11, 21, 41):
+        sol, exact = decaying_mode(nx=101, nt=nt, method=method)
+        errors.append(np.max(np.abs(sol.u[:, -1] - exact[:, -1])))
+    ratios = np.log2(np.array(errors[:-1]) / np.array(errors[1:]))
+    np.testing.assert_allclose(ratios, order, atol=0.1)
+
+
+def test_crank_nicolson_is_stable_for_large_steps():
+    # D dt / dx² 远大于 1/2，显式格式会发散
+    sol, exact = decaying_mode(nx=201, nt=6, method="crank-nicolson")
+    assert D * (sol.t[1] - sol.t[0]) / (sol.x[1] - sol.x[0]) ** 2 > 50
+    assert np.all(np.isfinite(sol.u))
+    assert np.max(np.abs(sol.u)) <= 1.0
+
+
+def test_explicit_warns_when_unstable():
+    with pytest.warns(RuntimeWarning):
+        solve_reaction_diffusion(np.zeros_like, nx=101, nt=11, method="explicit")
+
+
+@pytest.mark.parametrize("method", ["crank-nicolson", "backward-euler", "explicit"])
+def test_time_dependent_boundaries(method):
+    # u = x² + 2Dt 满足 u_t = D u_xx，空间二阶差分与时间上的线性函数都没有截断误差
+    sol = solve_reaction_diffusion(
+        lambda x: x**2,
+        left=lambda t: 2 * D * t,                       # 接收数组
+        right=lambda t: L**2 + 2 * D * math.fabs(t),    # 只接收标量
+        L=L, T=T, nx=21, nt=201, D=D, method=method,
+    )
+    exact = sol.x[:, None] ** 2 + 2 * D * sol.t[None, :]
+    np.testing.assert_allclose(sol.u, exact, atol=1e-10)
+
+
+def test_constant_boundaries_reach_linear_steady_state():
+    sol = solve_reaction_diffusion(np.zeros_like, left=1.0, right=3.0, L=L, T=20.0, nx=31, nt=201, D=D)
+    assert sol.u[0, 0] == 1.0 and sol.u[-1, 0] == 3.0
+    np.testing.assert_allclose(sol.u[:, -1], 1.0 + 2.0 * sol.x / L, atol=1e-8)
+
+
+def test_save_every():
+    full, _ = decaying_mode(nx=21, nt=41, method="crank-nicolson")
+    sol = solve_reaction_diffusion(
+        lambda x: np.sin(np.pi * x / L), L=L, T=T, nx=21, nt=41, D=D, lam=LAM, save_every=10,
+    )
+    np.testing.assert_array_equal(sol.t, full.t[::10])
+    np.testing.assert_allclose(sol.u, full.u[:, ::10])
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        solve_reaction_diffusion(np.zeros_like, method="leapfrog")
+
+
+def test_singular_system_raises():
+    # D = 0、λ dt = 1 时隐式格式的矩阵 I - dt A 恰好为零
+    with pytest.raises(np.linalg.LinAlgError):
+        solve_reaction_diffusion(np.ones_like, T=1.0, nt=11, D=0.0, lam=10.0, method="backward-euler")
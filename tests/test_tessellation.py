@@ -0,0 +1,120 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from manim_demo.tessellation import adaptive_mesh, uniform_mesh
+
+U_RANGE, V_RANGE = (-1.0, 1.0), (-1.0, 1.0)
+
+
+def peak(U, V):
+    return np.exp(-30 * ((U - 0.3) ** 2 + (V + 0.2) ** 2))
+
+
+def measure(U, V):
+    return np.stack([U, V, peak(U, V)], axis=-1)
+
+
+def adaptive(max_faces=400, **kwargs):
+    return adaptive_mesh(
+        measure, U_RANGE, V_RANGE, base_resolution=4, max_faces=max_faces,
+        tolerance=0.5, min_size=1.0, max_depth=5, pixel_size=0.005, **kwargs,
+    )
+
+
+def along_edge(uv, a, b):
+    """每个顶点在边 a -> b 上的位置 t，以及它是否落在这条边上（含端点）"""
+    d = uv[b] - uv[a]
+    rel = uv - uv[a]
+    t = rel @ d / (d @ d)
+    # 网格坐标是 2 的幂分之一，共线的判定是精确的
+    collinear = np.abs(rel[:, 0] * d[1] - rel[:, 1] * d[0]) < 1e-12
+    return t, collinear & (t >= 0) & (t <= 1)
+
+
+def edge_segments(mesh):
+    """把每个面片的四条边在其上的全部顶点处切开，返回 [(面片, 顶点 a, 顶点 b)]"""
+    uv = np.stack([mesh.u, mesh.v], axis=1)
+    segments = []
+    for f, face in enumerate(mesh.faces):
+        for a, b in zip(face, np.roll(face, -1)):
+            t, on_edge = along_edge(uv, a, b)
+            ids = np.flatnonzero(on_edge)
+            ids = ids[np.argsort(t[ids])]
+            segments.extend((f, x, y) for x, y in zip(ids[:-1], ids[1:]))
+    return uv, segments
+
+
+def on_boundary(uv, a, b):
+    p, q = uv[a], uv[b]
+    return any(
+        p[k] == q[k] == bound for k, rng in enumerate((U_RANGE, V_RANGE)) for bound in rng
+    )
+
+
+@pytest.mark.parametrize("mesh", [uniform_mesh(U_RANGE, V_RANGE, (5, 3)), adaptive()], ids=["uniform", "adaptive"])
+def test_conforming_topology(mesh):
+    uv, segments = edge_segments(mesh)
+    counts = Counter(tuple(sorted((a, b))) for _, a, b in segments)
+    for (a, b), count in counts.items():
+        assert count == (1 if on_boundary(uv, a, b) else 2), (uv[a], uv[b])
+    # 面片恰好铺满参数区域，没有重叠或空洞
+    area = np.prod(mesh.cells[:, 1::2] - mesh.cells[:, ::2], axis=1).sum()
+    assert area == pytest.approx(np.ptp(U_RANGE) * np.ptp(V_RANGE))
+
+
+def test_adaptive_mesh_has_hanging_vertices():
+    mesh = adaptive()
+    # 至少三个层级的面片同时存在
+    assert len(np.unique(mesh.cells[:, 1] - mesh.cells[:, 0])) > 2
+    assert sum(len(h) for h, *_ in mesh.snaps) > 0
+
+
+def test_conform_closes_cracks():
+    mesh = adaptive()
+    z = mesh.conform(peak(mesh.u, mesh.v))
+    uv = np.stack([mesh.u, mesh.v], axis=1)
+    # 每个面片边上的中间顶点都落在该边两端点的连线上
+    for face in mesh.faces:
+        for a, b in zip(face, np.roll(face, -1)):
+            t, on_edge = along_edge(uv, a, b)
+            inside = on_edge & (t > 0) & (t < 1)
+            np.testing.assert_allclose(z[inside], (1 - t[inside]) * z[a] + t[inside] * z[b], atol=1e-12)
+    # 不是悬挂顶点的值保持不变
+    hanging = np.concatenate([h for h, *_ in mesh.snaps])
+    free = np.setdiff1d(np.arange(len(z)), hanging)
+    np.testing.assert_array_equal(z[free], peak(mesh.u, mesh.v)[free])
+
+
+def test_conform_with_parameter_axis():
+    mesh = adaptive()
+    z = np.stack([peak(mesh.u, mesh.v) * s for s in (0.5, 1.0, 2.0)])
+    conformed = mesh.conform(z)
+    np.testing.assert_allclose(conformed, np.stack([mesh.conform(row) for row in z]))
+
+
+@pytest.mark.parametrize("max_faces", [16, 17, 40, 100, 401, 1000])
+def test_face_budget(max_faces):
+    mesh = adaptive(max_faces)
+    assert len(mesh.faces) <= max_faces
+    assert len(mesh.cells) == len(mesh.faces) == len(mesh.index)
+
+
+def test_budget_is_spent_where_error_is_largest():
+    mesh = adaptive(100)
+    sizes = mesh.cells[:, 1] - mesh.cells[:, 0]
+    centers = np.stack([mesh.cells[:, :2].mean(axis=1), mesh.cells[:, 2:].mean(axis=1)], axis=1)
+    near = np.linalg.norm(centers - [0.3, -0.2], axis=1) < 0.3
+    assert sizes[near].min() < sizes[~near].min()
+
+
+def test_parameter_axis_refines_for_every_parameter():
+    def moving(U, V):
+        shifts = np.array([-0.5, 0.5])[:, None, None, None, None]
+        return np.stack(np.broadcast_arrays(U, V, np.exp(-30 * ((U - shifts) ** 2 + V**2))), axis=-1)
+
+    mesh = adaptive_mesh(moving, U_RANGE, V_RANGE, base_resolution=4, max_faces=400, pixel_size=0.005)
+    centers = mesh.cells[:, :2].mean(axis=1)
+    sizes = mesh.cells[:, 1] - mesh.cells[:, 0]
+    assert sizes[centers < 0].min() == sizes[centers > 0].min() < 0.5